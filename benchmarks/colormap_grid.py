@@ -0,0 +1,45 @@
+"""
+Compares the time to draw and save, and the size of the file, of a
+colormap on a regular grid drawn as an image (the default) and as a
+mesh, and on an irregular grid, which is always drawn as a mesh.
+
+Usage:
+	python benchmarks/colormap_grid.py [--sizes N [N ...]]
+"""
+import myplotlib as mpl
+from myplotlib.wrapper_matplotlib import MPLMatplotlibWrapper
+import numpy as np
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Benchmark of "colormap" on regular and irregular grids with matplotlib.')
+	parser.add_argument('--sizes', type=int, nargs='+', default=[300, 1000, 2000], help='Number of rows and columns of the grid.')
+	args = parser.parse_args()
+	
+	directory = Path(tempfile.mkdtemp())
+	
+	print(f'{"size":>6}{"grid":>10}{"drawn as":>10}{"draw [s]":>10}{"png [s]":>10}{"pdf [s]":>10}{"pdf size [MB]":>15}')
+	for size in args.sizes:
+		for grid in ['regular', 'irregular']:
+			x = np.linspace(1, 2, size) if grid == 'regular' else np.geomspace(1, 2, size)
+			y = np.linspace(1, 2, size)
+			xx, yy = np.meshgrid(x, y)
+			zz = np.sin(9*xx)*np.cos(9*yy)
+			for as_image in ([True, False] if grid == 'regular' else [True]):
+				MPLMatplotlibWrapper.IMAGE_FOR_REGULAR_GRIDS = as_image
+				fig = mpl.manager.new(package='matplotlib')
+				start = time.perf_counter()
+				fig.colormap(x=xx, y=yy, z=zz)
+				draw_time = time.perf_counter() - start
+				times = {}
+				for extension in ['png', 'pdf']:
+					start = time.perf_counter()
+					fig.save(fname=str(directory/f'{size}_{grid}_{as_image}.{extension}'))
+					times[extension] = time.perf_counter() - start
+				mpl.manager.delete(fig)
+				drawn_as = 'image' if as_image and grid == 'regular' else 'mesh'
+				print(f'{size:>6}{grid:>10}{drawn_as:>10}{draw_time:>10.3f}{times["png"]:>10.3f}{times["pdf"]:>10.3f}{(directory/f"{size}_{grid}_{as_image}.pdf").stat().st_size/1e6:>15.2f}')
+	MPLMatplotlibWrapper.IMAGE_FOR_REGULAR_GRIDS = True
@@ -0,0 +1,39 @@
+"""
+Compares the time to plot and save, and the size of the file, of a long
+waveform with and without <downsample>.
+
+Usage:
+	python benchmarks/downsample.py [--points N]
+"""
+import myplotlib as mpl
+import numpy as np
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Benchmark of the <downsample> option of "plot".')
+	parser.add_argument('--points', type=int, default=5_000_000, help='Number of points of the waveform.')
+	args = parser.parse_args()
+	
+	x = np.linspace(0, 1, args.points)
+	y = np.sin(2*np.pi*50*x) + np.random.randn(args.points)*.1
+	directory = Path(tempfile.mkdtemp())
+	
+	print(f'{"package":<12}{"downsample":<12}{"plot [s]":>10}{"save [s]":>10}{"file size [MB]":>16}')
+	for package in ['matplotlib', 'plotly']:
+		for downsample in [None, 'minmax', 'lttb']:
+			fig = mpl.manager.new(
+				title = f'{package} {downsample}',
+				package = package,
+			)
+			start = time.perf_counter()
+			fig.plot(x, y, downsample=downsample)
+			plot_time = time.perf_counter() - start
+			fname = directory/f'{package}_{downsample}.{"png" if package=="matplotlib" else "html"}'
+			start = time.perf_counter()
+			fig.save(fname = str(fname))
+			save_time = time.perf_counter() - start
+			mpl.manager.delete(fig)
+			print(f'{package:<12}{str(downsample):<12}{plot_time:>10.3f}{save_time:>10.3f}{fname.stat().st_size/1e6:>16.2f}')
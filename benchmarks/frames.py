@@ -0,0 +1,61 @@
+"""
+Measures the time of saving a sequence of colormaps as PNG files, one
+figure for each frame (manager.new + colormap + save) versus
+"MPLFigure.save_frames", which draws the figure once and only replaces
+the data of the colormap for each frame.
+
+Usage:
+	python benchmarks/frames.py [--frames N] [--pixels N] [--package PACKAGE] [--jobs N]
+"""
+import argparse
+import tempfile
+import time
+import numpy as np
+import myplotlib as mpl
+
+def make_frames(n_frames, n_pixels):
+	x = np.linspace(-1, 1, n_pixels)
+	xx, yy = np.meshgrid(x, x)
+	return np.array([np.exp(-((xx - np.cos(t)/2)**2 + (yy - np.sin(t)/2)**2)*8) for t in np.linspace(0, 2*np.pi, n_frames)])
+
+def one_figure_per_frame(frames, package, directory):
+	for number, z in enumerate(frames):
+		fig = mpl.manager.new(title='frame', package=package, lazy=True)
+		fig.colormap(z, colorscalelabel='z')
+		fig.save(f'{directory}/frame_{number:05d}')
+		mpl.manager.delete(fig)
+
+def with_save_frames(frames, package, directory, jobs=None):
+	fig = mpl.manager.new(title='frame', package=package, lazy=True)
+	fig.colormap(frames[0], colorscalelabel='z')
+	fig.save_frames(frames, f'{directory}/frame_{{:05d}}', jobs=jobs)
+	mpl.manager.delete(fig)
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Benchmark of saving a sequence of colormaps.')
+	parser.add_argument('--frames', type=int, default=200, help='Number of frames.')
+	parser.add_argument('--pixels', type=int, default=256, help='Number of pixels per side of each frame.')
+	parser.add_argument('--package', default='matplotlib', help='Plotting package.')
+	parser.add_argument('--jobs', type=int, default=None, help='Number of worker processes for "save_frames", if given it is also measured with them.')
+	args = parser.parse_args()
+	
+	frames = make_frames(args.frames, args.pixels)
+	methods = {
+		'one figure per frame': lambda directory: one_figure_per_frame(frames, args.package, directory),
+		'save_frames': lambda directory: with_save_frames(frames, args.package, directory),
+	}
+	if args.jobs is not None:
+		methods[f'save_frames jobs={args.jobs}'] = lambda directory: with_save_frames(frames, args.package, directory, jobs=args.jobs)
+	with_save_frames(frames[:2], args.package, tempfile.mkdtemp()) # So imports are not measured.
+	
+	print(f'{args.frames} frames of {args.pixels}x{args.pixels} pixels with {args.package}')
+	print(f'{"method":<28}{"time (s)":>10}{"per frame (ms)":>16}{"speedup":>9}')
+	reference = None
+	for name, method in methods.items():
+		with tempfile.TemporaryDirectory() as directory:
+			start = time.perf_counter()
+			method(directory)
+			seconds = time.perf_counter() - start
+		reference = seconds if reference is None else reference
+		print(f'{name:<28}{seconds:>10.2f}{seconds/args.frames*1e3:>16.1f}{reference/seconds:>8.2f}x')
+	mpl.manager.shutdown_workers()
@@ -0,0 +1,56 @@
+"""
+Measures the time and the peak memory (RSS) of computing the 2D 
+histogram of correlated samples with numpy.histogram2d and with
+myplotlib.histogram.histogram2d, which bins the samples in chunks with
+bincount on the raveled index of the bins. Each measurement runs in a
+new process.
+
+Usage:
+	python benchmarks/hist2d.py [--samples N] [--bins N] [--dtype float32|float64]
+"""
+import argparse
+import subprocess
+import sys
+
+FUNCTIONS = ['numpy.histogram2d', 'myplotlib histogram2d', 'myplotlib histogram2d, variable bins']
+
+def measure(function, n_samples, n_bins, dtype):
+	# Runs in the new process, returns the increase of the peak RSS in MB (the samples not included) and the time in seconds.
+	import resource
+	import time
+	import numpy as np
+	from myplotlib.histogram import histogram2d
+	
+	rng = np.random.default_rng(0)
+	x = rng.standard_normal(size=n_samples, dtype=dtype)
+	y = x + rng.standard_normal(size=n_samples, dtype=dtype)/2
+	bins = n_bins
+	if 'variable' in function:
+		bins = [np.sort(np.concatenate([[-6, 6], rng.uniform(-6, 6, n_bins-1)])) for axis in 'xy']
+	peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	start = time.perf_counter()
+	if function == 'numpy.histogram2d':
+		np.histogram2d(x, y, bins=bins)
+	else:
+		histogram2d(x, y, bins=bins)
+	seconds = time.perf_counter() - start
+	return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_before)/1e3, seconds # ru_maxrss is in kB on Linux.
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Benchmark of 2D histograms.')
+	parser.add_argument('--samples', type=int, default=10**7, help='Number of samples.')
+	parser.add_argument('--bins', type=int, default=1000, help='Number of bins of each axis.')
+	parser.add_argument('--dtype', default='float32', choices=['float32', 'float64'], help='Type of the samples.')
+	parser.add_argument('--measure', metavar='FUNCTION', help=argparse.SUPPRESS) # Used to run each measurement in a new process.
+	args = parser.parse_args()
+	
+	if args.measure is not None:
+		print(*measure(args.measure, args.samples, args.bins, args.dtype))
+		sys.exit(0)
+	
+	print(f'{args.samples} samples in {args.dtype}, {args.bins}x{args.bins} bins')
+	print(f'{"function":<40}{"extra peak RSS (MB)":>20}{"time (s)":>10}')
+	for function in FUNCTIONS:
+		result = subprocess.run([sys.executable, __file__, '--samples', str(args.samples), '--bins', str(args.bins), '--dtype', args.dtype, '--measure', function], capture_output=True, text=True, check=True)
+		peak, seconds = result.stdout.strip().splitlines()[-1].split()
+		print(f'{function:<40}{float(peak):>20.0f}{float(seconds):>10.2f}')
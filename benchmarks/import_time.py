@@ -0,0 +1,80 @@
+"""
+Measures the time it takes to do "import myplotlib" in a new Python
+process using "python -X importtime". If "--history FILE" is given the
+result is appended to that CSV file, so it can be tracked over time.
+
+Usage:
+	python benchmarks/import_time.py [--runs N] [--budget MILLISECONDS] [--history FILE]
+
+The exit code is 1 if the median import time is above the budget or if
+importing myplotlib imported any plotting package.
+"""
+import subprocess
+import sys
+import argparse
+import datetime
+import statistics
+import csv
+from pathlib import Path
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = 10 # Median cumulative import time allowed for "import myplotlib".
+PLOTTING_PACKAGES = ['numpy', 'matplotlib', 'plotly', 'astropy']
+
+def measure_import_time_ms():
+	# Returns the cumulative import time of myplotlib, in milliseconds, in a new interpreter.
+	result = subprocess.run(
+		[sys.executable, '-W', 'ignore', '-X', 'importtime', '-c', 'import myplotlib'],
+		cwd = PACKAGE_ROOT,
+		capture_output = True,
+		text = True,
+		check = True,
+	)
+	for line in result.stderr.splitlines():
+		# Lines look like "import time:       self [us] |   cumulative | module"
+		if line.startswith('import time:') and line.split('|')[-1].strip() == 'myplotlib':
+			return int(line.split('|')[1]) / 1e3
+	raise RuntimeError(f'Could not find the import time of myplotlib in the output of "python -X importtime":\n{result.stderr}')
+
+def imported_plotting_packages():
+	result = subprocess.run(
+		[sys.executable, '-W', 'ignore', '-c', f'import sys, myplotlib; print(" ".join(p for p in {PLOTTING_PACKAGES} if p in sys.modules))'],
+		cwd = PACKAGE_ROOT,
+		capture_output = True,
+		text = True,
+		check = True,
+	)
+	return result.stdout.split()
+
+def git_commit():
+	try:
+		return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+	except (subprocess.CalledProcessError, FileNotFoundError):
+		return ''
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Benchmark of "import myplotlib".')
+	parser.add_argument('--runs', type=int, default=20, help='Number of new processes to measure.')
+	parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_MS, help='Maximum median import time in milliseconds.')
+	parser.add_argument('--history', type=Path, default=None, help='CSV file where the results are appended, nothing is written if not given.')
+	args = parser.parse_args()
+	
+	measure_import_time_ms() # Warm up the file system cache, we want the cold interpreter but not the cold disk.
+	times = [measure_import_time_ms() for _ in range(args.runs)]
+	median = statistics.median(times)
+	leaked_packages = imported_plotting_packages()
+	
+	print(f'import myplotlib: median {median:.2f} ms, min {min(times):.2f} ms, max {max(times):.2f} ms ({args.runs} runs), budget {args.budget:.2f} ms')
+	if len(leaked_packages) > 0:
+		print(f'"import myplotlib" imported {leaked_packages}, these should only be imported when a figure is created.')
+	
+	if args.history is not None:
+		write_header = not args.history.exists()
+		with open(args.history, 'a', newline='') as ofile:
+			writer = csv.writer(ofile)
+			if write_header:
+				writer.writerow(['timestamp', 'commit', 'python', 'runs', 'median_ms', 'min_ms', 'max_ms'])
+			writer.writerow([datetime.datetime.now().isoformat(timespec='seconds'), git_commit(), sys.version.split()[0], args.runs, f'{median:.3f}', f'{min(times):.3f}', f'{max(times):.3f}'])
+	
+	if median > args.budget or len(leaked_packages) > 0:
+		sys.exit(1)
@@ -0,0 +1,81 @@
+"""
+Measures the increase of the peak memory (RSS) of the process when 
+calling each plotting method with data of different types, i.e. how
+much memory myplotlib uses in addition to the user's data. Each
+measurement runs in a new process. The figures are lazy, so only the
+ingestion of the data is measured and not the plotting package.
+
+Usage:
+	python benchmarks/ingestion_memory.py [--points N]
+"""
+import numpy as np
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+INPUT_TYPES = ['numpy', 'memmap', 'pandas', 'arrow', 'list']
+METHODS = ['plot y', 'plot x y', 'fill_between', 'error_band']
+
+def measure(method, input_type, n_points, directory):
+	# Runs in the new process, returns the increase of the peak RSS in MB or None if <input_type> is not installed.
+	import resource
+	import myplotlib as mpl
+	
+	def as_input(array, name):
+		if input_type == 'numpy':
+			return array
+		if input_type == 'memmap':
+			memmap = np.lib.format.open_memmap(Path(directory)/f'{name}.npy', mode='w+', dtype=array.dtype, shape=array.shape)
+			memmap[:] = array
+			memmap.flush()
+			return np.load(Path(directory)/f'{name}.npy', mmap_mode='r')
+		if input_type == 'pandas':
+			import pandas
+			return pandas.Series(array)
+		if input_type == 'arrow':
+			import pyarrow
+			return pyarrow.array(array)
+		if input_type == 'list':
+			return array.tolist()
+	
+	try:
+		x = as_input(np.arange(n_points, dtype=float), 'x')
+		y = as_input(np.sin(np.arange(n_points, dtype=float)), 'y')
+		ytop = as_input(np.sin(np.arange(n_points, dtype=float)) + 1, 'ytop')
+		ylow = as_input(np.sin(np.arange(n_points, dtype=float)) - 1, 'ylow')
+	except ImportError:
+		return None
+	fig = mpl.manager.new(package='plotly', lazy=True)
+	peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	if method == 'plot y':
+		fig.plot(y)
+	elif method == 'plot x y':
+		fig.plot(x, y)
+	elif method == 'fill_between':
+		fig.fill_between(x, y)
+	elif method == 'error_band':
+		fig.error_band(x, y, ytop, ylow)
+	return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_before)/1e3 # ru_maxrss is in kB on Linux.
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Benchmark of the memory used when ingesting data into the plotting methods.')
+	parser.add_argument('--points', type=int, default=10_000_000, help='Number of points of each array.')
+	parser.add_argument('--measure', nargs=2, metavar=('METHOD', 'INPUT_TYPE'), help=argparse.SUPPRESS) # Used to run each measurement in a new process.
+	args = parser.parse_args()
+	
+	if args.measure is not None:
+		with tempfile.TemporaryDirectory() as directory:
+			print(measure(args.measure[0], args.measure[1], args.points, directory))
+		sys.exit(0)
+	
+	print(f'Size of each array: {args.points*8/1e6:.0f} MB')
+	print(f'{"method":<14}' + ''.join(f'{input_type:>10}' for input_type in INPUT_TYPES) + '   (increase of the peak RSS in MB)')
+	for method in METHODS:
+		row = f'{method:<14}'
+		for input_type in INPUT_TYPES:
+			result = subprocess.run([sys.executable, __file__, '--points', str(args.points), '--measure', method, input_type], capture_output=True, text=True, check=True)
+			value = result.stdout.strip().splitlines()[-1]
+			row += f'{"n/a" if value == "None" else f"{float(value):.0f}":>10}'
+		print(row)
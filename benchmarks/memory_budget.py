@@ -0,0 +1,55 @@
+"""
+Measures the peak memory (RSS) and the time of a script that creates
+many figures and then saves them all, with and without a memory budget
+(see "FigureManager.set_memory_budget"). Each measurement runs in a new
+process.
+
+Usage:
+	python benchmarks/memory_budget.py [--figures N] [--points N] [--package PACKAGE]
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+
+BUDGETS = {
+	'no budget': dict(),
+	'max_figures=10': dict(max_figures=10),
+	'max_bytes=50 MB': dict(max_bytes=50_000_000),
+}
+
+def measure(budget, n_figures, n_points, package, directory):
+	# Runs in the new process, returns the peak RSS in MB and the time in seconds.
+	import resource
+	import time
+	import numpy as np
+	import myplotlib as mpl
+	
+	start = time.perf_counter()
+	mpl.manager.set_memory_budget(**BUDGETS[budget])
+	for k in range(n_figures):
+		fig = mpl.manager.new(title=f'figure {k}', package=package, lazy=True)
+		x = np.linspace(0, 1, n_points)
+		fig.plot(x, np.sin(x*k))
+	mpl.manager.save_all(mkdir=directory)
+	return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1e3, time.perf_counter() - start # ru_maxrss is in kB on Linux.
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Benchmark of the memory used by many figures with and without a memory budget.')
+	parser.add_argument('--figures', type=int, default=200, help='Number of figures.')
+	parser.add_argument('--points', type=int, default=100_000, help='Number of points of each figure.')
+	parser.add_argument('--package', default='plotly', help='Plotting package.')
+	parser.add_argument('--measure', metavar='BUDGET', help=argparse.SUPPRESS) # Used to run each measurement in a new process.
+	args = parser.parse_args()
+	
+	if args.measure is not None:
+		with tempfile.TemporaryDirectory() as directory:
+			print(*measure(args.measure, args.figures, args.points, args.package, directory))
+		sys.exit(0)
+	
+	print(f'{args.figures} figures with {args.points} points each ({args.figures*args.points*16/1e6:.0f} MB of data) with {args.package}')
+	print(f'{"budget":<18}{"peak RSS (MB)":>15}{"time (s)":>10}')
+	for budget in BUDGETS:
+		result = subprocess.run([sys.executable, __file__, '--figures', str(args.figures), '--points', str(args.points), '--package', args.package, '--measure', budget], capture_output=True, text=True, check=True)
+		peak, seconds = result.stdout.strip().splitlines()[-1].split()
+		print(f'{budget:<18}{float(peak):>15.0f}{float(seconds):>10.1f}')
@@ -0,0 +1,57 @@
+"""
+Compares the time to create and save a plotly figure with many traces
+using myplotlib (plain dict traces) and using plotly.graph_objects, as
+myplotlib did before.
+
+Usage:
+	python benchmarks/plotly_traces.py [--traces N [N ...]] [--points N]
+"""
+import myplotlib as mpl
+import plotly.graph_objects as go
+import plotly
+import numpy as np
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+def graph_objects_figure(traces):
+	# What myplotlib did before: add each trace as a validated object and then modify it.
+	fig = go.Figure()
+	for x, y in traces:
+		fig.add_trace(go.Scatter(x=x, y=y, mode='lines', showlegend=False))
+		fig['data'][-1]['line']['width'] = 1
+		fig['data'][-1]['opacity'] = 1
+	return fig
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Benchmark of plotly figures with many traces.')
+	parser.add_argument('--traces', type=int, nargs='+', default=[1000, 5000, 10000], help='Number of traces.')
+	parser.add_argument('--points', type=int, default=100, help='Number of points of each trace.')
+	args = parser.parse_args()
+	
+	directory = Path(tempfile.mkdtemp())
+	
+	print(f'{"traces":>8}{"graph_objects plot [s]":>24}{"save [s]":>10}{"myplotlib plot [s]":>20}{"save [s]":>10}{"speedup":>10}')
+	for n_traces in args.traces:
+		x = np.arange(args.points)
+		traces = [(x, np.random.randn(args.points)) for _ in range(n_traces)]
+		
+		start = time.perf_counter()
+		fig = graph_objects_figure(traces)
+		go_plot_time = time.perf_counter() - start
+		start = time.perf_counter()
+		plotly.offline.plot(fig, filename=str(directory/f'go_{n_traces}.html'), auto_open=False, include_plotlyjs='cdn')
+		go_save_time = time.perf_counter() - start
+		
+		fig = mpl.manager.new(package='plotly')
+		start = time.perf_counter()
+		for x, y in traces:
+			fig.plot(x, y, linewidth=1, alpha=1)
+		plot_time = time.perf_counter() - start
+		start = time.perf_counter()
+		fig.save(fname=str(directory/f'myplotlib_{n_traces}.html'))
+		save_time = time.perf_counter() - start
+		mpl.manager.delete(fig)
+		
+		print(f'{n_traces:>8}{go_plot_time:>24.3f}{go_save_time:>10.3f}{plot_time:>20.3f}{save_time:>10.3f}{(go_plot_time+go_save_time)/(plot_time+save_time):>10.1f}')
@@ -0,0 +1,195 @@
+"""
+Benchmark of every plotting method, and of saving, with every plotting
+package. For each case it records the wall time, the increase of the
+peak memory (RSS) and the size of the output file, and compares them
+with a baseline stored by a previous run so regressions show up. Each
+case runs in a new process, with synthetic data that is the same in
+every run.
+
+Usage:
+	python benchmarks/suite.py [--sizes quick|default|full] [--packages ...] [--methods ...] [--save-baseline] [--baseline FILE]
+
+The first run should be done with "--save-baseline", later runs are
+compared with it. The baseline depends on the machine, so it is not
+part of the repository. The exit code is 1 if any case is slower, uses
+more memory or produces a larger file than the baseline by more than
+<tolerance>.
+
+Sizes are number of points for "plot", "hist", "hist2d", "fill_between",
+"error_band", "save" and "save_all" (distributed among the figures),
+and number of pixels per side of the image for "colormap" and "contour".
+"""
+import argparse
+import subprocess
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+PACKAGES = ['matplotlib', 'plotly', 'ds9']
+METHODS = ['plot', 'hist', 'hist2d', 'fill_between', 'error_band', 'colormap', 'contour', 'save', 'save_all']
+IMAGE_METHODS = ['colormap', 'contour']
+SIZES = {
+	'quick': {'points': [10**3, 10**5], 'pixels': [64, 512]},
+	'default': {'points': [10**3, 10**5, 10**6], 'pixels': [256, 1024, 2048]},
+	'full': {'points': [10**3, 10**5, 10**6, 10**7, 10**8], 'pixels': [256, 1024, 4096, 8192]},
+}
+SAVE_ALL_FIGURES = 10
+DEFAULT_BASELINE = Path(__file__).resolve().parent/'suite_baseline.json'
+# Differences smaller than these are noise, not regressions.
+MIN_TIME_DIFFERENCE = .01 # Seconds.
+MIN_MEMORY_DIFFERENCE = 10 # MB.
+
+def dataset(method, size):
+	# Returns the arguments for <method> with <size> points or pixels per side, always the same ones.
+	import numpy as np
+	rng = np.random.default_rng(size)
+	if method in IMAGE_METHODS:
+		x = np.linspace(-1, 1, size)
+		xx, yy = np.meshgrid(x, x)
+		return dict(z = np.exp(-(xx**2 + 2*yy**2)*4) + rng.normal(scale=.05, size=xx.shape))
+	x = np.linspace(0, 10, size)
+	y = np.sin(x) + rng.normal(scale=.1, size=size)
+	if method == 'hist':
+		return dict(samples = rng.normal(size=size))
+	if method == 'hist2d':
+		samples = rng.normal(size=size)
+		return dict(x = samples, y = samples + rng.normal(scale=.5, size=size), bins = 100)
+	if method == 'fill_between':
+		return dict(x = x, y1 = y, y2 = y + 1)
+	if method == 'error_band':
+		return dict(x = x, y = y, ytop = y + .5, ylow = y - .5)
+	return dict(x = x, y = y)
+
+def measure(package, method, size, directory):
+	# Runs in the new process, returns a dict with the results. Raises NotImplementedError if <package> does not implement <method>.
+	import resource
+	import time
+	import math
+	import os
+	import myplotlib as mpl
+	
+	def peak_rss():
+		return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1e3 # ru_maxrss is in kB on Linux.
+	
+	drawing_method = 'colormap' if package == 'ds9' else 'plot' # The method used to have something to save.
+	if method in ['save', 'save_all']:
+		n_figures = SAVE_ALL_FIGURES if method == 'save_all' else 1
+		size = max(size//n_figures, 1)
+		if drawing_method == 'colormap': # Same number of points, in a square image.
+			size = max(math.isqrt(size), 1)
+		for k in range(n_figures):
+			fig = mpl.manager.new(title=f'figure {k}', package=package, lazy=True)
+			getattr(fig, drawing_method)(**dataset(drawing_method, size))
+	else:
+		args = dataset(method, size)
+		fig = mpl.manager.new(title='figure', package=package, lazy=False) # Not lazy, so calling the method also draws it.
+		if method not in type(fig).__dict__: # Same check as in the methods of MPLFigure.
+			raise NotImplementedError(f'<{method}> not implemented for {package}.')
+		getattr(fig, method)(**dataset(method, 16)) # So the first call of the method (e.g. imports) is not measured.
+	
+	peak_before = peak_rss()
+	start = time.perf_counter()
+	if method == 'save_all':
+		mpl.manager.save_all(mkdir=directory, delete_all=False)
+	elif method == 'save':
+		fig.save(f'{directory}/figure.png')
+	else:
+		getattr(fig, method)(**args)
+	seconds = time.perf_counter() - start
+	memory = peak_rss() - peak_before
+	file_size = sum(os.path.getsize(f'{directory}/{fname}') for fname in os.listdir(directory)) if method in ['save', 'save_all'] else None
+	mpl.manager.delete_all()
+	return {'time': seconds, 'memory': memory, 'file_size': file_size}
+
+def run_case(package, method, size, timeout):
+	# Runs one case in a new process and returns its results, or a dict with the error.
+	try:
+		result = subprocess.run(
+			[sys.executable, '-W', 'ignore', __file__, '--measure', package, method, str(size)],
+			capture_output = True,
+			text = True,
+			timeout = timeout,
+		)
+	except subprocess.TimeoutExpired:
+		return {'error': f'timeout after {timeout} s'}
+	if result.returncode != 0:
+		return {'error': (result.stderr.strip().splitlines() or ['unknown error'])[-1]}
+	return json.loads(result.stdout.strip().splitlines()[-1])
+
+def compare(result, baseline, tolerance):
+	# Returns a list with the regressions of <result> with respect to <baseline>.
+	regressions = []
+	if 'error' in result or baseline is None or 'error' in baseline:
+		return regressions
+	if result['time'] > baseline['time']*(1+tolerance) and result['time'] - baseline['time'] > MIN_TIME_DIFFERENCE:
+		regressions.append(f'time {baseline["time"]:.3g} -> {result["time"]:.3g} s')
+	if result['memory'] > baseline['memory']*(1+tolerance) and result['memory'] - baseline['memory'] > MIN_MEMORY_DIFFERENCE:
+		regressions.append(f'memory {baseline["memory"]:.0f} -> {result["memory"]:.0f} MB')
+	if result['file_size'] is not None and baseline['file_size'] is not None and result['file_size'] > baseline['file_size']*(1+tolerance):
+		regressions.append(f'file size {baseline["file_size"]/1e6:.3g} -> {result["file_size"]/1e6:.3g} MB')
+	return regressions
+
+def format_result(result, baseline):
+	if 'error' in result:
+		return f'{result["error"][:60]}'
+	text = f'{result["time"]:>10.3f}{result["memory"]:>10.0f}'
+	text += f'{result["file_size"]/1e6:>10.2f}' if result['file_size'] is not None else f'{"":>10}'
+	if baseline is not None and 'error' not in baseline:
+		text += f'{result["time"]/baseline["time"]:>9.2f}x' if baseline['time'] > 0 else f'{"":>10}'
+	return text
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Benchmark of every plotting method with every plotting package.')
+	parser.add_argument('--sizes', choices=list(SIZES), default='default', help='Set of sizes of the data, "full" goes up to 10^8 points and 8192² images and needs a lot of memory and time.')
+	parser.add_argument('--packages', nargs='+', choices=PACKAGES, default=PACKAGES)
+	parser.add_argument('--methods', nargs='+', choices=METHODS, default=METHODS)
+	parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='JSON file with the results of a previous run.')
+	parser.add_argument('--save-baseline', action='store_true', help='Store the results of this run as the baseline.')
+	parser.add_argument('--tolerance', type=float, default=.25, help='Relative increase with respect to the baseline considered a regression.')
+	parser.add_argument('--timeout', type=float, default=600, help='Maximum time in seconds for each case.')
+	parser.add_argument('--measure', nargs=3, metavar=('PACKAGE', 'METHOD', 'SIZE'), help=argparse.SUPPRESS) # Used to run each case in a new process.
+	args = parser.parse_args()
+	
+	if args.measure is not None:
+		package, method, size = args.measure
+		with tempfile.TemporaryDirectory() as directory:
+			try:
+				print(json.dumps(measure(package, method, int(size), directory)))
+			except NotImplementedError:
+				print(json.dumps({'error': 'not implemented'}))
+		sys.exit(0)
+	
+	baseline = {}
+	if args.baseline.exists() and not args.save_baseline:
+		with open(args.baseline) as f:
+			baseline = json.load(f)
+	
+	results = {}
+	regressions = {}
+	print(f'{"case":<36}{"time (s)":>10}{"mem (MB)":>10}{"file (MB)":>10}{"vs base":>10}')
+	for package in args.packages:
+		for method in args.methods:
+			for size in SIZES[args.sizes]['pixels' if method in IMAGE_METHODS else 'points']:
+				case = f'{package} {method} {size}'
+				results[case] = run_case(package, method, size, args.timeout)
+				print(f'{case:<36}{format_result(results[case], baseline.get(case))}', flush=True)
+				case_regressions = compare(results[case], baseline.get(case), args.tolerance)
+				if len(case_regressions) > 0:
+					regressions[case] = case_regressions
+	
+	if args.save_baseline:
+		if args.baseline.exists():
+			with open(args.baseline) as f:
+				results = {**json.load(f), **results} # Keep the cases that were not run this time.
+		with open(args.baseline, 'w') as f:
+			json.dump(results, f, indent='\t', sort_keys=True)
+		print(f'Baseline saved in {args.baseline}')
+	elif len(baseline) == 0:
+		print(f'There is no baseline in {args.baseline}, use --save-baseline to create it.')
+	
+	if len(regressions) > 0:
+		print(f'\n{len(regressions)} regressions with respect to the baseline (tolerance {args.tolerance*100:.0f} %):')
+		for case, case_regressions in regressions.items():
+			print(f'- {case}: {", ".join(case_regressions)}')
+		sys.exit(1)
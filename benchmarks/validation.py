@@ -0,0 +1,39 @@
+"""
+Measures the time per call of the plotting methods with many small
+series for each validation level. The figures are lazy, so only the
+validation and the ingestion of the arguments are measured.
+
+Usage:
+	python benchmarks/validation.py [--calls N] [--points N]
+"""
+import myplotlib as mpl
+import numpy as np
+import argparse
+import time
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Benchmark of the validation levels.')
+	parser.add_argument('--calls', type=int, default=20000, help='Number of calls of each plotting method.')
+	parser.add_argument('--points', type=int, default=10, help='Number of points of each series.')
+	args = parser.parse_args()
+	
+	x = np.arange(args.points, dtype=float)
+	y = np.sin(x)
+	calls = {
+		'plot': lambda fig: fig.plot(x, y, color=(1,0,0), marker='.', label='series', alpha=.5, linewidth=1),
+		'fill_between': lambda fig: fig.fill_between(x, y, y+1, color=(1,0,0), label='series'),
+		'error_band': lambda fig: fig.error_band(x, y, y+1, y-1, color=(1,0,0), label='series'),
+		'hist': lambda fig: fig.hist(y, bins=9, color=(1,0,0), label='series'),
+	}
+	
+	print(f'{"method":<14}' + ''.join(f'{level:>12}' for level in ['full', 'fast', 'off']) + '   (µs per call)')
+	for method, call in calls.items():
+		row = f'{method:<14}'
+		for level in ['full', 'fast', 'off']:
+			fig = mpl.manager.new(package='plotly', lazy=True, validation=level)
+			start = time.perf_counter()
+			for _ in range(args.calls):
+				call(fig)
+			row += f'{(time.perf_counter() - start)/args.calls*1e6:>12.1f}'
+			mpl.manager.delete(fig)
+		print(row)
@@ -1,18 +1,40 @@
-from .wrapper_matplotlib import MPLMatplotlibWrapper
-from .wrapper_plotly import MPLPlotlyWrapper
-from .wrapper_saods9 import MPLSaoImageDS9Wrapper
 from .utils import get_timestamp
 import os
 import __main__
-from pathlib import Path
 import warnings
 
 warnings.warn(f'The package "myplotlib" is deprecated, not maintained anymore. Please use "grafica" instead https://github.com/SengerM/grafica')
 
+_LAZY_ATTRIBUTES_MODULES = {
+	'MPLMatplotlibWrapper': 'wrapper_matplotlib',
+	'MPLPlotlyWrapper': 'wrapper_plotly',
+	'MPLSaoImageDS9Wrapper': 'wrapper_saods9',
+	'HistogramAccumulator': 'histogram',
+	'Histogram2DAccumulator': 'histogram',
+}
+
+def __getattr__(name):
+	# These are imported the first time they are used, so "import myplotlib" does not import numpy, matplotlib, plotly, etc.
+	if name in _LAZY_ATTRIBUTES_MODULES:
+		from importlib import import_module
+		return getattr(import_module(f'.{_LAZY_ATTRIBUTES_MODULES[name]}', __name__), name)
+	raise AttributeError(f'module {repr(__name__)} has no attribute {repr(name)}')
+
 class FigureManager:
 	def __init__(self):
 		self.set_plotting_package('plotly')
+		self.set_lazy(False)
+		self.set_webgl(None)
+		self.set_validation('full')
+		self.set_cache(False)
+		self.set_memory_budget(None)
 		self.figures = []
+		self._process_pool = None
+		self._process_pool_jobs = None
+		self._thread_pool = None
+		self._cache_hits = 0
+		self._cache_misses = 0
+		self._spill_directory = None
 	
 	def set_plotting_package(self, package):
 		IMPLEMENTED_PACKAGES = ['matplotlib', 'plotly', 'ds9']
@@ -20,18 +42,196 @@ class FigureManager:
 			raise ValueError('<package> must be one of ' + str(IMPLEMENTED_PACKAGES))
 		self.plotting_package = package
 	
+	def set_lazy(self, lazy):
+		"""
+		If <lazy> is True, new figures only record what is plotted and
+		the objects of the plotting package are created when the figure
+		is saved or shown. Figures that are never saved or shown cost
+		(almost) nothing.
+		"""
+		if lazy not in [True, False]:
+			raise ValueError(f'<lazy> must be either True or False, received <{lazy}> of type {type(lazy)}.')
+		self.lazy = lazy
+	
+	def set_webgl(self, webgl):
+		"""
+		Sets the <webgl> property of all new plotly figures: True/False to
+		always/never draw with WebGL, or the number of points above which
+		a trace is drawn with WebGL. If None each figure uses its default,
+		see MPLPlotlyWrapper.WEBGL_THRESHOLD. Each figure can still
+		override this with "fig.set(webgl=...)".
+		"""
+		if webgl not in [True, False, None] and not (isinstance(webgl, int) and webgl >= 0):
+			raise ValueError(f'<webgl> must be True, False, None or a non negative integer number, received <{webgl}> of type {type(webgl)}.')
+		self.webgl = webgl
+	
+	def set_validation(self, validation):
+		"""
+		Sets the <validation> property of all new figures, i.e. how much
+		the arguments of the plotting methods are checked:
+		- "full": everything, the default.
+		- "fast": the names of the arguments, the lengths of the arrays and
+		  the checks that are vectorized, e.g. y<=ytop in "error_band".
+		  Useful when plotting many small series.
+		- "off": nothing, the caller is trusted. Invalid arguments may 
+		  produce wrong plots or obscure errors.
+		Each figure can still override this with "fig.set(validation=...)".
+		"""
+		VALIDATION_LEVELS = ['full', 'fast', 'off'] # Same as in figure.py, not imported from there so "import myplotlib" does not import numpy.
+		if validation not in VALIDATION_LEVELS:
+			raise ValueError(f'<validation> must be one of {VALIDATION_LEVELS}, received <{validation}> of type {type(validation)}.')
+		self.validation = validation
+	
+	def set_cache(self, cache):
+		"""
+		If <cache> is True "save_all" does not save again the figures whose
+		file is up to date, i.e. it was saved by "save_all" from a figure
+		with the same digest (see "MPLFigure.digest") and with the same
+		arguments. This is useful when running a script many times. Do not
+		use it if figures are modified through the objects of the plotting
+		package (e.g. "fig.matplotlib_ax"), since that is not taken into 
+		account. See also "cache_info".
+		"""
+		if cache not in [True, False]:
+			raise ValueError(f'<cache> must be either True or False, received <{cache}> of type {type(cache)}.')
+		self.cache = cache
+	
+	def cache_info(self):
+		"""
+		Returns a dict with the number of figures that "save_all" did not 
+		save because their files were up to date ("hits") and that it saved
+		while using the cache ("misses"), since this manager was created.
+		"""
+		return {'hits': self._cache_hits, 'misses': self._cache_misses}
+	
+	def set_memory_budget(self, max_figures=None, max_bytes=None, directory=None):
+		"""
+		Limits the memory used by the figures, for scripts that create
+		many figures before calling "save_all". Each time a figure is
+		created, if there are more than <max_figures> figures in memory or
+		the data of their display lists takes more than <max_bytes> bytes,
+		the figures that were used least recently are spilled: their 
+		display lists are written to files in <directory> and the objects
+		of the plotting package are closed. A spilled figure is loaded back
+		when it is used again (plotting, saving, showing, etc.) so nothing
+		changes for the user, except that anything drawn directly with the
+		objects of the plotting package (e.g. "fig.matplotlib_ax") is lost.
+		
+		Arguments
+		---------
+		max_figures : int, optional
+			Default: None
+			Maximum number of figures in memory, None for no limit.
+		max_bytes : int, optional
+			Default: None
+			Maximum number of bytes of data of the figures in memory, None
+			for no limit.
+		directory : str or Path, optional
+			Default: None
+			Directory for the spilled figures. If None a temporary directory
+			is used, which is removed when the manager is garbage collected.
+		"""
+		if max_figures is not None and (not isinstance(max_figures, int) or max_figures < 1):
+			raise ValueError(f'<max_figures> must be None or a positive integer number, received <{max_figures}> of type {type(max_figures)}.')
+		if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes < 0):
+			raise ValueError(f'<max_bytes> must be None or a non negative integer number, received <{max_bytes}> of type {type(max_bytes)}.')
+		self.max_figures = max_figures
+		self.max_bytes = max_bytes
+		self.spill_directory = directory
+	
+	def _enforce_memory_budget(self):
+		# Spills the least recently used figures until those in memory are within the budget, see "set_memory_budget".
+		if self.max_figures is None and self.max_bytes is None:
+			return
+		in_memory = sorted([fig for fig in self.figures if fig.SPILLABLE == True and fig._spilled == False], key=lambda fig: fig._last_used)
+		n_bytes = sum(fig._nbytes() for fig in in_memory) if self.max_bytes is not None else 0
+		n_figures = len(in_memory)
+		for fig in in_memory[:-1]: # The one used most recently is never spilled.
+			if (self.max_figures is None or n_figures <= self.max_figures) and (self.max_bytes is None or n_bytes <= self.max_bytes):
+				break
+			if self.max_bytes is not None:
+				n_bytes -= fig._nbytes()
+			fig._spill(self._get_spill_directory())
+			n_figures -= 1
+	
+	def _get_spill_directory(self):
+		if self.spill_directory is not None:
+			os.makedirs(self.spill_directory, exist_ok=True)
+			return self.spill_directory
+		if self._spill_directory is None:
+			import tempfile, shutil, weakref # Import here so they are only imported when needed.
+			self._spill_directory = tempfile.mkdtemp(prefix='myplotlib_spill_')
+			weakref.finalize(self, shutil.rmtree, self._spill_directory, ignore_errors=True)
+		return self._spill_directory
+	
+	def set_instrumentation(self, enabled):
+		"""
+		If <enabled> is True the time spent in each phase (validation,
+		creation of the figure, drawing, saving, etc.) of each call is
+		measured for all the figures, see "stats" and "add_event_hook".
+		When False (the default) nothing is measured and the overhead is
+		negligible. Figures saved in worker processes (see "save_all") are
+		not measured while being saved.
+		"""
+		if enabled not in [True, False]:
+			raise ValueError(f'<enabled> must be either True or False, received <{enabled}> of type {type(enabled)}.')
+		from . import instrumentation # Import here so it is only imported when needed.
+		instrumentation.set_enabled(enabled)
+	
+	def stats(self, reset=False):
+		"""
+		Returns what was measured since the instrumentation was turned on
+		(see "set_instrumentation") as a list of dicts, one for each
+		figure, phase and method, with keys "figure", "package", "phase",
+		"method", "calls", "seconds", "points" and "bytes". Sorted from the 
+		slowest to the fastest. If <reset> is True the measurements are
+		cleared.
+		"""
+		from . import instrumentation # Import here so it is only imported when needed.
+		return instrumentation.stats(reset=reset)
+	
+	def add_event_hook(self, hook):
+		"""
+		Calls <hook>(event) for each measurement while the instrumentation
+		is on, see "set_instrumentation". <event> is a dict, see the 
+		documentation of myplotlib.instrumentation.
+		"""
+		from . import instrumentation # Import here so it is only imported when needed.
+		instrumentation.add_hook(hook)
+	
+	def remove_event_hook(self, hook):
+		from . import instrumentation # Import here so it is only imported when needed.
+		instrumentation.remove_hook(hook)
+	
 	def new(self, **kwargs):
 		package_for_this_figure = kwargs.get('package') if 'package' in kwargs else self.plotting_package
 		if 'package' in kwargs: kwargs.pop('package')
+		lazy = kwargs.pop('lazy') if 'lazy' in kwargs else self.lazy
+		if lazy not in [True, False]:
+			raise ValueError(f'<lazy> must be either True or False, received <{lazy}> of type {type(lazy)}.')
+		if package_for_this_figure == 'plotly':
+			if 'webgl' not in kwargs and self.webgl is not None:
+				kwargs['webgl'] = self.webgl
+		elif 'webgl' in kwargs: # Only for plotly, ignore it so the same code works with any package.
+			kwargs.pop('webgl')
+		if package_for_this_figure != 'ds9':
+			for kwarg in ['fits_mode', 'quantize', 'compress']: # Only for ds9, ignore them so the same code works with any package.
+				kwargs.pop(kwarg, None)
+		if 'validation' not in kwargs:
+			kwargs['validation'] = self.validation
 		if package_for_this_figure == 'plotly':
-			self.figures.append(MPLPlotlyWrapper())
+			from .wrapper_plotly import MPLPlotlyWrapper # Import here so the package is only imported when it is used.
+			self.figures.append(MPLPlotlyWrapper(lazy=lazy))
 		elif package_for_this_figure == 'matplotlib':
-			self.figures.append(MPLMatplotlibWrapper())
+			from .wrapper_matplotlib import MPLMatplotlibWrapper # Import here so the package is only imported when it is used.
+			self.figures.append(MPLMatplotlibWrapper(lazy=lazy))
 		elif package_for_this_figure == 'ds9':
-			self.figures.append(MPLSaoImageDS9Wrapper())
+			from .wrapper_saods9 import MPLSaoImageDS9Wrapper # Import here so the package is only imported when it is used.
+			self.figures.append(MPLSaoImageDS9Wrapper(lazy=lazy))
 		self.figures[-1].set(**kwargs)
 		if 'title' not in kwargs:
 			self.figures[-1].set(title = f'figure_{len(self.figures)}', show_title = False)
+		self._enforce_memory_budget()
 		return self.figures[-1]
 	
 	# ~ def set_style(self, style):
@@ -44,7 +244,7 @@ class FigureManager:
 		# ~ elif style == 'latex two columns' and self.plotting_package == 'matplotlib':
 			# ~ plt.style.use(os.path.dirname(os.path.abspath(__file__)) + '/rc_styles/latex_two_columns_rc_style')
 	
-	def save_all(self, timestamp=False, mkdir=True, format='png', delete_all=True, *args, **kwargs):
+	def save_all(self, timestamp=False, mkdir=True, format='png', delete_all=True, *args, jobs=None, executor=None, cache=None, force=False, **kwargs):
 		"""
 		Use this function to save all plots made with the current manager at once.
 		
@@ -70,7 +270,95 @@ class FigureManager:
 		format : string, optional
 			Default: 'png'
 			Format of image files. Default is 'png'. 
+		jobs : int, optional
+			Default: None
+			Number of worker processes used to render and write the figures
+			in parallel. If None or 1 the figures are saved one after the
+			other in this process. The worker processes are kept alive
+			between calls (see "shutdown_workers") so they do not import
+			matplotlib/plotly each time.
+		executor : concurrent.futures.Executor, optional
+			Default: None
+			If given, figures are saved by submitting them to this executor
+			instead of using the pool of the manager. The executor is not
+			shut down by this function.
+		cache : bool, optional
+			Default: None
+			If True the figures whose file is up to date are not saved
+			again, see "set_cache". If None the value set with "set_cache"
+			is used.
+		force : bool, optional
+			Default: False
+			If True all the figures are saved even if <cache> is True, and
+			the cache is updated.
+		
+		If the figures are saved in parallel and some of them fail, all
+		the others are still saved and then a RuntimeError listing each
+		failed figure is raised.
 		"""
+		figures = list(zip(self.figures, self._file_names(timestamp, mkdir, format)))
+		n_figures = len(figures)
+		figures, digests = self._lookup_cache(figures, self.cache if cache is None else cache, force, *args, **kwargs)
+		if executor is None and jobs not in [None, 1]:
+			executor = self._get_process_pool(jobs)
+		saved = [] # Indices in <figures>, not file names, because several figures may have the same title.
+		failures = {}
+		try:
+			if executor is None:
+				for k, (_fig, fname) in enumerate(figures):
+					_fig.save(fname = fname, *args, **kwargs)
+					saved.append(k)
+					self._enforce_memory_budget() # Saving loads the figure if it was spilled.
+			else:
+				failures = self._save_in_executor(executor, figures, *args, **kwargs)
+				saved = [k for k in range(len(figures)) if k not in failures]
+		finally:
+			self._update_cache(dict(digests[k] for k in saved))
+		if len(failures) > 0:
+			_raise_failures([(figures[k][1], e) for k, e in failures.items()], n_figures)
+		if delete_all == True:
+			self.delete_all()
+	
+	def _lookup_cache(self, figures, cache, force, *args, **kwargs):
+		# Returns the (figure, fname) pairs in <figures> whose files are not up to date, and the (output file name, digest) of each of them in the same order. If <cache> is False all of them are returned, with None as digest.
+		if cache == False:
+			return figures, [(_fig._output_file_name(fname), None) for _fig, fname in figures]
+		from . import render_cache # Import here so it is only imported when needed.
+		indices = {}
+		to_save = []
+		digests = []
+		for _fig, fname in figures:
+			digest = _fig.digest()
+			if digest is not None:
+				digest = render_cache.digest(digest, list(args), kwargs)
+			output = _fig._output_file_name(fname)
+			directory, name = os.path.split(output)
+			if directory not in indices:
+				indices[directory] = render_cache.load_index(directory)
+			if force == False and digest is not None and indices[directory].get(name) == digest and os.path.isfile(output):
+				self._cache_hits += 1
+				continue
+			self._cache_misses += 1
+			to_save.append((_fig, fname))
+			digests.append((output, digest))
+		return to_save, digests
+	
+	def _update_cache(self, digests):
+		# Stores in the cache indices the digest of each file in the dict {output file name: digest}. A None digest removes the file from the index, because it was written by a figure that was not digested.
+		from . import render_cache # Import here so it is only imported when needed.
+		directories = {}
+		for output, digest in digests.items():
+			directory, name = os.path.split(output)
+			directories.setdefault(directory, {})[name] = digest
+		for directory, new_digests in directories.items():
+			index = render_cache.load_index(directory)
+			updated_index = {name: digest for name, digest in {**index, **new_digests}.items() if digest is not None}
+			if updated_index != index: # Directories without cache are not touched.
+				render_cache.save_index(directory, updated_index)
+	
+	def _file_names(self, timestamp, mkdir, format):
+		# Returns the name of the file of each figure for "save_all", creating the directory if needed.
+		from pathlib import Path # Import here because it takes a considerable fraction of the time of "import myplotlib".
 		current_timestamp = get_timestamp()
 		if mkdir != False:
 			if isinstance(mkdir, Path):
@@ -82,27 +370,213 @@ class FigureManager:
 				os.makedirs(directory)
 		else:
 			directory = './'
+		fnames = []
 		for k,_fig in enumerate(self.figures):
 			file_name = current_timestamp + ' ' if timestamp == True else ''
 			file_name += _fig.title if _fig.title != None else 'figure ' + str(k+1)
-			_fig.save(fname = str(Path(f'{directory}/{file_name}.{format}')), *args, **kwargs)
+			fnames.append(str(Path(f'{directory}/{file_name}.{format}')))
+		return fnames
+	
+	def save_all_futures(self, timestamp=False, mkdir=True, format='png', *args, jobs=None, executor=None, cache=None, force=False, **kwargs):
+		"""
+		Starts saving all the figures without waiting for them, for using
+		myplotlib within an asyncio event loop. Each figure is rendered and
+		written in an executor, so the event loop is not blocked. Must be
+		called from a coroutine or callback running in the event loop.
+		
+		Arguments
+		---------
+		The same as for "save_all". If neither <jobs> nor <executor> are
+		given the figures are saved one after the other in a thread of the
+		manager, because matplotlib is not thread safe. The futures of the
+		figures that were not saved because of the cache are already done.
+		
+		Returns
+		-------
+		futures : dict
+			{figure: asyncio.Future}, in the same order as the figures.
+			Each future is done when its figure is saved, and cancelling
+			it before the figure started to be saved skips that figure. The
+			figures are not deleted, see "save_all_async".
+		
+		The figures must not be modified until their futures are done.
+		"""
+		return {_fig: future for _fig, fname, future in self._save_futures(timestamp, mkdir, format, *args, jobs=jobs, executor=executor, cache=cache, force=force, **kwargs)}
+	
+	def _save_futures(self, timestamp, mkdir, format, *args, jobs, executor, cache, force, **kwargs):
+		# Returns a (figure, fname, future) tuple for each figure, see "save_all_futures". Not keyed by file name because several figures may have the same title.
+		import asyncio # Import here so it is only imported when needed.
+		loop = asyncio.get_running_loop()
+		all_figures = list(zip(self.figures, self._file_names(timestamp, mkdir, format)))
+		futures = {id(_fig): None for _fig, fname in all_figures}
+		figures, digests = self._lookup_cache(all_figures, self.cache if cache is None else cache, force, *args, **kwargs)
+		if executor is None and jobs not in [None, 1]:
+			executor = self._get_process_pool(jobs)
+		for (_fig, fname), digest in zip(figures, digests):
+			if executor is not None and _fig.SAVE_IN_WORKER == True:
+				future = executor.submit(_save_figure_in_worker, _fig, fname, *args, **kwargs)
+			else:
+				if _fig.RENDER_IN_MAIN_THREAD == True:
+					_fig._render() # Creating the figure is quick, drawing it is what takes time and that happens in "save".
+				future = self._get_thread_pool().submit(_fig.save, fname, *args, **kwargs)
+			futures[id(_fig)] = asyncio.wrap_future(future, loop=loop)
+			futures[id(_fig)].add_done_callback(lambda future, digest=digest: self._update_cache(dict([digest])) if not future.cancelled() and future.exception() is None else None)
+		for key in futures:
+			if futures[key] is None: # Not saved because it is up to date.
+				futures[key] = loop.create_future()
+				futures[key].set_result(None)
+		return [(_fig, fname, futures[id(_fig)]) for _fig, fname in all_figures]
+	
+	async def save_all_async(self, timestamp=False, mkdir=True, format='png', delete_all=True, *args, jobs=None, executor=None, cache=None, force=False, **kwargs):
+		"""
+		The same as "save_all" but for asyncio, i.e. use it as
+		"await manager.save_all_async()". The figures are rendered and
+		written in an executor (see "save_all_futures") so the event loop
+		keeps running meanwhile.
+		
+		If it is cancelled, the figures that did not start to be saved are
+		skipped, then it waits for the ones that are being saved and
+		nothing is deleted, so it can be called again.
+		
+		Returns
+		-------
+		fnames : list of str
+			The name of the file of each figure.
+		"""
+		import asyncio # Import here so it is only imported when needed.
+		figures = list(self.figures) # New figures may be created meanwhile, these are not deleted.
+		saving = self._save_futures(timestamp, mkdir, format, *args, jobs=jobs, executor=executor, cache=cache, force=force, **kwargs)
+		futures = [future for _fig, fname, future in saving]
+		if len(futures) > 0:
+			try:
+				await asyncio.wait(futures)
+			except asyncio.CancelledError:
+				for future in futures:
+					future.cancel() # Does not stop a figure that is being saved, only the ones that did not start.
+				await asyncio.wait(futures) # The ones being saved cannot be interrupted, wait so no files are left half written.
+				raise
+		failures = []
+		for _fig, fname, future in saving:
+			if future.cancelled(): # One of the futures was cancelled by the user.
+				failures.append((fname, asyncio.CancelledError()))
+			elif future.exception() is not None:
+				failures.append((fname, future.exception()))
+		if len(failures) > 0:
+			_raise_failures(failures, len(futures))
 		if delete_all == True:
-			self.delete_all()
+			for _fig in figures:
+				if _fig in self.figures:
+					self.delete(_fig)
+		return [fname for _fig, fname, future in saving]
+	
+	def _save_in_executor(self, executor, figures, *args, **kwargs):
+		# Saves the (figure, fname) pairs in <figures> and returns {index in <figures>: exception} for the ones that failed. Not keyed by file name because several figures may have the same title.
+		futures = {}
+		failures = {}
+		for k, (_fig, fname) in enumerate(figures):
+			if _fig.SAVE_IN_WORKER == True:
+				futures[k] = executor.submit(_save_figure_in_worker, _fig, fname, *args, **kwargs)
+			else:
+				try:
+					_fig.save(fname = fname, *args, **kwargs)
+				except Exception as e:
+					failures[k] = e
+		for k, future in futures.items():
+			try:
+				future.result()
+			except Exception as e:
+				failures[k] = e
+		return dict(sorted(failures.items())) # In the same order as the figures.
 	
-	def show(self):
+	def _get_process_pool(self, jobs):
+		if not isinstance(jobs, int) or jobs < 1:
+			raise ValueError(f'<jobs> must be a positive integer, received <{jobs}> of type {type(jobs)}.')
+		if self._process_pool is None or self._process_pool_jobs != jobs:
+			self.shutdown_workers()
+			from concurrent.futures import ProcessPoolExecutor # Import here so it is only imported when needed.
+			self._process_pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker)
+			self._process_pool_jobs = jobs
+		return self._process_pool
+	
+	def _get_thread_pool(self):
+		if self._thread_pool is None:
+			from concurrent.futures import ThreadPoolExecutor # Import here so it is only imported when needed.
+			self._thread_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='myplotlib') # Only one, matplotlib is not thread safe.
+		return self._thread_pool
+	
+	def shutdown_workers(self):
+		"""Shuts down the worker processes used by "save_all(jobs=...)" and the thread used by "save_all_futures", if any."""
+		if self._process_pool is not None:
+			self._process_pool.shutdown()
+		if self._thread_pool is not None:
+			self._thread_pool.shutdown()
+		self._process_pool = None
+		self._process_pool_jobs = None
+		self._thread_pool = None
+	
+	def show(self, block=True):
+		"""
+		Shows all the figures. If <block> is False it returns right away
+		instead of waiting for the matplotlib windows to be closed, see
+		also "show_async".
+		"""
 		for fig in self.figures:
-			fig.show()
+			fig.show(block=block)
+	
+	async def show_async(self, poll_interval=.05):
+		"""
+		Shows all the figures without blocking the asyncio event loop in
+		which it is awaited, and returns when all the windows are closed.
+		Meanwhile the events of the windows are processed every
+		<poll_interval> seconds so they respond. Figures that are not
+		shown in a window of this process (plotly, ds9, or matplotlib with
+		a non interactive backend) do not need this. If it is cancelled the
+		windows stay open, but they do not respond until their events are
+		processed again (e.g. with another call to this method).
+		"""
+		import asyncio # Import here so it is only imported when needed.
+		figures = list(self.figures)
+		for fig in figures:
+			fig.show(block=False)
+		while True:
+			figures = [fig for fig in figures if fig._flush_events() == True]
+			if len(figures) == 0:
+				return
+			await asyncio.sleep(poll_interval)
 	
 	def delete(self, fig):
 		self.figures.remove(fig)
 		fig.close()
+		fig._discard_spill()
 	
 	def delete_all_figs(self):
 		for fig in self.figures:
 			fig.close()
+			fig._discard_spill()
 		self.figures = []
 	
 	def delete_all(self):
 		self.delete_all_figs()
 
+def _init_worker():
+	# Worker processes never show figures, so use a non interactive backend.
+	import sys
+	if 'matplotlib.pyplot' in sys.modules: # Inherited from the parent process.
+		sys.modules['matplotlib.pyplot'].switch_backend('Agg')
+	elif 'matplotlib' in sys.modules:
+		sys.modules['matplotlib'].use('Agg')
+	else:
+		os.environ['MPLBACKEND'] = 'Agg'
+
+def _raise_failures(failures, n_figures):
+	# <failures> is a list of (fname, exception).
+	failures_str = '\n'.join([f'- {fname}: {repr(e)}' for fname, e in failures])
+	raise RuntimeError(f'Could not save {len(failures)} out of {n_figures} figures, the others were saved:\n{failures_str}') from failures[0][1]
+
+def _save_figure_in_worker(fig, fname, *args, **kwargs):
+	try:
+		fig.save(fname = fname, *args, **kwargs)
+	finally:
+		fig.close()
+
 manager = FigureManager()
@@ -0,0 +1,77 @@
+import numpy as np
+
+DOWNSAMPLE_METHODS = ['minmax', 'lttb']
+
+def minmax_indices(y, n_points):
+	"""
+	Splits <y> in n_points/2 buckets of consecutive samples and returns
+	the (sorted) indices of the minimum and maximum of each bucket, plus
+	the first and last samples. Drawing only these points looks the same
+	as drawing all of them when each bucket is about one pixel wide.
+	"""
+	y = np.asarray(y)
+	if len(y) <= n_points:
+		return np.arange(len(y))
+	n_buckets = max(n_points//2, 1)
+	bucket_size = int(np.ceil(len(y)/n_buckets))
+	n_buckets = int(np.ceil(len(y)/bucket_size))
+	padded = np.full(n_buckets*bucket_size, np.nan)
+	padded[:len(y)] = y
+	padded = padded.reshape(n_buckets, bucket_size)
+	nans = np.isnan(padded)
+	bucket_starts = np.arange(n_buckets)*bucket_size
+	argmin = np.where(nans, np.inf, padded).argmin(axis=1) # If a bucket is all NaN this picks a NaN, which keeps the gap in the line.
+	argmax = np.where(nans, -np.inf, padded).argmax(axis=1)
+	indices = np.concatenate(([0, len(y)-1], bucket_starts + argmin, bucket_starts + argmax))
+	return np.unique(indices[indices < len(y)])
+
+def lttb_indices(x, y, n_points):
+	"""
+	Returns the (sorted) indices of the <n_points> selected by the
+	"Largest Triangle Three Buckets" algorithm, see
+	https://skemman.is/bitstream/1946/15343/3/SS_MSthesis.pdf
+	The areas of all the points in a bucket are computed at once, the
+	loop is over the buckets.
+	"""
+	x = np.asarray(x, dtype=float)
+	y = np.asarray(y, dtype=float)
+	if len(y) <= n_points or n_points < 3:
+		return np.arange(len(y))
+	# First and last points are always selected, the others are split in n_points-2 buckets.
+	bucket_edges = np.linspace(1, len(y)-1, n_points-1).astype(int)
+	x_means = np.add.reduceat(x[1:-1], bucket_edges[:-1]-1)/np.diff(bucket_edges)
+	y_means = np.add.reduceat(y[1:-1], bucket_edges[:-1]-1)/np.diff(bucket_edges)
+	x_means = np.append(x_means, x[-1])
+	y_means = np.append(y_means, y[-1])
+	indices = np.empty(n_points, dtype=int)
+	indices[0] = 0
+	indices[-1] = len(y)-1
+	selected = 0
+	for bucket in range(n_points-2):
+		first, last = bucket_edges[bucket], bucket_edges[bucket+1]
+		areas = np.abs(
+			(x[selected] - x_means[bucket+1])*(y[first:last] - y[selected])
+			- (x[selected] - x[first:last])*(y_means[bucket+1] - y[selected])
+		)
+		selected = first + np.nanargmax(areas) if not np.isnan(areas).all() else first
+		indices[bucket+1] = selected
+	return indices
+
+def downsample_indices(x, ys, method, n_points):
+	"""
+	Returns the sorted indices of the points to draw so that each curve
+	in <ys> (all of them with the same <x>) keeps its visual shape when
+	drawn with about <n_points> points. If there is more than one curve
+	the points selected for each of them are merged.
+	"""
+	if method not in DOWNSAMPLE_METHODS:
+		raise ValueError(f'<method> must be one of {DOWNSAMPLE_METHODS}, received {repr(method)}.')
+	indices = []
+	for y in ys:
+		if method == 'minmax':
+			indices.append(minmax_indices(y, n_points))
+		elif method == 'lttb':
+			indices.append(lttb_indices(x, y, n_points))
+	if len(indices) == 1:
+		return indices[0]
+	return np.unique(np.concatenate(indices))
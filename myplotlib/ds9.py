@@ -0,0 +1,123 @@
+"""
+Session with one SAOImageDS9 window to which images are sent through
+XPA, its command line control channel. Starting ds9 once and sending it
+one frame per image does not block Python until the window is closed,
+as running "ds9 image.fits" for each image does.
+"""
+import subprocess
+import time
+import os
+
+class DS9Session:
+	"""
+	One ds9 process, started the first time it is needed. Each image is
+	shown in a new frame of the same window.
+	
+	Example
+	-------
+	>>> session = DS9Session()
+	>>> session.show_fits('image.fits', scale='log')
+	>>> session.show_fits('another_image.fits')
+	>>> session.close()
+	"""
+	def __init__(self, name='myplotlib', ds9_command='ds9', xpaset_command='xpaset', timeout=10):
+		"""
+		Arguments
+		---------
+		name : str, optional
+			Title of the ds9 window, which is also the name of its XPA
+			access point.
+		ds9_command : str, optional
+			Command that starts ds9.
+		xpaset_command : str, optional
+			Command that sends commands to ds9, see
+			http://ds9.si.edu/doc/ref/xpa.html
+		timeout : float, optional
+			Seconds to wait for ds9 to accept commands after it was
+			started.
+		"""
+		self.name = name
+		self.ds9_command = ds9_command
+		self.xpaset_command = xpaset_command
+		self.timeout = timeout
+		self._process = None
+		self._n_frames = 0
+	
+	def is_running(self):
+		"""Returns True if the ds9 process of this session is running."""
+		return self._process is not None and self._process.poll() is None
+	
+	def start(self):
+		"""Starts ds9 if it is not running, does not wait for its window to be closed."""
+		if self.is_running():
+			return
+		try:
+			self._process = subprocess.Popen(
+				[self.ds9_command, '-title', self.name],
+				stdin = subprocess.DEVNULL,
+				stdout = subprocess.DEVNULL,
+				stderr = subprocess.DEVNULL,
+				start_new_session = True, # So Ctrl+C in the terminal does not close the window.
+			)
+		except FileNotFoundError as e:
+			raise RuntimeError(f'Cannot start ds9 with the command {repr(self.ds9_command)}, please check that SAOImageDS9 is installed.') from e
+		self._n_frames = 0
+	
+	def send(self, *command: str):
+		"""
+		Sends <command> to ds9, e.g. send('scale', 'log'), starting it if
+		it is not running. Right after starting, ds9 needs some time until
+		it accepts commands, so failed commands are retried until
+		<timeout>.
+		"""
+		self.start()
+		deadline = time.monotonic() + self.timeout
+		while True:
+			result = subprocess.run(
+				[self.xpaset_command, '-p', self.name, *command],
+				stdin = subprocess.DEVNULL,
+				capture_output = True,
+				text = True,
+			)
+			if result.returncode == 0:
+				return
+			if not self.is_running():
+				raise RuntimeError(f'ds9 is not running, it was probably closed. Command {repr(" ".join(command))} was not sent.')
+			if time.monotonic() > deadline:
+				raise RuntimeError(f'ds9 did not accept the command {repr(" ".join(command))} after {self.timeout} seconds: {result.stderr.strip()}')
+			time.sleep(.1)
+	
+	def show_fits(self, fname, scale='linear', multi_extension=False):
+		"""
+		Shows the FITS file <fname> in a new frame, with <scale> being any
+		scale of ds9 such as "linear" or "log". If <multi_extension> is
+		True the images in the extensions of the file are shown as a cube.
+		"""
+		if not self.is_running():
+			self._n_frames = 0
+		if self._n_frames > 0: # ds9 starts with one empty frame.
+			self.send('frame', 'new')
+		self.send('mecube' if multi_extension == True else 'file', os.path.abspath(fname))
+		self.send('scale', scale)
+		self._n_frames += 1
+	
+	def close(self):
+		"""Closes ds9, if it is running."""
+		if not self.is_running():
+			return
+		try:
+			self.send('exit')
+			self._process.wait(timeout=self.timeout)
+		except (RuntimeError, subprocess.TimeoutExpired):
+			self._process.terminate()
+			self._process.wait()
+		self._process = None
+
+_session = None
+
+def get_session():
+	"""Returns the session that all the ds9 figures use to be shown."""
+	global _session
+	if _session is None:
+		_session = DS9Session()
+	return _session
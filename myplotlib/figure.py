@@ -1,7 +1,44 @@
 import numpy as np
 import warnings
-from shutil import copyfile
-import plotly.graph_objects as go
+from .histogram import histogram, pad_histogram, HistogramAccumulator, histogram2d, Histogram2DAccumulator
+from .downsample import downsample_indices, DOWNSAMPLE_METHODS
+from .pyramid import pyramid_level, reduce_coordinates, PYRAMID_REDUCERS
+from . import instrumentation
+import os
+import itertools
+
+VALIDATION_LEVELS = ['full', 'fast', 'off']
+VIDEO_FORMATS = ['.mp4', '.gif', '.avi', '.mov', '.webm'] # "save_frames" writes a video for file names with these extensions.
+
+_use_counter = itertools.count() # Tells which figure was used most recently, see "MPLFigure._touch".
+
+class _FigureProperties:
+	"""
+	Values of the properties of a figure (title, xlabel, etc.) and which
+	of them changed since they were last drawn. There is one of these
+	for each figure so it uses slots instead of a dict.
+	"""
+	__slots__ = ('title', 'show_title', 'subtitle', 'xlabel', 'ylabel', 'xscale', 'yscale', 'aspect', 'validation', '_changed')
+	_FLAGS = {name: 1 << n for n, name in enumerate(__slots__[:-1])}
+	
+	def __init__(self):
+		for name in self._FLAGS:
+			setattr(self, name, None)
+		self.show_title = True
+		self.validation = 'full'
+		self._changed = 0
+	
+	def update(self, name: str, value):
+		# Sets the value of a property and flags it as changed, only if it is different from the current value.
+		if getattr(self, name) != value:
+			setattr(self, name, value)
+			self._changed |= self._FLAGS[name]
+	
+	def pop_changed(self):
+		# Returns the names of the properties that changed since the previous call.
+		changed = {name for name, flag in self._FLAGS.items() if self._changed & flag}
+		self._changed = 0
+		return changed
 
 class MPLFigure:
 	"""
@@ -15,7 +52,15 @@ class MPLFigure:
 	  1) title
 	  2) _title getter
 	  3) _title setter
-	See the definition of title for implementation details.
+	See the definition of title for implementation details. The values
+	are stored in "self._properties" which keeps track of the changes,
+	so "set" only draws the properties that changed.
+	Convention for plotting:
+	- Each plotting method (e.g. plot) validates its arguments and stores
+	  them in the display list of the figure. The subclass draws them
+	  in the "_draw_plot" method, which receives the validated arguments.
+	  Figures created with "lazy=True" only draw the display list when
+	  they are saved or shown, otherwise each call is drawn immediately.
 	"""
 	DEFAULT_COLORS = [
 		(255, 59, 59),
@@ -29,143 +74,301 @@ class MPLFigure:
 		(107, 0, 96),
 	]
 	DEFAULT_COLORS = [tuple(np.array(color)/255) for color in DEFAULT_COLORS]
-
+	SAVE_IN_WORKER = True # If False "FigureManager.save_all" always saves this figure in the main process.
+	SPILLABLE = True # If False "FigureManager.set_memory_budget" never spills this figure to disk.
+	RENDER_IN_MAIN_THREAD = False # If True "FigureManager.save_all_futures" renders this figure in the thread of the event loop, and only saves it in another thread.
+	DOWNSAMPLE_POINTS = 4000 # Default number of points when using <downsample>, i.e. a min and a max for each pixel column of a 2000 pixels wide figure.
+	_BACKEND_ATTRIBUTES = () # Attributes created by "_create_figure", accessing them renders the figure.
+	_DIGEST_ATTRIBUTES = () # Properties of the subclass that change how the figure looks, besides those in "self._properties". See "digest".
+	_properties_class = _FigureProperties # Subclasses with more properties use a subclass of it, see "MPLSaoImageDS9Wrapper".
+	
 	def pick_default_color(self):
 		# ~ global DEFAULT_COLORS
 		color = self.DEFAULT_COLORS[0]
 		self.DEFAULT_COLORS = self.DEFAULT_COLORS[1:] + [self.DEFAULT_COLORS[0]]
 		return color
 	
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		instrumentation.instrument_class(cls) # Measures the time of creating, drawing and saving the figures of each plotting package, if turned on.
+	
 	def __init__(self):
-		self._show_title = True
+		self._properties = self._properties_class()
+		self._display_list = []
+		self._rendered = False
+		self._last_hist_bin_edges = None
+		self._spilled = False
+		self._spill_file = None
+		self._drawn = {} # {index in the display list: what its "_draw_" method returned}, to update it, see "_update_display_list".
+		self._touch()
+	
+	def __getattr__(self, name):
+		# Only called when <name> was not found, i.e. the figure was not rendered yet.
+		if name in self._BACKEND_ATTRIBUTES and not self.__dict__.get('_rendered', True):
+			self._render()
+			return getattr(self, name)
+		raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+	
+	@property
+	def display_list(self):
+		"""List of (method_name, validated_args) tuples with everything that was plotted in this figure."""
+		self._unspill()
+		return self._display_list
+	
+	def replay(self, display_list):
+		"""
+		Plots in this figure everything in <display_list>, which is the
+		<display_list> of another figure. The other figure may use a
+		different plotting package.
+		"""
+		for method, validated_args in display_list:
+			if not hasattr(self, f'_draw_{method}'):
+				raise NotImplementedError(f'<{method}> not implemented for {type(self)}.')
+			self._add_to_display_list(method, dict(validated_args))
+	
+	def _add_to_display_list(self, method: str, validated_args: dict):
+		self._unspill()
+		self._discard_spill() # The file does not have this call.
+		self._touch()
+		validated_args = {name: _snapshot(value) for name, value in validated_args.items()} # What was plotted cannot change afterwards, also for lazy figures, "replay", "_spill" and "digest".
+		self._display_list.append((method, validated_args))
+		index = len(self._display_list) - 1
+		if self._rendered == True:
+			self._drawn[index] = getattr(self, f'_draw_{method}')(dict(validated_args)) # Copy the dict, the "_draw_" methods modify it.
+		return index
+	
+	def _update_display_list(self, index: int, changes: dict, appended=None):
+		# Replaces the arguments in <changes> of the element <index> of the display list and, if the figure was drawn, updates what was drawn for it with the "_update_" method of the subclass, which receives <appended> as well. Used by the handles in myplotlib.live.
+		self._unspill()
+		self._discard_spill() # The file does not have these changes.
+		self._touch()
+		method, validated_args = self._display_list[index]
+		validated_args.update({name: _read_only(value) for name, value in changes.items()}) # The handles never modify the arrays they pass, so a read-only view is enough to keep "digest" and "_spill" consistent with what was drawn.
+		if self._rendered == True:
+			self._drawn[index] = getattr(self, f'_update_{method}')(self._drawn.get(index), dict(validated_args), appended)
+	
+	def _render(self):
+		# Creates the figure in the plotting package and draws the display list, only the first time it is called.
+		self._touch()
+		if self._rendered == True:
+			return
+		self._unspill()
+		self._create_figure()
+		self._rendered = True
+		self._properties.pop_changed()
+		self._draw_properties()
+		self._drawn = {}
+		for index, (method, validated_args) in enumerate(self._display_list):
+			self._drawn[index] = getattr(self, f'_draw_{method}')(dict(validated_args))
+	
+	def _touch(self):
+		# Marks this figure as the one used most recently.
+		self._last_used = next(_use_counter)
+	
+	def _nbytes(self):
+		# Approximate number of bytes of the data of this figure in memory, i.e. of the arrays in its display list.
+		if self._spilled == True:
+			return 0
+		return sum(value.nbytes for method, validated_args in self._display_list for value in validated_args.values() if isinstance(value, np.ndarray))
+	
+	def _spill(self, directory):
+		"""
+		Frees the memory of this figure: its display list is written into
+		a file in <directory> (unless it is already there from a previous
+		call) and the objects of the plotting package are closed. The 
+		figure is loaded again from the file when it is used, see 
+		"_unspill". Anything drawn directly with the objects of the 
+		plotting package is lost.
+		"""
+		if self._spilled == True:
+			return
+		if self._spill_file is None:
+			from . import spill # Import here so it is only imported when needed.
+			import tempfile
+			file_descriptor, fname = tempfile.mkstemp(dir=directory, prefix='figure_', suffix='.spill')
+			os.close(file_descriptor)
+			spill.dump(self._display_list, fname)
+			self._spill_file = fname
+		if self._rendered == True:
+			self.close()
+			self._drawn = {}
+			for name in self._BACKEND_ATTRIBUTES: # So accessing them renders the figure again, see "__getattr__".
+				self.__dict__.pop(name, None)
+			self._rendered = False
+		self._display_list = None
+		self._spilled = True
+	
+	def _unspill(self):
+		# Loads the display list written by "_spill", the file is kept so spilling again is free while nothing new is plotted.
+		if self._spilled == True:
+			from . import spill # Import here so it is only imported when needed.
+			self._display_list = spill.load(self._spill_file)
+			self._spilled = False
+	
+	def _discard_spill(self):
+		# Removes the file written by "_spill", if any. The figure must not be spilled.
+		if self._spill_file is not None:
+			try:
+				os.remove(self._spill_file)
+			except OSError: # E.g. in Windows while the arrays loaded from it are still in use, it is removed with the directory of the manager.
+				pass
+			self._spill_file = None
+	
+	def digest(self):
+		"""
+		Returns a string that only depends on what this figure looks like:
+		its type, its properties and everything in its display list, 
+		including the data of the arrays. Two figures with the same digest
+		produce the same file. Returns None if something in the display
+		list cannot be digested. Anything drawn directly with the objects 
+		of the plotting package (e.g. "matplotlib_ax") is not taken into
+		account.
+		"""
+		from .render_cache import digest, Unhashable # Import here so it is only imported when needed.
+		properties = {name: getattr(self._properties, name) for name in self._properties._FLAGS if name != 'validation'} # Validation does not change how the figure looks.
+		properties.update({name: getattr(self, name) for name in self._DIGEST_ATTRIBUTES})
+		class_constants = {name: getattr(type(self), name) for name in dir(type(self)) if name.isupper()} # E.g. WEBGL_THRESHOLD.
+		try:
+			return digest(type(self).__module__, type(self).__qualname__, properties, class_constants, self.display_list)
+		except Unhashable:
+			return None
+	
+	def _output_file_name(self, fname):
+		# Returns the name of the file that "save(fname)" writes, subclasses that change the extension override this.
+		return fname
+	
+	def _create_figure(self):
+		# Subclasses create here the objects of the plotting package.
+		pass
+	
+	def _draw_properties(self, changed=None):
+		# Subclasses write here the properties (title, xlabel, etc.) into the objects of the plotting package. <changed> is the set of names of the properties that changed since they were last drawn, or None to draw all of them.
+		pass
 	
 	@property
 	def title(self):
 		return self._title
 	@property
 	def _title(self):
-		if hasattr(self, '_title_'):
-			return self._title_
-		else:
-			return None
+		return self._properties.title
 	@_title.setter
 	def _title(self, value: str):
 		if not isinstance(value, str):
 			raise TypeError(f'<_title> must be a string, but received <{value}> of type {type(value)}.')
-		self._title_ = value
+		self._properties.update('title', value)
 	
 	@property
 	def show_title(self):
 		return self._show_title
 	@property
 	def _show_title(self):
-		return self._show_title_
+		return self._properties.show_title
 	@_show_title.setter
 	def _show_title(self, value):
 		if value not in [True, False]:
 			raise ValueError(f'<_show_title> must be either True or False, received <{value}> of type {type(value)}.')
-		self._show_title_ = value
+		self._properties.update('show_title', value)
 	
 	@property
 	def subtitle(self):
 		return self._subtitle
 	@property
 	def _subtitle(self):
-		if hasattr(self, '_subtitle_'):
-			return self._subtitle_
-		else:
-			return None
+		return self._properties.subtitle
 	@_subtitle.setter
 	def _subtitle(self, value: str):
 		if not isinstance(value, str):
 			raise TypeError(f'<_subtitle> must be a string, but received <{value}> of type {type(value)}.')
-		self._subtitle_ = value
+		self._properties.update('subtitle', value)
 	
 	@property
 	def xlabel(self):
 		return self._xlabel
 	@property
 	def _xlabel(self):
-		if hasattr(self, '_xlabel_'):
-			return self._xlabel_
-		else:
-			return None
+		return self._properties.xlabel
 	@_xlabel.setter
 	def _xlabel(self, value: str):
 		if not isinstance(value, str):
 			raise TypeError(f'<_xlabel> must be a string, but received <{value}> of type {type(value)}.')
-		self._xlabel_ = value
+		self._properties.update('xlabel', value)
 	
 	@property
 	def ylabel(self):
 		return self._ylabel
 	@property
 	def _ylabel(self):
-		if hasattr(self, '_ylabel_'):
-			return self._ylabel_
-		else:
-			return None
+		return self._properties.ylabel
 	@_ylabel.setter
 	def _ylabel(self, value: str):
 		if not isinstance(value, str):
 			raise TypeError(f'<_ylabel> must be a string, but received <{value}> of type {type(value)}.')
-		self._ylabel_ = value
+		self._properties.update('ylabel', value)
 	
 	@property
 	def xscale(self):
 		return self._xscale
 	@property
 	def _xscale(self):
-		if hasattr(self, '_xscale_'):
-			return self._xscale_
-		else:
-			return None
+		return self._properties.xscale
 	@_xscale.setter
 	def _xscale(self, value: str):
 		if not isinstance(value, str):
 			raise TypeError(f'<_xscale> must be a string, but received <{value}> of type {type(value)}.')
 		self._validate_axis_scale(value)
-		self._xscale_ = value
+		self._properties.update('xscale', value)
 	
 	@property
 	def yscale(self):
 		return self._yscale
 	@property
 	def _yscale(self):
-		if hasattr(self, '_yscale_'):
-			return self._yscale_
-		else:
-			return None
+		return self._properties.yscale
 	@_yscale.setter
 	def _yscale(self, value: str):
 		if not isinstance(value, str):
 			raise TypeError(f'<_yscale> must be a string, but received <{value}> of type {type(value)}.')
 		self._validate_axis_scale(value)
-		self._yscale_ = value
+		self._properties.update('yscale', value)
 	
 	@property
 	def aspect(self):
 		return self._aspect
 	@property
 	def _aspect(self):
-		if hasattr(self, '_aspect_'):
-			return self._aspect_
-		else:
-			return None
+		return self._properties.aspect
 	@_aspect.setter
 	def _aspect(self, value: str):
 		if not isinstance(value, str):
 			raise TypeError(f'<_aspect> must be a string, but received <{value}> of type {type(value)}.')
 		self._validate_aspect(value)
-		self._aspect_ = value
+		self._properties.update('aspect', value)
+	
+	@property
+	def validation(self):
+		return self._validation
+	@property
+	def _validation(self):
+		return self._properties.validation
+	@_validation.setter
+	def _validation(self, value: str):
+		# "full" validates everything, "fast" only the names of the arguments, the shapes of the arrays and the vectorized checks of their values, "off" trusts the caller.
+		if value not in VALIDATION_LEVELS:
+			raise ValueError(f'<_validation> must be one of {VALIDATION_LEVELS}, received <{value}> of type {type(value)}.')
+		self._properties.update('validation', value)
 	
 	def set(self, **kwargs):
+		self._touch()
 		for key in kwargs.keys():
 			if not hasattr(self, f'_{key}'):
 				raise ValueError(f'Cannot set <{key}>, invalid property.')
 			setattr(self, f'_{key}', kwargs[key])
+		if self._rendered == True:
+			changed = self._properties.pop_changed()
+			if len(changed) > 0:
+				self._draw_properties(changed) # Only what changed, so calling "set" many times is cheap and nothing is drawn twice.
 	
-	def show(self):
+	def show(self, block=True):
 		raise NotImplementedError(f'The <show> method is not implemented yet for the plotting package you are using! (Specifically for the class {self.__class__.__name__}.)')
 	
 	def save(self, fname=None, *args, **kwargs):
@@ -174,6 +377,99 @@ class MPLFigure:
 	def close(self):
 		raise NotImplementedError(f'The <close> method is not implemented yet for the plotting package you are using! (Specifically for the class {self.__class__.__name__}.)')
 	
+	def _flush_events(self):
+		# Processes the pending events of the window of the figure, if any, and returns True if the window is still open. See "FigureManager.show_async".
+		return False
+	
+	def save_frames(self, frames, fname, *args, fps=25, jobs=None, executor=None, **kwargs):
+		"""
+		Saves an animation in which each frame is the <z> of the last
+		"colormap" of this figure. Everything else (axes, colorbar, 
+		labels, etc.) is drawn once and reused, for each frame only the
+		data of the colormap is replaced. Returns the list of file names
+		written. The colormap is left as it was.
+		
+		Arguments
+		---------
+		frames : iterable of 2D arrays
+			The values of <z> for each frame, e.g. a 3D array with the
+			frames along the first axis, or a generator. Each frame must
+			have the same shape as the <z> given to "colormap".
+		fname : str
+			If it ends with one of VIDEO_FORMATS a video is written.
+			Otherwise one file is saved for each frame with the name
+			"fname.format(number)", e.g. "frames/frame_{:05d}.png". If
+			<fname> has no field for the number, "_{number}" is appended.
+		fps : int, optional
+			Default: 25
+			Frames per second of the video.
+		jobs : int, optional
+			Default: None
+			Number of worker processes that save the files, each of them
+			the frames of a contiguous part of <frames>, which must then
+			be a list or an array. The workers are the same as those of
+			"FigureManager.save_all". Not possible for videos.
+		executor : concurrent.futures.Executor, optional
+			Default: None
+			Same as <jobs> but with the workers of this executor.
+		
+		The rest of the arguments are passed to "save".
+		"""
+		if not hasattr(self, '_update_colormap'):
+			raise NotImplementedError(f'<save_frames> not implemented for {type(self)}.')
+		is_video = os.path.splitext(fname)[1].lower() in VIDEO_FORMATS
+		in_workers = executor is not None or jobs not in [None, 1]
+		if in_workers and is_video:
+			raise ValueError(f'<jobs> and <executor> can only be used to save one file for each frame, not a video.')
+		if in_workers and not (hasattr(frames, '__len__') and hasattr(frames, '__getitem__')):
+			raise TypeError(f'<frames> must be a list or an array to save them with <jobs> or <executor>, received an object of type {type(frames)}.')
+		if not is_video and fname.format(0) == fname: # No field for the number of the frame.
+			fname = f'{fname}_{{:0{len(str(len(frames)-1)) if hasattr(frames, "__len__") else 5}d}}'
+		if is_video:
+			colormap = self._last_colormap()
+			original_z = colormap.z
+			try:
+				self._save_video(frames, fname, fps, colormap.set_data)
+			finally:
+				colormap.set_data(original_z)
+			return [fname]
+		if not in_workers:
+			return self._save_frame_files(frames, fname, 0, *args, **kwargs)
+		if executor is None:
+			from . import manager # Import here, the figures do not need the manager otherwise.
+			executor = manager._get_process_pool(jobs)
+		n_parts = jobs if jobs not in [None, 1] else os.cpu_count()
+		limits = np.linspace(0, len(frames), n_parts+1).astype(int)
+		futures = [executor.submit(_save_frames_in_worker, self, frames[start:stop], fname, start, *args, **kwargs) for start, stop in zip(limits[:-1], limits[1:]) if stop > start]
+		return [saved for future in futures for saved in future.result()]
+	
+	def _last_colormap(self):
+		# Returns a handle of the last colormap in the display list.
+		from .live import ColormapHandle # Import here so it is only imported when needed.
+		indices = [index for index, (method, validated_args) in enumerate(self.display_list) if method == 'colormap']
+		if len(indices) == 0:
+			raise ValueError(f'<save_frames> replaces the <z> of the last "colormap" of the figure for each frame, but there is no colormap in this figure.')
+		return ColormapHandle(self, indices[-1])
+	
+	def _save_frame_files(self, frames, fname, first_number, *args, **kwargs):
+		# Saves one file for each of <frames>, see "save_frames", and returns their names.
+		colormap = self._last_colormap()
+		original_z = colormap.z
+		saved = []
+		try:
+			for number, z in enumerate(frames, start=first_number):
+				colormap.set_data(z)
+				frame_fname = self._output_file_name(fname.format(number))
+				self.save(frame_fname, *args, **kwargs)
+				saved.append(frame_fname)
+		finally:
+			colormap.set_data(original_z)
+		return saved
+	
+	def _save_video(self, frames, fname, fps, set_frame):
+		# Subclasses write here the video <fname>, calling <set_frame(z)> before grabbing each frame.
+		raise NotImplementedError(f'Saving videos is not implemented for {type(self)}.')
+	
 	#### Validation methods ↓↓↓↓
 	"""
 	This methods validate arguments so we all speak the same language.
@@ -190,10 +486,27 @@ class MPLFigure:
 		if aspect not in valid_aspects:
 			raise ValueError(f'<aspect> must be one of {valid_aspects}.')
 	
+	def _validate_implemented_kwargs(self, method: str, implemented_kwargs: list, kwargs: dict):
+		for kwarg in kwargs.keys():
+			if kwarg not in implemented_kwargs:
+				raise NotImplementedError(f'<{kwarg}> not implemented for <{method}> by myplotlib.')
+	
 	def _validate_xy_are_arrays_of_numbers(self, x):
 		if not hasattr(x, '__iter__'):
 			raise TypeError(f'<x> and <y> must be "array-like" objects, e.g. lists, numpy arrays, etc.')
 	
+	def _as_array(self, values):
+		# Returns <values> as a numpy array. Numpy arrays (also memmaps and non contiguous views) and pandas and Arrow objects of numbers are returned as views of the same memory, only other objects (e.g. lists) and numbers with missing values are copied. The arrays that the caller can modify are copied later into the display list, see "_snapshot".
+		if values is None:
+			return None
+		array = np.asarray(values) # pandas and Arrow objects return a view of their data through "__array__".
+		if array.dtype == object and hasattr(values, 'to_numpy'): # E.g. pandas nullable integers with missing values.
+			try:
+				array = values.to_numpy(dtype=float, na_value=float('NaN'))
+			except TypeError:
+				pass
+		return array
+	
 	def _validate_color(self, color):
 		try:
 			color = tuple(color)
@@ -220,6 +533,7 @@ class MPLFigure:
 			raise ValueError(f'<linewidth> must be a float number. Received {linewidth} of type {type(linewidth)}.')
 	
 	def _validate_bins(self, bins):
+		# Besides the options of numpy.histogram, bins='same' means "the same bins of the previous histogram".
 		if isinstance(bins, int) and bins > 0:
 			return
 		elif hasattr(bins, '__iter__') and len(bins) > 0:
@@ -229,6 +543,10 @@ class MPLFigure:
 		else:
 			raise TypeError(f'<bins> must be either an integer number, an array of float numbers or a string as defined for the numpy.histogram function, see https://numpy.org/doc/stable/reference/generated/numpy.histogram.html. Received {bins} of type {type(bins)}.')
 	
+	def _validate_downsample(self, downsample):
+		if downsample not in DOWNSAMPLE_METHODS + [None]:
+			raise ValueError(f'<downsample> must be one of {DOWNSAMPLE_METHODS + [None]}, received <{downsample}>.')
+	
 	def _validate_marker(self, marker):
 		IMPLEMENTED_MARKERS = ['.', '+', 'x', 'o', None]
 		if marker not in IMPLEMENTED_MARKERS:
@@ -251,9 +569,81 @@ class MPLFigure:
 		if kwargs.get('density') != None:
 			if kwargs.get('density') not in [True, False]:
 				raise ValueError(f'<density> must be either True or False, received <{kwargs.get("density")}>.')
+		if 'downsample' in kwargs:
+			self._validate_downsample(kwargs['downsample'])
+		if kwargs.get('downsample_points') is not None:
+			if not isinstance(kwargs['downsample_points'], int) or kwargs['downsample_points'] < 3:
+				raise ValueError(f'<downsample_points> must be an integer number greater than 2, received <{kwargs["downsample_points"]}>.')
 		if 'norm' in kwargs:
 			if kwargs['norm'] not in ['lin','log']:
 				raise ValueError(f'<norm> must be either "lin" or "log", received <{kwargs["norm"]}> of type {type(kwargs["norm"])}.')
+		if kwargs.get('max_pixels') is not None:
+			if not isinstance(kwargs['max_pixels'], int) or kwargs['max_pixels'] < 1:
+				raise ValueError(f'<max_pixels> must be a positive integer number, received <{kwargs["max_pixels"]}>.')
+		if 'reducer' in kwargs:
+			if kwargs['reducer'] not in PYRAMID_REDUCERS:
+				raise ValueError(f'<reducer> must be one of {PYRAMID_REDUCERS}, received <{kwargs["reducer"]}>.')
+	
+	def _downsample(self, validated_args, x, ys):
+		# Replaces the arrays <x> and <ys> in <validated_args> by the points selected by the method in <validated_args['downsample']>, if any.
+		method = validated_args.pop('downsample', None)
+		n_points = validated_args.pop('downsample_points', None)
+		if method is None:
+			return validated_args
+		indices = downsample_indices(
+			validated_args[x], 
+			[validated_args[y] for y in ys], 
+			method = method, 
+			n_points = n_points if n_points is not None else self.DOWNSAMPLE_POINTS,
+		)
+		if len(indices) < len(validated_args[x]):
+			for key in [x] + ys:
+				validated_args[key] = np.asarray(validated_args[key])[indices]
+		return validated_args
+	
+	def _reduce_resolution(self, validated_args):
+		# Replaces <z> in <validated_args> by the level of its pyramid with no more than <validated_args['max_pixels']> elements, and <x> and <y> by the coordinates of its blocks.
+		max_pixels = validated_args.pop('max_pixels', None)
+		reducer = validated_args.pop('reducer', None)
+		if max_pixels is None:
+			if reducer is not None:
+				raise ValueError(f'<reducer> can only be used together with <max_pixels>.')
+			return validated_args
+		z = np.asarray(validated_args['z'])
+		if z.ndim != 2:
+			raise ValueError(f'<max_pixels> requires <z> to be a 2D array, received an array with shape {z.shape}.')
+		reduced_z, block_size = pyramid_level(z, max_pixels, reducer if reducer is not None else 'mean')
+		if block_size > 1:
+			validated_args['z'] = reduced_z
+			for coordinate in ['x', 'y']:
+				if validated_args.get(coordinate) is not None:
+					validated_args[coordinate] = reduce_coordinates(validated_args[coordinate], z.shape, block_size)
+		return validated_args
+	
+	def _color_scale(self, z, norm):
+		# Returns <z> as a masked array in which the values that cannot be shown with <norm> are masked (NaN, and also <= 0 for "log"), and the limits (vmin, vmax) of the color scale, which are None if no value can be shown. <z> is neither copied nor modified, so all the backends draw the same color scale from the same data.
+		z = np.asarray(z)
+		if norm in [None, 'lin']:
+			visible = np.isfinite(z) if z.dtype.kind == 'f' else np.ones(z.shape, dtype=bool)
+		elif norm == 'log':
+			with np.errstate(invalid='ignore'):
+				visible = z > 0
+			if z.dtype.kind == 'f':
+				visible &= np.isfinite(z)
+			if not visible.all() and (z <= 0).any():
+				warnings.warn('Warning: log color scale was selected and there are <z> values <= 0. They will not appear in the plot.')
+		else:
+			raise ValueError(f'<norm> must be either "lin" or "log", received <{norm}> of type {type(norm)}.')
+		masked_z = np.ma.array(z, mask=~visible, copy=False)
+		if not visible.any():
+			return masked_z, None, None
+		if z.dtype.kind in 'iu':
+			largest, smallest = np.iinfo(z.dtype).max, np.iinfo(z.dtype).min
+		else:
+			largest, smallest = np.inf, -np.inf
+		vmin = np.min(z, where=visible, initial=largest)
+		vmax = np.max(z, where=visible, initial=smallest)
+		return masked_z, vmin, vmax
 	
 	#### Plotting methods ↓↓↓↓
 	"""
@@ -262,61 +652,117 @@ class MPLFigure:
 	When implementing one of these plotting methods in a subclass, use
 	the same signature as here.
 	"""
+	@instrumentation.timed('validate')
 	def plot(self, x, y=None, **kwargs):
 		if 'plot' not in self.__class__.__dict__.keys(): # Raise error if the method was not overriden
 			raise NotImplementedError(f'<plot> not implemented for {type(self)}.')
-		implemented_kwargs = ['label', 'marker', 'color', 'alpha', 'linestyle', 'linewidth'] # This is specific for the "plot" method.
-		for kwarg in kwargs.keys():
-			if kwarg not in implemented_kwargs:
-				raise NotImplementedError(f'<{kwarg}> not implemented for <plot> by myplotlib.')
-		self._validate_xy_are_arrays_of_numbers(x)
+		implemented_kwargs = ['label', 'marker', 'color', 'alpha', 'linestyle', 'linewidth', 'downsample', 'downsample_points'] # This is specific for the "plot" method.
+		validation = self.validation
+		if validation != 'off':
+			self._validate_implemented_kwargs('plot', implemented_kwargs, kwargs)
+			self._validate_xy_are_arrays_of_numbers(x)
+		x = self._as_array(x)
 		if y is not None:
-			self._validate_xy_are_arrays_of_numbers(y)
-			if len(x) != len(y):
+			if validation != 'off':
+				self._validate_xy_are_arrays_of_numbers(y)
+			y = self._as_array(y)
+			if validation != 'off' and len(x) != len(y):
 				raise ValueError(f'Lengths of <x> and <y> are not the same, received len(x)={len(x)} and len(y)={len(y)}.')
 		else:
 			y = x
-			x = [i for i in range(len(x))]
+			x = np.arange(len(y))
 		if kwargs.get('color') is None:
 			kwargs['color'] = self.pick_default_color()
-		self._validate_kwargs(**kwargs)
+		if validation == 'full':
+			self._validate_kwargs(**kwargs)
 		validated_args = kwargs
 		validated_args['x'] = x
 		validated_args['y'] = y
-		return validated_args
+		return self._downsample(validated_args, 'x', ['y'])
 	
+	@instrumentation.timed('validate')
 	def hist(self, samples, **kwargs):
 		if 'hist' not in self.__class__.__dict__.keys(): # Raise error if the method was not overriden
 			raise NotImplementedError(f'<hist> not implemented for {type(self)}.')
 		implemented_kwargs = ['label', 'color', 'alpha', 'bins', 'density', 'linewidth', 'linestyle'] # This is specific for the "hist" method.
-		for kwarg in kwargs.keys():
-			if kwarg not in implemented_kwargs:
-				raise NotImplementedError(f'<{kwarg}> not implemented for <hist> by myplotlib.')
-		self._validate_xy_are_arrays_of_numbers(samples)
+		validation = self.validation
+		if validation != 'off':
+			self._validate_implemented_kwargs('hist', implemented_kwargs, kwargs)
+			if isinstance(samples, HistogramAccumulator):
+				if kwargs.get('bins') is not None:
+					raise ValueError(f'<bins> cannot be given together with a <HistogramAccumulator>, the bins are those of the accumulator.')
+			elif not isinstance(samples, os.PathLike): # A path to a .npy file is also valid.
+				self._validate_xy_are_arrays_of_numbers(samples)
 		if kwargs.get('color') is None:
 			kwargs['color'] = self.pick_default_color()
-		self._validate_kwargs(**kwargs)
+		if validation == 'full':
+			self._validate_kwargs(**kwargs)
 		
-		samples = np.array(samples)
-		count, index = np.histogram(
-			samples[~np.isnan(samples)], 
-			bins = kwargs.get('bins') if kwargs.get('bins') is not None else 'auto',
-			density = kwargs.get('density') if kwargs.get('density') != None else False,
-		)
-		count = list(count)
-		count.insert(0,0)
-		count.append(0)
-		index = list(index)
-		index.insert(0,index[0] - np.diff(index)[0])
-		index.append(index[-1] + np.diff(index)[-1])
-		index += np.diff(index)[0]/2 # This is because np.histogram returns the bins edges and I want to plot in the middle.
+		bins = kwargs.get('bins') if kwargs.get('bins') is not None else 'auto'
+		if isinstance(bins, str) and bins == 'same': # Use the same bins as the previous histogram in this figure.
+			if self._last_hist_bin_edges is None:
+				raise ValueError(f'<bins="same"> uses the bins of the previous histogram in this figure, but there is no previous histogram.')
+			bins = self._last_hist_bin_edges
+		if isinstance(samples, HistogramAccumulator):
+			bin_counts, bin_edges = samples.histogram(density = kwargs.get('density') if kwargs.get('density') != None else False)
+		else: # This also handles samples that do not fit in memory, see myplotlib.histogram.
+			bin_counts, bin_edges = histogram(
+				samples, 
+				bins = bins,
+				density = kwargs.get('density') if kwargs.get('density') != None else False,
+			)
+		self._last_hist_bin_edges = bin_edges
+		count, index = pad_histogram(bin_counts, bin_edges) # This is because np.histogram returns the bins edges and I want to plot in the middle.
 		
 		validated_args = kwargs
-		validated_args['samples'] = samples
 		validated_args['bins'] = index
 		validated_args['counts'] = count
+		validated_args['bin_edges'] = bin_edges
 		return validated_args
 	
+	@instrumentation.timed('validate')
+	def hist2d(self, x, y=None, **kwargs):
+		# Returns the arguments of "colormap" that draw the histogram, which the subclasses add to the display list as a colormap.
+		if 'hist2d' not in self.__class__.__dict__.keys(): # Raise error if the method was not overriden
+			raise NotImplementedError(f'<hist2d> not implemented for {type(self)}.')
+		implemented_kwargs = ['bins', 'range', 'density', 'norm', 'colorscalelabel', 'alpha'] # This is specific for the "hist2d" method.
+		validation = self.validation
+		if validation != 'off':
+			self._validate_implemented_kwargs('hist2d', implemented_kwargs, kwargs)
+			if isinstance(x, Histogram2DAccumulator):
+				if y is not None or kwargs.get('bins') is not None or kwargs.get('range') is not None:
+					raise ValueError(f'<y>, <bins> and <range> cannot be given together with a <Histogram2DAccumulator>, the bins are those of the accumulator.')
+			elif y is None:
+				raise ValueError(f'<y> must be given, unless <x> is a <Histogram2DAccumulator>.')
+			else:
+				for samples in [x, y]:
+					if not isinstance(samples, os.PathLike): # A path to a .npy file is also valid.
+						self._validate_xy_are_arrays_of_numbers(samples)
+		if validation == 'full':
+			self._validate_kwargs(**kwargs)
+		
+		density = kwargs.pop('density', None) == True
+		bins = kwargs.pop('bins', None)
+		bins_range = kwargs.pop('range', None)
+		if isinstance(x, Histogram2DAccumulator):
+			counts, x_edges, y_edges = x.histogram(density=density)
+		else: # This also handles samples that do not fit in memory, see myplotlib.histogram.
+			counts, x_edges, y_edges = histogram2d(
+				x, 
+				y, 
+				bins = bins if bins is not None else 10,
+				range = bins_range,
+				density = density,
+			)
+		if kwargs.get('norm') == 'log': # Empty bins are not drawn, as NaN they are not shown without warning about values <= 0.
+			counts = np.where(counts > 0, counts, np.nan)
+		coordinates = [np.asarray(edges, dtype=float) for edges in [x_edges, y_edges]]
+		steps = [(edges[-1] - edges[0])/(len(edges) - 1) for edges in coordinates]
+		if all(step > 0 and np.allclose(np.diff(edges), step, rtol=1e-3, atol=0) for edges, step in zip(coordinates, steps)): # Equally spaced bins (up to rounding errors, e.g. in float32) are given by their centers, so the backends draw them as an image. Otherwise by their edges.
+			coordinates = [np.linspace(edges[0] + step/2, edges[-1] - step/2, len(edges) - 1) for edges, step in zip(coordinates, steps)]
+		return self.validate_colormap_args(z=counts.T, x=coordinates[0], y=coordinates[1], **kwargs) # Rows of <z> are y.
+	
+	@instrumentation.timed('validate')
 	def colormap(self, z, x=None, y=None, **kwargs):
 		if 'colormap' not in self.__class__.__dict__.keys(): # Raise error if the method was not overriden
 			raise NotImplementedError(f'<colormap> not implemented for {type(self)}.')
@@ -324,17 +770,19 @@ class MPLFigure:
 	
 	def validate_colormap_args(self, z, x=None, y=None, **kwargs):
 		# I had to wrote this function because "contour" validates the same arguments as "colormap", but calling "self.colormap" inside contour created problems calling the contour method of the subclasses.
-		implemented_kwargs = ['alpha','norm', 'colorscalelabel'] # This is specific for the "colormap" method.
-		for kwarg in kwargs.keys():
-			if kwarg not in implemented_kwargs:
-				raise NotImplementedError(f'<{kwarg}> not implemented for <colormap> by myplotlib.')
-		self._validate_kwargs(**kwargs)
+		implemented_kwargs = ['alpha','norm', 'colorscalelabel', 'max_pixels', 'reducer'] # This is specific for the "colormap" method.
+		validation = self.validation
+		if validation != 'off':
+			self._validate_implemented_kwargs('colormap', implemented_kwargs, kwargs)
+		if validation == 'full':
+			self._validate_kwargs(**kwargs)
 		validated_args = kwargs
-		validated_args['x'] = x
-		validated_args['y'] = y
-		validated_args['z'] = z
-		return validated_args
+		validated_args['x'] = self._as_array(x)
+		validated_args['y'] = self._as_array(y)
+		validated_args['z'] = self._as_array(z)
+		return self._reduce_resolution(validated_args)
 	
+	@instrumentation.timed('validate')
 	def contour(self, z, x=None, y=None, **kwargs):
 		if 'contour' not in self.__class__.__dict__.keys(): # Raise error if the method was not overriden
 			raise NotImplementedError(f'<contour> not implemented for {type(self)}.')
@@ -347,48 +795,86 @@ class MPLFigure:
 			validated_args['levels'] = levels
 		return validated_args
 	
+	@instrumentation.timed('validate')
 	def fill_between(self, x, y1, y2=None, **kwargs):
 		if 'fill_between' not in self.__class__.__dict__.keys(): # Raise error if the method was not overriden
 			raise NotImplementedError(f'<fill_between> not implemented for {type(self)}.')
-		implemented_kwargs = ['label', 'color', 'alpha', 'linestyle', 'linewidth'] # This is specific for the "fill_between" method.
-		for kwarg in kwargs.keys():
-			if kwarg not in implemented_kwargs:
-				raise NotImplementedError(f'<{kwarg}> not implemented for <fill_between> by myplotlib.')
-		self._validate_xy_are_arrays_of_numbers(x)
-		self._validate_xy_are_arrays_of_numbers(y1)
+		implemented_kwargs = ['label', 'color', 'alpha', 'linestyle', 'linewidth', 'downsample', 'downsample_points'] # This is specific for the "fill_between" method.
+		validation = self.validation
+		if validation != 'off':
+			self._validate_implemented_kwargs('fill_between', implemented_kwargs, kwargs)
+			self._validate_xy_are_arrays_of_numbers(x)
+			self._validate_xy_are_arrays_of_numbers(y1)
+			if y2 is not None:
+				self._validate_xy_are_arrays_of_numbers(y2)
+		x, y1 = self._as_array(x), self._as_array(y1)
 		if y2 is None:
-			y2 = np.zeros(len(x))
-		self._validate_xy_are_arrays_of_numbers(y2)
+			y2 = np.broadcast_to(0., x.shape) # Read only array of zeros that uses no memory.
+		y2 = self._as_array(y2)
 		if kwargs.get('color') is None:
 			kwargs['color'] = self.pick_default_color()
-		self._validate_kwargs(**kwargs)
+		if validation == 'full':
+			self._validate_kwargs(**kwargs)
 		validated_args = kwargs
 		validated_args['x'] = x
 		validated_args['y1'] = y1
 		validated_args['y2'] = y2
 		validated_args['alpha'] = .5 # Default alpha value.
-		return validated_args
+		return self._downsample(validated_args, 'x', ['y1', 'y2'])
 	
+	@instrumentation.timed('validate')
 	def error_band(self, x, y, ytop, ylow, **kwargs):
 		if 'error_band' not in self.__class__.__dict__.keys(): # Raise error if the method was not overriden
 			raise NotImplementedError(f'<error_band> not implemented for {type(self)}.')
-		self._validate_xy_are_arrays_of_numbers(x)
-		self._validate_xy_are_arrays_of_numbers(y)
-		self._validate_xy_are_arrays_of_numbers(ytop)
-		self._validate_xy_are_arrays_of_numbers(ylow)
-		if any(np.array(y)>np.array(ytop)) or any(np.array(y)<np.array(ylow)):
-			raise ValueError(f'Either y>ytop or y<ylow is true for at least one point, please check your arrays.')
-		if len(x) == len(y) == len(ytop) == len(ylow):
-			pass
-		else:
-			raise ValueError(f'len(x) == len(y) == len(ytop) == len(ylow) is not True, please check your arrays.')
+		implemented_kwargs = ['label', 'marker', 'color', 'alpha', 'linestyle', 'linewidth', 'downsample', 'downsample_points'] # This is specific for the "error_band" method.
+		validation = self.validation
+		if validation != 'off':
+			self._validate_implemented_kwargs('error_band', implemented_kwargs, kwargs)
+			self._validate_xy_are_arrays_of_numbers(x)
+			self._validate_xy_are_arrays_of_numbers(y)
+			self._validate_xy_are_arrays_of_numbers(ytop)
+			self._validate_xy_are_arrays_of_numbers(ylow)
+		x, y, ytop, ylow = [self._as_array(values) for values in [x, y, ytop, ylow]]
+		if validation != 'off':
+			if len(x) == len(y) == len(ytop) == len(ylow):
+				pass
+			else:
+				raise ValueError(f'len(x) == len(y) == len(ytop) == len(ylow) is not True, please check your arrays.')
+			if (y > ytop).any() or (y < ylow).any():
+				raise ValueError(f'Either y>ytop or y<ylow is true for at least one point, please check your arrays.')
 		if kwargs.get('color') is None:
 			kwargs['color'] = self.pick_default_color()
-		self._validate_kwargs(**kwargs)
+		if validation == 'full':
+			self._validate_kwargs(**kwargs)
 		validated_args = kwargs
 		validated_args['x'] = x
 		validated_args['y'] = y
 		validated_args['ytop'] = ytop
 		validated_args['ylow'] = ylow
-		return validated_args
+		return self._downsample(validated_args, 'x', ['y', 'ytop', 'ylow'])
+
+def _snapshot(value):
+	# Returns <value> if it cannot be modified, e.g. it is not an array or it is a read-only numpy.memmap or Arrow array, otherwise returns a read-only copy of it. An array is read-only only if none of the arrays whose memory it uses is writeable.
+	if not isinstance(value, np.ndarray):
+		return value
+	base = value
+	while isinstance(base, np.ndarray):
+		if base.flags.writeable:
+			value = value.view(np.ndarray).copy() if isinstance(value, np.memmap) else value.copy() # The copy of a memmap is not in the file.
+			value.flags.writeable = False
+			return value
+		base = base.base
+	return value
+
+def _read_only(value):
+	# Returns a read-only view of <value> if it is a numpy array, otherwise <value>.
+	if isinstance(value, np.ndarray) and value.flags.writeable:
+		value = value.view()
+		value.flags.writeable = False
+	return value
 
+def _save_frames_in_worker(fig, frames, fname, first_number, *args, **kwargs):
+	try:
+		return fig._save_frame_files(frames, fname, first_number, *args, **kwargs)
+	finally:
+		fig.close()
@@ -0,0 +1,135 @@
+"""
+Writing of images into FITS files frame by frame: either replacing the
+image, appending a plane to a cube in the primary HDU (3D array with
+one plane per frame) or appending an image extension per frame. Frames
+can be quantized to integers with BSCALE/BZERO and extensions can be
+tile compressed.
+"""
+from astropy.io import fits
+import numpy as np
+import os
+
+FITS_MODES = ['replace', 'cube', 'extensions']
+QUANTIZE_BITS = [8, 16, 32]
+COMPRESSION_TYPES = ['RICE_1', 'GZIP_1', 'GZIP_2', 'PLIO_1', 'HCOMPRESS_1']
+
+_BLOCK_SIZE = 2880 # FITS files are made of blocks of this number of bytes.
+_BITPIX_DTYPES = {8: '>u1', 16: '>i2', 32: '>i4', 64: '>i8', -32: '>f4', -64: '>f8'}
+
+# Integer types of FITS for each number of bits, with the range used for the values and the value used for NaN (BLANK).
+_QUANTIZED_TYPES = {
+	8: (np.uint8, 0, 254, 255), # 8 bits integers are unsigned in FITS.
+	16: (np.int16, -32767, 32767, -32768),
+	32: (np.int32, -2147483647, 2147483647, -2147483648),
+}
+
+def _fits_dtype(array):
+	# Returns <array> with a type that FITS stores as it is (without BZERO), in big endian as in the files.
+	if array.dtype == bool:
+		array = array.astype(np.uint8)
+	elif array.dtype in [np.uint16, np.int8]:
+		array = array.astype(np.int32)
+	elif array.dtype == np.uint32:
+		array = array.astype(np.int64)
+	elif array.dtype == np.float16:
+		array = array.astype(np.float32)
+	elif array.dtype.kind not in 'iuf' or array.dtype == np.uint64:
+		array = array.astype(np.float64)
+	return array.astype(array.dtype.newbyteorder('>'), copy=False)
+
+def quantize(z, bits: int):
+	"""
+	Converts the float array <z> into integers of <bits> bits such that
+	z ≈ BZERO + BSCALE*integers, the range of <z> being mapped to the
+	whole range of the integers. NaN values are stored as BLANK.
+	Returns (integers, bscale, bzero, blank).
+	"""
+	if bits not in _QUANTIZED_TYPES:
+		raise ValueError(f'<bits> must be one of {QUANTIZE_BITS}, received {repr(bits)}.')
+	dtype, lowest, highest, blank = _QUANTIZED_TYPES[bits]
+	z = np.asarray(z, dtype=float)
+	finite = np.isfinite(z)
+	if finite.any():
+		z_min, z_max = np.min(z, where=finite, initial=np.inf), np.max(z, where=finite, initial=-np.inf)
+	else:
+		z_min, z_max = 0, 0
+	bscale = (z_max - z_min)/(highest - lowest) if z_max > z_min else 1.
+	bzero = z_min - lowest*bscale
+	with np.errstate(invalid='ignore'):
+		integers = np.where(finite, np.round((z - bzero)/bscale), blank).astype(dtype)
+	return integers, bscale, bzero, blank
+
+def _image_hdu(z, quantize_bits=None, compression_type=None, primary=False):
+	# Returns the HDU with the image <z>.
+	if quantize_bits is not None:
+		data, bscale, bzero, blank = quantize(z, quantize_bits)
+	else:
+		data = _fits_dtype(np.asarray(z))
+	if compression_type is not None:
+		hdu = fits.CompImageHDU(data, compression_type=compression_type)
+	elif primary == True:
+		hdu = fits.PrimaryHDU(data)
+	else:
+		hdu = fits.ImageHDU(data)
+	if quantize_bits is not None: # Set after creating the HDU, otherwise astropy would scale the data again.
+		hdu.header['BSCALE'] = bscale
+		hdu.header['BZERO'] = bzero
+		hdu.header['BLANK'] = blank
+	return hdu
+
+def write_image(fname, z, quantize_bits=None, compression_type=None):
+	"""
+	Writes the 2D array <z> into the file <fname>, replacing it if it
+	exists. If <compression_type> is given the image is tile compressed
+	in the first extension, since the primary HDU cannot be compressed.
+	"""
+	hdu = _image_hdu(z, quantize_bits, compression_type, primary=True)
+	hdus = [hdu] if compression_type is None else [fits.PrimaryHDU(), hdu]
+	fits.HDUList(hdus).writeto(fname, overwrite=True)
+
+def append_extension(fname, z, quantize_bits=None, compression_type=None):
+	"""
+	Appends the 2D array <z> as a new image extension at the end of
+	<fname>, which is created if it does not exist. The rest of the file
+	is not read nor written again.
+	"""
+	hdu = _image_hdu(z, quantize_bits, compression_type)
+	if not os.path.isfile(fname):
+		fits.HDUList([fits.PrimaryHDU(), hdu]).writeto(fname)
+		return
+	with fits.open(fname, mode='append') as hdul:
+		hdul.append(hdu)
+
+def append_cube_frame(fname, frame):
+	"""
+	Appends the 2D array <frame> as a new plane of the 3D array in the
+	primary HDU of <fname>, which is created if it does not exist. All
+	the frames must have the same shape, and they are converted to the
+	type of the first one. Only NAXIS3 in the header is updated and the
+	frame is written into a memory map at the end of the data, the
+	frames already in the file are not read nor written again.
+	"""
+	frame = np.asarray(frame)
+	if frame.ndim != 2:
+		raise ValueError(f'The frames of a cube must be 2D arrays, received an array with shape {frame.shape}.')
+	if not os.path.isfile(fname):
+		fits.PrimaryHDU(_fits_dtype(frame)[np.newaxis]).writeto(fname)
+		return
+	header = fits.getheader(fname)
+	if header['NAXIS'] != 3 or (header['NAXIS2'], header['NAXIS1']) != frame.shape:
+		raise ValueError(f'All the frames of a cube must have the same shape, the cube in {repr(fname)} has frames with shape {(header["NAXIS2"], header["NAXIS1"])} but received a frame with shape {frame.shape}.')
+	dtype = np.dtype(_BITPIX_DTYPES[header['BITPIX']])
+	header_size = len(header.tostring())
+	frame_size = frame.size*dtype.itemsize
+	n_frames = header['NAXIS3']
+	data_end = header_size + (n_frames + 1)*frame_size
+	with open(fname, 'r+b') as f:
+		f.truncate(header_size + n_frames*frame_size) # Remove the padding, which must be zeros.
+		f.truncate(data_end + -data_end%_BLOCK_SIZE) # The new frame and the padding, filled with zeros.
+		header['NAXIS3'] = n_frames + 1
+		f.seek(0)
+		f.write(header.tostring().encode('ascii')) # Same size as before, only the value of NAXIS3 changed.
+	memmap = np.memmap(fname, dtype=dtype, mode='r+', offset=header_size + n_frames*frame_size, shape=frame.shape)
+	memmap[:] = frame
+	memmap.flush()
+	del memmap
@@ -0,0 +1,437 @@
+import numpy as np
+import os
+from collections.abc import Iterator
+
+CHUNK_SIZE = 2**20 # Number of samples that are read at once when the samples are not in memory.
+
+def uniform_bins(bin_edges):
+	"""
+	If <bin_edges> are equally spaced (exactly as returned by
+	numpy.linspace) returns the number of bins and the range, i.e.
+	(n_bins, (first_edge, last_edge)), otherwise returns None.
+	"""
+	bin_edges = np.asarray(bin_edges, dtype=float)
+	if bin_edges.ndim != 1 or len(bin_edges) < 2:
+		return None
+	if np.array_equal(bin_edges, np.linspace(bin_edges[0], bin_edges[-1], len(bin_edges))):
+		return len(bin_edges) - 1, (bin_edges[0], bin_edges[-1])
+	return None
+
+def histogram(samples, bins='auto', density=False):
+	"""
+	Same as numpy.histogram but NaN values are ignored and the samples
+	are read only once. Whenever the bins have a fixed width (integer
+	number of bins, any of the numpy string estimators or equally spaced
+	edges) the counts are computed with numpy's fixed width algorithm
+	(the bin of each sample is computed arithmetically and counted with
+	bincount) instead of searching each sample in the edges.
+	
+	Arguments
+	---------
+	samples : array-like, or samples that do not fit in memory
+		Samples to histogram. Samples that are not in memory (see 
+		"is_out_of_core") are read in chunks, see "streaming_bin_edges"
+		for the bins that can be used with them.
+	bins : int, array-like or str
+		Same as in numpy.histogram.
+	density : bool
+		Same as in numpy.histogram.
+	
+	Returns
+	-------
+	counts : numpy.array
+		Counts (or density) for each bin.
+	bin_edges : numpy.array
+		Edges of the bins, len(bin_edges) == len(counts) + 1.
+	"""
+	if is_out_of_core(samples):
+		return HistogramAccumulator(streaming_bin_edges(samples, bins)).add(samples).histogram(density=density)
+	samples = np.asarray(samples)
+	if samples.ndim != 1:
+		samples = samples.ravel()
+	if isinstance(bins, str):
+		nan_samples = np.isnan(samples)
+		if nan_samples.any():
+			samples = samples[~nan_samples] # The estimators need the finite samples, this is the only case in which they are copied.
+		bins = np.histogram_bin_edges(samples, bins)
+	if isinstance(bins, (int, np.integer)):
+		if len(samples) > 0:
+			first_edge, last_edge = np.fmin.reduce(samples), np.fmax.reduce(samples) # fmin and fmax ignore NaN values.
+		if len(samples) == 0 or np.isnan(first_edge):
+			first_edge, last_edge = 0, 1 # Same as numpy.histogram for empty arrays.
+		n_bins, bins_range = int(bins), (first_edge, last_edge)
+	else:
+		uniform = uniform_bins(bins)
+		if uniform is None: # Variable width bins, nothing to optimize. NaN samples are sorted after the last edge so they are not counted.
+			return np.histogram(samples, bins=bins, density=density)
+		n_bins, bins_range = uniform
+	# When numpy.histogram receives the number of bins and the range it uses the fixed width algorithm. NaN samples fall out of the range, so they are ignored without copying the samples.
+	return np.histogram(samples, bins=n_bins, range=bins_range, density=density)
+
+def pad_histogram(counts, bin_edges):
+	"""
+	Adds one empty bin at each side of the histogram and returns the
+	padded counts and the center of each bin, as needed to draw the
+	histogram as a line with steps.
+	"""
+	counts = np.concatenate(([0], counts, [0]))
+	first_width, last_width = bin_edges[1] - bin_edges[0], bin_edges[-1] - bin_edges[-2]
+	bin_centers = np.concatenate(([bin_edges[0] - first_width], bin_edges, [bin_edges[-1] + last_width])) + first_width/2
+	return counts, bin_centers
+
+def is_out_of_core(samples):
+	"""
+	Returns True if <samples> have to be read in chunks: a path to a 
+	.npy file, a numpy.memmap, a dataset such as h5py.Dataset (anything
+	with "shape", "dtype" and that can be sliced) or an iterator that
+	yields chunks of samples.
+	"""
+	if isinstance(samples, (str, os.PathLike, np.memmap, Iterator)):
+		return True
+	if isinstance(samples, np.ndarray) or hasattr(samples, 'to_numpy'): # numpy arrays and pandas objects are in memory.
+		return False
+	return hasattr(samples, 'shape') and hasattr(samples, 'dtype') and hasattr(samples, '__getitem__')
+
+def iter_chunks(samples, chunk_size=CHUNK_SIZE):
+	"""
+	Yields <samples> (see "is_out_of_core") as 1D numpy arrays of about
+	<chunk_size> elements. Iterators are not split, each element they
+	yield is one chunk.
+	"""
+	if isinstance(samples, (str, os.PathLike)):
+		samples = np.load(samples, mmap_mode='r')
+	if isinstance(samples, Iterator):
+		for chunk in samples:
+			yield np.asarray(chunk).ravel()
+		return
+	if len(samples.shape) == 0:
+		yield np.asarray(samples).ravel()
+		return
+	samples_per_row = max(int(np.prod(samples.shape[1:])), 1)
+	rows_per_chunk = max(chunk_size//samples_per_row, 1)
+	for first_row in range(0, samples.shape[0], rows_per_chunk):
+		yield np.asarray(samples[first_row:first_row+rows_per_chunk]).ravel()
+
+# Estimators of numpy.histogram_bin_edges that only need the range and the number of samples, so they can be computed without having all the samples in memory.
+_STREAMING_BIN_WIDTH_ESTIMATORS = {
+	'sturges': lambda ptp, size: ptp/(np.log2(size) + 1),
+	'rice': lambda ptp, size: ptp/(2*size**(1/3)),
+	'sqrt': lambda ptp, size: ptp/np.sqrt(size),
+}
+# Estimators that also need the quartiles or the moments of the samples, which are computed reading the samples a few more times.
+_MULTIPASS_BIN_WIDTH_ESTIMATORS = ['auto', 'fd', 'scott', 'doane']
+QUANTILE_BINS = 2**16 # Number of bins in which the samples are counted in each pass to find a quartile, see "_streaming_order_statistic".
+QUANTILE_MAX_SAMPLES = 2**20 # The samples of the bin that contains the quartile are loaded in memory once there are fewer than this.
+
+def streaming_bin_edges(samples, bins):
+	"""
+	Returns the bin edges for the out of core <samples> (see 
+	"is_out_of_core") exactly as numpy.histogram_bin_edges would do if
+	all the (finite) samples were in memory. If <bins> is an integer or
+	a string the samples are read once to find their range, so <samples>
+	cannot be an iterator in this case. The string estimators "auto", 
+	"fd", "scott" and "doane" read the samples a few more times, to find
+	their quartiles or their moments, "sturges", "rice" and "sqrt" do
+	not. The memory used never depends on the number of samples.
+	"""
+	if not isinstance(bins, (str, int, np.integer)):
+		return np.asarray(bins)
+	if isinstance(samples, Iterator):
+		raise ValueError(f'The samples are an iterator that can only be read once, so <bins> must be the array of bin edges. Received bins={repr(bins)}.')
+	if isinstance(bins, str) and bins not in list(_STREAMING_BIN_WIDTH_ESTIMATORS) + _MULTIPASS_BIN_WIDTH_ESTIMATORS:
+		raise ValueError(f'<bins> must be one of {sorted(list(_STREAMING_BIN_WIDTH_ESTIMATORS) + _MULTIPASS_BIN_WIDTH_ESTIMATORS)}, an integer or the array of bin edges when the samples do not fit in memory. Received bins={repr(bins)}.')
+	first_edge, last_edge, n_samples, samples_sum, integer_samples = None, None, 0, 0., False
+	for chunk in iter_chunks(samples):
+		finite_chunk = ~np.isnan(chunk)
+		n_samples += int(finite_chunk.sum())
+		integer_samples = np.issubdtype(chunk.dtype, np.integer)
+		if finite_chunk.any():
+			chunk_first, chunk_last = np.fmin.reduce(chunk), np.fmax.reduce(chunk)
+			first_edge = chunk_first if first_edge is None else min(first_edge, chunk_first)
+			last_edge = chunk_last if last_edge is None else max(last_edge, chunk_last)
+			samples_sum += float(np.sum(chunk, where=finite_chunk, dtype=float))
+	if n_samples == 0:
+		first_edge, last_edge = 0, 1
+	if not (np.isfinite(first_edge) and np.isfinite(last_edge)):
+		raise ValueError(f'The range of the samples [{first_edge}, {last_edge}] is not finite.')
+	bins_dtype = np.result_type(first_edge, last_edge)
+	if np.issubdtype(bins_dtype, np.integer) or bins_dtype == bool:
+		bins_dtype = float
+	if isinstance(bins, str):
+		ptp = float(last_edge) - float(first_edge)
+		if n_samples == 0:
+			width = 0
+		elif bins in _STREAMING_BIN_WIDTH_ESTIMATORS:
+			width = _STREAMING_BIN_WIDTH_ESTIMATORS[bins](ptp, n_samples)
+		else:
+			width = _multipass_bin_width(samples, bins, first_edge, last_edge, n_samples, samples_sum/n_samples)
+		if width and integer_samples and width < 1: # Same as numpy.
+			width = 1
+		n_bins = int(np.ceil(ptp/width)) if width else 1
+	else:
+		n_bins = int(bins)
+	if first_edge == last_edge:
+		first_edge, last_edge = first_edge - 0.5, last_edge + 0.5
+	return np.linspace(first_edge, last_edge, n_bins + 1, dtype=bins_dtype)
+
+def _multipass_bin_width(samples, estimator, first_edge, last_edge, n_samples, mean):
+	# Returns the bin width of <estimator>, one of _MULTIPASS_BIN_WIDTH_ESTIMATORS, in the same way as numpy does for the finite <samples>, which are read again as needed.
+	ptp = float(last_edge) - float(first_edge)
+	if estimator in ['auto', 'fd']:
+		q25, q75 = [_streaming_percentile(samples, q, first_edge, last_edge, n_samples) for q in [25, 75]]
+		fd_width = 2.0*(q75 - q25)*n_samples**(-1.0/3.0)
+		if estimator == 'fd':
+			return fd_width
+		return min(max(fd_width, _STREAMING_BIN_WIDTH_ESTIMATORS['sqrt'](ptp, n_samples)/2), _STREAMING_BIN_WIDTH_ESTIMATORS['sturges'](ptp, n_samples))
+	second_moment, third_moment = 0., 0. # Central moments, times <n_samples>.
+	for chunk in iter_chunks(samples):
+		deviations = chunk[~np.isnan(chunk)].astype(float) - mean
+		second_moment += float(np.sum(deviations**2))
+		third_moment += float(np.sum(deviations**3))
+	sigma = np.sqrt(second_moment/n_samples)
+	if estimator == 'scott':
+		return (24.0*np.pi**0.5/n_samples)**(1.0/3.0)*sigma
+	if n_samples > 2 and sigma > 0.0: # Doane.
+		sg1 = np.sqrt(6.0*(n_samples - 2)/((n_samples + 1.0)*(n_samples + 3)))
+		g1 = third_moment/n_samples/sigma**3
+		return ptp/(1.0 + np.log2(n_samples) + np.log2(1.0 + np.absolute(g1)/sg1))
+	return 0.0
+
+def _streaming_percentile(samples, q, first_edge, last_edge, n_samples):
+	# Same as numpy.percentile(samples, q) with the default "linear" method for the <n_samples> finite <samples>, whose minimum and maximum are <first_edge> and <last_edge>.
+	virtual_index = q/100*(n_samples - 1)
+	previous_index = int(np.floor(virtual_index))
+	previous_value = _streaming_order_statistic(samples, previous_index, first_edge, last_edge)
+	if previous_index + 1 >= n_samples:
+		return float(previous_value)
+	next_value = _streaming_order_statistic(samples, previous_index + 1, first_edge, last_edge)
+	gamma = virtual_index - previous_index
+	difference = float(next_value) - float(previous_value)
+	if gamma >= 0.5: # Same interpolation as numpy, which is exact at both ends.
+		return float(next_value) - difference*(1 - gamma)
+	return float(previous_value) + difference*gamma
+
+def _streaming_order_statistic(samples, rank, first_edge, last_edge):
+	# Returns the value at position <rank> of the sorted finite <samples>, whose minimum and maximum are <first_edge> and <last_edge>. Each pass counts the samples of the interval that contains it in QUANTILE_BINS bins and keeps only the bin that contains it, until there are few enough samples in that bin to load them.
+	low, high, high_included = first_edge, last_edge, True # The interval that contains the value.
+	while True:
+		if low == high:
+			return low
+		edges = np.linspace(low, high, QUANTILE_BINS + 1)
+		counts = np.zeros(QUANTILE_BINS, dtype=np.intp)
+		n_below = 0
+		for chunk in iter_chunks(samples):
+			n_below += int(np.count_nonzero(chunk < low))
+			inside = chunk[(chunk >= low) & ((chunk <= high) if high_included else (chunk < high))] # NaN samples are never inside.
+			indices = np.searchsorted(edges, inside, side='right') - 1
+			np.minimum(indices, QUANTILE_BINS - 1, out=indices) # Samples equal to <high> are in the last bin.
+			counts += np.bincount(indices, minlength=QUANTILE_BINS)
+		cumulative_counts = np.cumsum(counts)
+		selected_bin = int(np.searchsorted(cumulative_counts, rank - n_below, side='right'))
+		new_low, new_high = edges[selected_bin], edges[selected_bin+1]
+		new_high_included = high_included if selected_bin == QUANTILE_BINS - 1 else False
+		if counts[selected_bin] <= QUANTILE_MAX_SAMPLES or (new_low, new_high, new_high_included) == (low, high, high_included): # Either few samples, or few different values that cannot be split in smaller bins.
+			break
+		low, high, high_included = new_low, new_high, new_high_included
+	values, value_counts = np.empty(0, dtype=edges.dtype), np.empty(0, dtype=np.intp)
+	for chunk in iter_chunks(samples):
+		inside = chunk[(chunk >= new_low) & ((chunk <= new_high) if new_high_included else (chunk < new_high))]
+		chunk_values, chunk_counts = np.unique(inside, return_counts=True)
+		values, inverse = np.unique(np.concatenate((values, chunk_values)), return_inverse=True)
+		value_counts = np.bincount(inverse, weights=np.concatenate((value_counts, chunk_counts)), minlength=len(values)).astype(np.intp)
+	rank_in_bin = rank - n_below - (cumulative_counts[selected_bin-1] if selected_bin > 0 else 0)
+	return values[np.searchsorted(np.cumsum(value_counts), rank_in_bin, side='right')]
+
+class HistogramAccumulator:
+	"""
+	Histogram to which samples are added chunk by chunk, so the samples
+	never need to be in memory all at once. The result is the same as
+	calling numpy.histogram with all the samples.
+	
+	Example
+	-------
+	>>> histogram = HistogramAccumulator(bins=99, range=(-5,5))
+	>>> for chunk in chunks_from_the_detector:
+	...     histogram.add(chunk)
+	>>> fig.hist(histogram, label='Detector data')
+	"""
+	def __init__(self, bins, range=None):
+		"""
+		Arguments
+		---------
+		bins : int or array-like
+			Either the number of bins, in which case <range> is required,
+			or the bin edges.
+		range : (float, float), optional
+			Lower and upper edges of the bins when <bins> is an integer.
+		"""
+		if isinstance(bins, (int, np.integer)):
+			if range is None:
+				raise ValueError(f'<range> must be given when <bins> is the number of bins.')
+			if bins < 1:
+				raise ValueError(f'<bins> must be a positive integer, received {bins}.')
+			bins = np.linspace(range[0], range[1], int(bins)+1)
+		elif range is not None:
+			raise ValueError(f'<range> can only be given when <bins> is the number of bins.')
+		self.bin_edges = np.asarray(bins)
+		if self.bin_edges.ndim != 1 or len(self.bin_edges) < 2 or (np.diff(self.bin_edges) < 0).any():
+			raise ValueError(f'<bins> must be an array of at least 2 monotonically increasing bin edges.')
+		self._uniform_bins = uniform_bins(self.bin_edges)
+		self.counts = np.zeros(len(self.bin_edges)-1, dtype=np.intp)
+	
+	def add(self, samples):
+		"""Adds <samples> to the histogram, <samples> can be in memory or out of core (see "is_out_of_core"). Returns the accumulator itself."""
+		chunks = iter_chunks(samples) if is_out_of_core(samples) else [np.asarray(samples).ravel()]
+		for chunk in chunks:
+			if self._uniform_bins is None:
+				self.counts += np.histogram(chunk, bins=self.bin_edges)[0]
+			else:
+				self.counts += np.histogram(chunk, bins=self._uniform_bins[0], range=self._uniform_bins[1])[0]
+		return self
+	
+	def histogram(self, density=False):
+		"""Returns the counts (or the density, as numpy.histogram) and the bin edges."""
+		if density == True:
+			return self.counts/np.diff(self.bin_edges)/self.counts.sum(), self.bin_edges
+		return self.counts.copy(), self.bin_edges
+
+def _nearly_uniform_bins(bin_edges):
+	# Same as "uniform_bins" but also for edges that are equally spaced only up to rounding errors (e.g. edges in float32), which is enough for "_bin_indices" since it corrects the bin of each sample with the edges.
+	bin_edges = np.asarray(bin_edges, dtype=float)
+	n_bins = len(bin_edges) - 1
+	if not bin_edges[-1] > bin_edges[0]:
+		return None
+	if np.abs(bin_edges - np.linspace(bin_edges[0], bin_edges[-1], n_bins+1)).max() < (bin_edges[-1] - bin_edges[0])/n_bins/4:
+		return n_bins, (bin_edges[0], bin_edges[-1])
+	return None
+
+def _bin_indices(samples, bin_edges, uniform):
+	# Returns the index of the bin of each of the float <samples>, which is len(bin_edges)-1 for the samples outside the bins (also NaN). <uniform> is "_nearly_uniform_bins(bin_edges)". The bins are the same as in numpy.histogram, i.e. the last one includes its right edge.
+	n_bins = len(bin_edges) - 1
+	if uniform is None:
+		indices = np.searchsorted(bin_edges, samples, side='right') - 1
+		indices[samples == bin_edges[-1]] = n_bins - 1
+		indices[indices < 0] = n_bins
+		return indices
+	first_edge, last_edge = uniform[1]
+	with np.errstate(invalid='ignore'): # NaN samples are not converted into any meaningful index, they are discarded below.
+		indices = ((samples - first_edge)*(n_bins/(last_edge - first_edge))).astype(np.intp)
+	np.clip(indices, 0, n_bins-1, out=indices)
+	# Same corrections as numpy.histogram, so rounding errors never put a sample in the neighbour bin and the bins are exactly those of <bin_edges>.
+	indices[samples < bin_edges[indices]] -= 1
+	indices[(samples >= bin_edges[indices+1]) & (indices != n_bins-1)] += 1
+	with np.errstate(invalid='ignore'):
+		indices[~((samples >= first_edge) & (samples <= last_edge))] = n_bins
+	return indices
+
+def _aligned_chunks(x_chunks, y_chunks):
+	# Yields (x_chunk, y_chunk) pairs of the same length from the iterators of chunks <x_chunks> and <y_chunks>, which may be split differently, e.g. an array and an iterator. Raises ValueError if the total numbers of samples are not the same.
+	x_chunk, y_chunk = np.empty(0), np.empty(0)
+	while True:
+		while x_chunk is not None and len(x_chunk) == 0:
+			x_chunk = next(x_chunks, None)
+		while y_chunk is not None and len(y_chunk) == 0:
+			y_chunk = next(y_chunks, None)
+		if x_chunk is None or y_chunk is None:
+			if x_chunk is not None or y_chunk is not None:
+				raise ValueError(f'<x> and <y> must have the same number of samples.')
+			return
+		n_samples = min(len(x_chunk), len(y_chunk))
+		yield x_chunk[:n_samples], y_chunk[:n_samples]
+		x_chunk, y_chunk = x_chunk[n_samples:], y_chunk[n_samples:]
+
+def _split_bins(bins):
+	# Returns the bins of each axis of a 2D histogram, with the same meaning as in numpy.histogram2d.
+	if isinstance(bins, (str, int, np.integer)):
+		return bins, bins
+	if len(bins) == 2:
+		return bins[0], bins[1]
+	return bins, bins
+
+def histogram2d(x, y, bins=10, range=None, density=False):
+	"""
+	Same as numpy.histogram2d but NaN values are ignored, the samples
+	can be out of core (see "is_out_of_core") and the memory used does
+	not depend on the number of samples, since they are binned in 
+	chunks. See "Histogram2DAccumulator".
+	
+	Arguments
+	---------
+	x, y : array-like, or samples that do not fit in memory
+		Coordinates of the samples.
+	bins : int, array-like, [int, int] or [array, array]
+		Same as in numpy.histogram2d. The number of bins of each axis
+		can also be one of the string estimators of "streaming_bin_edges".
+	range : ((float, float), (float, float)), optional
+		Same as in numpy.histogram2d, only when the number of bins is
+		given. If not given, the samples are read once to find their 
+		range, so they cannot be iterators.
+	density : bool
+		Same as in numpy.histogram2d.
+	
+	Returns
+	-------
+	counts : numpy.array
+		Counts (or density) for each bin, with shape (len(x_edges)-1, len(y_edges)-1).
+	x_edges, y_edges : numpy.array
+		Edges of the bins.
+	"""
+	edges = []
+	for samples, axis_bins, axis_range in zip([x, y], _split_bins(bins), range if range is not None else [None, None]):
+		if axis_range is not None:
+			if not isinstance(axis_bins, (int, np.integer)):
+				raise ValueError(f'<range> can only be given when <bins> is the number of bins.')
+			edges.append(np.linspace(axis_range[0], axis_range[1], int(axis_bins)+1))
+		else:
+			edges.append(streaming_bin_edges(samples if is_out_of_core(samples) else np.asarray(samples), axis_bins))
+	return Histogram2DAccumulator(edges).add(x, y).histogram(density=density)
+
+class Histogram2DAccumulator:
+	"""
+	Same as HistogramAccumulator for 2D histograms, the result is the 
+	same as calling numpy.histogram2d with all the samples. The samples
+	are binned in chunks of CHUNK_SIZE, with bincount on the raveled
+	index of the 2D bins, computed arithmetically for equally spaced
+	bins.
+	
+	Example
+	-------
+	>>> histogram = Histogram2DAccumulator(bins=99, range=[(-5,5), (0,1)])
+	>>> for x, y in chunks_from_the_detector:
+	...     histogram.add(x, y)
+	>>> fig.hist2d(histogram, norm='log')
+	"""
+	def __init__(self, bins, range=None):
+		"""
+		Arguments
+		---------
+		bins : int, array-like, [int, int] or [array, array]
+			The bins of each axis, as in numpy.histogram2d. <range> is
+			required if the number of bins is given.
+		range : ((float, float), (float, float)), optional
+			Lower and upper edges of the bins of each axis.
+		"""
+		self.x_edges, self.y_edges = [HistogramAccumulator(axis_bins, axis_range).bin_edges for axis_bins, axis_range in zip(_split_bins(bins), range if range is not None else [None, None])]
+		self._uniform_bins = (_nearly_uniform_bins(self.x_edges), _nearly_uniform_bins(self.y_edges))
+		self.counts = np.zeros((len(self.x_edges)-1, len(self.y_edges)-1), dtype=np.intp)
+	
+	def add(self, x, y):
+		"""Adds the samples with coordinates <x> and <y> to the histogram, each of them can be in memory or out of core (see "is_out_of_core"). Returns the accumulator itself."""
+		x_chunks = iter_chunks(x if is_out_of_core(x) else np.asarray(x))
+		y_chunks = iter_chunks(y if is_out_of_core(y) else np.asarray(y))
+		n_x_bins, n_y_bins = self.counts.shape
+		for x_chunk, y_chunk in _aligned_chunks(x_chunks, y_chunks):
+			x_indices = _bin_indices(x_chunk.astype(float, copy=False), self.x_edges, self._uniform_bins[0])
+			y_indices = _bin_indices(y_chunk.astype(float, copy=False), self.y_edges, self._uniform_bins[1])
+			outside = (x_indices == n_x_bins) | (y_indices == n_y_bins)
+			x_indices *= n_y_bins
+			x_indices += y_indices # Raveled index of the 2D bin.
+			x_indices[outside] = n_x_bins*n_y_bins # One extra bin for all the samples outside, so they are not copied out.
+			self.counts += np.bincount(x_indices, minlength=n_x_bins*n_y_bins+1)[:-1].reshape(self.counts.shape)
+		return self
+	
+	def histogram(self, density=False):
+		"""Returns the counts (or the density, as numpy.histogram2d) and the bin edges of each axis."""
+		if density == True:
+			return self.counts/np.diff(self.x_edges)[:,np.newaxis]/np.diff(self.y_edges)/self.counts.sum(), self.x_edges, self.y_edges
+		return self.counts.copy(), self.x_edges, self.y_edges
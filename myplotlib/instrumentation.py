@@ -0,0 +1,157 @@
+"""
+Optional measurement of where the time goes in each figure, see
+"FigureManager.set_instrumentation". Each measurement is an event, a
+dict with these keys:
+- "figure": title of the figure, None for the figures that are drawn
+  when created (not lazy) until their title is set.
+- "package": class of the figure, e.g. "MPLPlotlyWrapper".
+- "phase": one of PHASES:
+	- "validate": validation of the arguments of a plotting method in
+	  MPLFigure.
+	- "create": creation of the objects of the plotting package.
+	- "properties": drawing of the title, labels, scales, etc.
+	- "draw": drawing of one call of a plotting method.
+	- "save": writing of the file, rendering not included.
+- "method": e.g. "plot", "save".
+- "seconds": wall time.
+- "points": number of elements of the largest array in the validated
+  arguments (e.g. the number of bins for "hist"), or None.
+- "bytes": size of the file written by "save", otherwise None.
+Events are aggregated in "stats" and passed to each hook. When turned
+off, the cost is checking a global variable once per call.
+"""
+import functools
+import itertools
+import time
+import os
+
+PHASES = ['validate', 'create', 'properties', 'draw', 'save']
+
+_enabled = False
+_hooks = []
+_stats = {} # {(figure number, phase, method): aggregated values}.
+_figures = {} # {figure number: (title, package)}, the title is updated with each event so "stats" shows the last one.
+_figure_numbers = itertools.count()
+
+def set_enabled(enabled: bool):
+	global _enabled
+	_enabled = enabled
+
+def is_enabled():
+	return _enabled
+
+def add_hook(hook):
+	_hooks.append(hook)
+
+def remove_hook(hook):
+	_hooks.remove(hook)
+
+def count_points(validated_args):
+	# Returns the number of elements of the largest array in <validated_args>, or None if there is no array.
+	sizes = [getattr(value, 'size') for value in validated_args.values() if hasattr(value, 'size') and hasattr(value, 'dtype')] if isinstance(validated_args, dict) else []
+	return max(sizes) if len(sizes) > 0 else None
+
+def record(fig, phase: str, method: str, seconds: float, points=None, bytes_written=None):
+	"""Aggregates one event into the stats and passes it to the hooks."""
+	event = {
+		'figure': fig.title,
+		'package': type(fig).__name__,
+		'phase': phase,
+		'method': method,
+		'seconds': seconds,
+		'points': points,
+		'bytes': bytes_written,
+	}
+	if '_instrumentation_number' not in fig.__dict__: # Identifies the figure, even if its title changes.
+		fig._instrumentation_number = next(_figure_numbers)
+	_figures[fig._instrumentation_number] = (event['figure'], event['package'])
+	key = (fig._instrumentation_number, phase, method)
+	if key not in _stats:
+		_stats[key] = {'calls': 0, 'seconds': 0, 'points': None, 'bytes': None}
+	aggregated = _stats[key]
+	aggregated['calls'] += 1
+	aggregated['seconds'] += seconds
+	for name, value in [('points', points), ('bytes', bytes_written)]:
+		if value is not None:
+			aggregated[name] = (aggregated[name] or 0) + value
+	for hook in _hooks:
+		hook(event)
+
+def stats(reset=False):
+	"""
+	Returns a list of dicts, one for each figure, phase and method, with
+	the number of "calls", and the total "seconds", "points" and "bytes".
+	Sorted from the slowest to the fastest.
+	"""
+	rows = [dict(figure=_figures[number][0], package=_figures[number][1], phase=phase, method=method, **aggregated) for (number, phase, method), aggregated in _stats.items()]
+	if reset == True:
+		_stats.clear()
+		_figures.clear()
+	return sorted(rows, key=lambda row: row['seconds'], reverse=True)
+
+def timed(phase: str, method_name=None):
+	"""
+	Decorator for the methods of figures that records an event of
+	<phase> each time the method is called. For "validate" the method
+	must return the validated arguments, and for "draw" it must receive
+	them, they are used to count the points. Only the outermost "draw"
+	is recorded when they are nested, e.g. "_draw_fill_between" of
+	plotly calls "_draw_plot", so the time is not counted twice.
+	"""
+	def decorator(method):
+		name = method_name if method_name is not None else method.__name__
+		@functools.wraps(method)
+		def wrapper(self, *args, **kwargs):
+			if _enabled == False or (phase == 'draw' and self.__dict__.get('_timing_draw') == True):
+				return method(self, *args, **kwargs)
+			points = count_points(args[0]) if phase == 'draw' and len(args) > 0 else None # Before calling, the "_draw_" methods modify the arguments.
+			if phase == 'draw':
+				self.__dict__['_timing_draw'] = True
+			start = time.perf_counter()
+			try:
+				result = method(self, *args, **kwargs)
+			finally:
+				if phase == 'draw':
+					self.__dict__['_timing_draw'] = False
+			seconds = time.perf_counter() - start
+			record(self, phase, name, seconds, points=count_points(result) if phase == 'validate' else points)
+			return result
+		return wrapper
+	return decorator
+
+def instrument_class(cls):
+	"""
+	Decorates with "timed" or "timed_save" the methods defined in the
+	class <cls>, which is a subclass of MPLFigure, that create the
+	figure, draw it and save it.
+	"""
+	for name, method in list(cls.__dict__.items()):
+		if not callable(method):
+			continue
+		if name == 'save':
+			setattr(cls, name, timed_save(method))
+		elif name == '_create_figure':
+			setattr(cls, name, timed('create', 'create')(method))
+		elif name == '_draw_properties':
+			setattr(cls, name, timed('properties', 'properties')(method))
+		elif name.startswith('_draw_'):
+			setattr(cls, name, timed('draw', name[len('_draw_'):])(method))
+
+def timed_save(save):
+	"""
+	Decorator for the "save" methods of figures. The figure is rendered
+	before starting to measure, so only writing the file is measured,
+	and the size of the file is recorded.
+	"""
+	@functools.wraps(save)
+	def wrapper(self, fname=None, *args, **kwargs):
+		if _enabled == False:
+			return save(self, fname, *args, **kwargs)
+		self._render()
+		start = time.perf_counter()
+		result = save(self, fname, *args, **kwargs)
+		seconds = time.perf_counter() - start
+		output = self._output_file_name(fname if fname is not None else self.title)
+		record(self, 'save', 'save', seconds, bytes_written=os.path.getsize(output) if os.path.isfile(output) else None)
+		return result
+	return wrapper
@@ -0,0 +1,237 @@
+"""
+Handles returned by "plot", "hist" and "colormap" to update what was
+plotted without plotting it again, e.g. to follow data that keeps
+arriving:
+	
+	line = fig.plot(x, y)
+	line.extend(new_x, new_y, window=1000) # Only the last 1000 points are kept.
+	histogram = fig.hist(samples)
+	histogram.extend(new_samples)
+
+The data is kept in buffers that grow as needed, so the cost of each
+update depends on the amount of new data, not on the amount of data
+already plotted. If the figure is drawn, what was drawn is updated in
+place.
+"""
+import numpy as np
+from .histogram import pad_histogram
+
+MIN_CAPACITY = 16 # Of the buffers, in number of elements.
+
+class _Buffer:
+	# 1D array to which values are appended, with the last <window> values kept if a window is given. Values are never overwritten, so the arrays returned by "values" remain valid after appending more values.
+	def __init__(self, values):
+		values = np.asarray(values)
+		self._data = np.empty(max(2*len(values), MIN_CAPACITY), dtype=values.dtype)
+		self._data[:len(values)] = values
+		self._start = 0
+		self._stop = len(values)
+	
+	@property
+	def values(self):
+		return self._data[self._start:self._stop]
+	
+	def append(self, values, window=None):
+		# Returns the values that were removed to keep the <window>, which are empty if there is no window.
+		values = np.asarray(values)
+		if window is not None and len(values) > window:
+			values = values[-window:]
+		start = self._start if window is None else max(self._start, self._stop + len(values) - window)
+		removed = self._data[self._start:start]
+		dtype = np.result_type(self._data.dtype, values.dtype)
+		if dtype != self._data.dtype or self._stop + len(values) > len(self._data): # Move the values that are kept into a new array, with room to append as many values again.
+			kept = self._data[start:self._stop]
+			data = np.empty(max(2*(len(kept) + len(values)), MIN_CAPACITY), dtype=dtype)
+			data[:len(kept)] = kept
+			self._data = data
+			self._stop = len(kept)
+			start = 0
+		self._data[self._stop:self._stop+len(values)] = values
+		self._start = start
+		self._stop += len(values)
+		return removed
+
+def _validate_window(window):
+	if window is not None and (isinstance(window, bool) or not isinstance(window, (int, np.integer)) or window < 1):
+		raise ValueError(f'<window> must be a positive integer number, received <{window}>.')
+
+class PlotHandle:
+	"""
+	Returned by "plot", to update the data of the plotted line.
+	"""
+	def __init__(self, fig, index: int):
+		self._fig = fig
+		self._index = index # In the display list of <fig>.
+		self._x = None # Buffers, created by the first call of "extend".
+		self._y = None
+	
+	@property
+	def x(self):
+		return self._fig.display_list[self._index][1]['x']
+	
+	@property
+	def y(self):
+		return self._fig.display_list[self._index][1]['y']
+	
+	def _validated(self, x, y):
+		# Same as "MPLFigure.plot", returns x and y as arrays. If <y> is None, <x> are the values of y.
+		fig = self._fig
+		validation = fig.validation
+		if validation != 'off':
+			fig._validate_xy_are_arrays_of_numbers(x)
+			if y is not None:
+				fig._validate_xy_are_arrays_of_numbers(y)
+		x = fig._as_array(x)
+		y = fig._as_array(y)
+		if y is not None and validation != 'off' and len(x) != len(y):
+			raise ValueError(f'Lengths of <x> and <y> are not the same, received len(x)={len(x)} and len(y)={len(y)}.')
+		return x, y
+	
+	def extend(self, x, y=None, window=None):
+		"""
+		Appends points to the line.
+		
+		Arguments
+		---------
+		x, y: array-like
+			Coordinates of the new points. If only <x> is given, these
+			are the values of y and x continues from the last point
+			in steps of 1, as in "plot".
+		window: int, optional
+			If given, only the last <window> points of the line are kept.
+		
+		The new points are not downsampled, even if <downsample> was used
+		in "plot".
+		"""
+		_validate_window(window)
+		x, y = self._validated(x, y)
+		if y is None:
+			y = x
+			previous_x = self.x
+			x = np.arange(len(y)) + (previous_x[-1] + 1 if len(previous_x) > 0 else 0)
+		if self._x is None:
+			self._x = _Buffer(self.x)
+			self._y = _Buffer(self.y)
+		removed = self._x.append(x, window)
+		self._y.append(y, window)
+		self._fig._update_display_list(
+			self._index,
+			dict(x = self._x.values, y = self._y.values),
+			appended = (x, y) if len(removed) == 0 else None, # If points were removed, the limits of the axes have to be computed again from all the points.
+		)
+	
+	def set_data(self, x, y=None):
+		"""Replaces the points of the line, with the same arguments as "plot"."""
+		x, y = self._validated(x, y)
+		if y is None:
+			y = x
+			x = np.arange(len(y))
+		self._x = _Buffer(x) # Copies, so the caller can reuse its arrays, as with "plot".
+		self._y = _Buffer(y)
+		self._fig._update_display_list(self._index, dict(x=self._x.values, y=self._y.values))
+
+class HistHandle:
+	"""
+	Returned by "hist", to add samples to the histogram. The bins are
+	those of the histogram, samples outside them are not counted.
+	"""
+	def __init__(self, fig, index: int):
+		self._fig = fig
+		self._index = index # In the display list of <fig>.
+		self._counts = None # Of each bin, created by the first update.
+		self._window_bins = None # Buffer with the bin of each of the last samples, while a window is used.
+	
+	@property
+	def bin_edges(self):
+		return self._fig.display_list[self._index][1]['bin_edges']
+	
+	@property
+	def counts(self):
+		return self._fig.display_list[self._index][1]['counts'][1:-1] # Without the empty bins added by "pad_histogram".
+	
+	def _bin_indices(self, samples):
+		# Returns the index of the bin of each sample, -1 for the samples outside the bins. The last bin includes its right edge, as in numpy.histogram.
+		fig = self._fig
+		if fig.validation != 'off':
+			fig._validate_xy_are_arrays_of_numbers(samples)
+		samples = np.ravel(fig._as_array(samples))
+		bin_edges = self.bin_edges
+		indices = np.searchsorted(bin_edges, samples, side='right') - 1
+		indices[samples == bin_edges[-1]] = len(bin_edges) - 2
+		indices[(indices >= len(bin_edges) - 1) | np.isnan(samples)] = -1
+		return indices
+	
+	def _bincount(self, indices):
+		return np.bincount(indices[indices >= 0], minlength=len(self.bin_edges)-1)
+	
+	def extend(self, samples, window=None):
+		"""
+		Adds <samples> to the histogram.
+		
+		Arguments
+		---------
+		samples: array-like
+			The new samples.
+		window: int, optional
+			If given, the histogram only counts the last <window> samples.
+			The samples counted before the first call with a <window>
+			(e.g. those given to "hist") are removed from the histogram
+			in that call, because they are not known.
+		"""
+		_validate_window(window)
+		if self._fig.validation != 'off' and self._density:
+			raise ValueError(f'Samples cannot be added to a histogram with <density=True>, because the number of samples it was normalized with is not known.')
+		indices = self._bin_indices(samples)
+		if self._counts is None:
+			self._counts = np.array(self.counts)
+		if window is None:
+			self._window_bins = None # From now on all the samples are counted.
+			counts = self._bincount(indices)
+		elif self._window_bins is None:
+			self._window_bins = _Buffer(indices[-window:])
+			self._counts = np.zeros_like(self._counts)
+			counts = self._bincount(self._window_bins.values)
+		else:
+			removed = self._window_bins.append(indices, window)
+			self._counts -= self._bincount(removed).astype(self._counts.dtype)
+			counts = self._bincount(indices[-window:])
+		self._counts = self._counts + counts # Not in place, the counts may be integers and become floats.
+		self._update()
+	
+	def set_data(self, samples):
+		"""Replaces the samples of the histogram, the bins are kept. If the histogram was plotted with <density=True> it is normalized with the new samples."""
+		self._counts = self._bincount(self._bin_indices(samples))
+		self._window_bins = None
+		self._update()
+	
+	@property
+	def _density(self):
+		return self._fig.display_list[self._index][1].get('density') == True
+	
+	def _update(self):
+		counts = self._counts
+		if self._density: # Same normalization as numpy.histogram.
+			counts = counts/np.diff(self.bin_edges)/counts.sum()
+		counts, bins = pad_histogram(counts, self.bin_edges)
+		self._fig._update_display_list(self._index, dict(counts=counts, bins=bins))
+
+class ColormapHandle:
+	"""
+	Returned by "colormap", to replace the image by another one with the
+	same shape, e.g. the next frame of a sequence, see also
+	"MPLFigure.save_frames".
+	"""
+	def __init__(self, fig, index: int):
+		self._fig = fig
+		self._index = index # In the display list of <fig>.
+	
+	@property
+	def z(self):
+		return self._fig.display_list[self._index][1]['z']
+	
+	def set_data(self, z):
+		"""Replaces the values of the colormap by <z>, which must have the same shape."""
+		z = self._fig._as_array(z)
+		if self._fig.validation != 'off' and z.shape != np.shape(self.z):
+			raise ValueError(f'<z> must have the same shape as the <z> of the colormap, {np.shape(self.z)}, received an array with shape {z.shape}.')
+		self._fig._update_display_list(self._index, dict(z=z.copy())) # Copied, so the caller can reuse its array, as with "colormap".
@@ -0,0 +1,98 @@
+import numpy as np
+
+PYRAMID_REDUCERS = ['mean', 'max', 'min']
+
+CHUNK_SIZE = 2**22 # Number of elements of <z> that are reduced at once, this bounds the memory used by the temporary arrays.
+
+def block_reduce(z, block_size, reducer='mean'):
+	"""
+	Returns an array in which each element is the <reducer> ("mean", 
+	"max" or "min") of a <block_size> × <block_size> block of the 2D
+	array <z>. The blocks at the end of the rows and columns may be 
+	smaller. NaN values are ignored, a block that is all NaN is NaN.
+	The values are exactly those that the reducer gives with the elements
+	of <z> in the block. <z> is processed in bands of rows, so it can be
+	a numpy.memmap much larger than the memory.
+	"""
+	if reducer not in PYRAMID_REDUCERS:
+		raise ValueError(f'<reducer> must be one of {PYRAMID_REDUCERS}, received {repr(reducer)}.')
+	z = np.asarray(z) # A numpy.memmap stays in the file.
+	if z.ndim != 2:
+		raise ValueError(f'<z> must be a 2D array, received an array with shape {z.shape}.')
+	if block_size == 1:
+		return z
+	rows, columns = z.shape
+	reduced = np.empty((-(-rows//block_size), -(-columns//block_size)), dtype=float if reducer == 'mean' else z.dtype)
+	rows_per_band = max(CHUNK_SIZE//(block_size*columns), 1)*block_size
+	for first_row in range(0, rows, rows_per_band):
+		band = z[first_row:first_row+rows_per_band]
+		padding = [(0, -len(band)%block_size), (0, -columns%block_size)]
+		if reducer == 'mean':
+			band = np.pad(band.astype(float), padding, mode='constant', constant_values=float('NaN')) # The padding is NaN so it is not counted.
+		else:
+			band = np.pad(band, padding, mode='edge') # Repeating the last row or column does not change the max nor the min.
+		blocks = band.reshape(band.shape[0]//block_size, block_size, band.shape[1]//block_size, block_size)
+		if reducer == 'mean':
+			finite = ~np.isnan(blocks)
+			sums = np.where(finite, blocks, 0).sum(axis=(1,3))
+			counts = finite.sum(axis=(1,3))
+			with np.errstate(invalid='ignore', divide='ignore'):
+				band_reduced = np.where(counts > 0, sums/counts, float('NaN'))
+		else:
+			ufunc = np.fmax if reducer == 'max' else np.fmin # These ignore NaN values.
+			band_reduced = ufunc.reduce(ufunc.reduce(blocks, axis=3), axis=1)
+		reduced[first_row//block_size:first_row//block_size+len(band_reduced)] = band_reduced
+	return reduced
+
+def image_pyramid(z, reducer='mean'):
+	"""
+	Yields the levels of the pyramid of the 2D array <z>: level 0 is <z>
+	itself and each following level has half the rows and columns of the
+	previous one, see "block_reduce". Each level is computed only when
+	it is requested, and the iteration stops after the level with one
+	element.
+	"""
+	z = np.asarray(z)
+	block_size = 1
+	while True:
+		level = block_reduce(z, block_size, reducer)
+		yield level
+		if level.shape == (1, 1) or level.size == 0:
+			return
+		block_size *= 2
+
+def pyramid_level(z, max_pixels, reducer='mean'):
+	"""
+	Returns the first level of the pyramid of <z> (see "image_pyramid")
+	with no more than <max_pixels> elements, and the size of its blocks,
+	i.e. (level, 2**level_number). The level is computed directly from
+	<z>, the levels before it are not computed.
+	"""
+	z = np.asarray(z)
+	if z.ndim != 2:
+		raise ValueError(f'<z> must be a 2D array, received an array with shape {z.shape}.')
+	rows, columns = z.shape
+	block_size = 1
+	while -(-rows//block_size) * -(-columns//block_size) > max_pixels and (block_size < rows or block_size < columns):
+		block_size *= 2
+	return block_reduce(z, block_size, reducer), block_size
+
+def reduce_coordinates(coordinates, z_shape, block_size):
+	"""
+	Returns the coordinates of the blocks of size <block_size> of an
+	array with <z_shape>, given <coordinates> of each of its elements.
+	<coordinates> is either a 2D array with the same shape as z, or a 1D
+	array with one value per column (x) or per row (y) of z. The
+	coordinate of each block is the mean of the coordinates in it.
+	"""
+	coordinates = np.asarray(coordinates)
+	if block_size == 1:
+		return coordinates
+	if coordinates.shape == tuple(z_shape):
+		level = coordinates
+	elif coordinates.ndim == 1 and len(coordinates) in z_shape:
+		level = coordinates[np.newaxis, :] # As a single row the blocks are along the coordinates, the other dimension is only padding which is not counted in the mean.
+	else:
+		raise ValueError(f'The coordinates must have the same shape as <z> or have one value per row or column of <z> to use <max_pixels>, received coordinates with shape {coordinates.shape} for <z> with shape {tuple(z_shape)}.')
+	level = block_reduce(level, block_size, 'mean')
+	return level[0] if coordinates.ndim == 1 else level
@@ -0,0 +1,84 @@
+"""
+Digests of what a figure would produce, so "FigureManager.save_all"
+can skip the figures whose file is already up to date. The digest of a
+figure is computed from its properties, its display list (including
+the data of the arrays) and the arguments used to save it. The digest
+of each saved file is stored in an index file in the same directory.
+"""
+import numpy as np
+import hashlib
+import json
+import os
+
+INDEX_FILE_NAME = '.myplotlib_cache.json'
+CHUNK_SIZE = 2**24 # Number of bytes of an array that is not contiguous that are copied at once to hash them.
+
+class Unhashable(TypeError):
+	pass
+
+def _update(h, obj):
+	# Feeds <obj> into the hash <h>, with the type of each object so e.g. 1, 1.0 and '1' are different.
+	if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+		h.update(f'{type(obj).__name__}:{repr(obj)};'.encode())
+	elif isinstance(obj, bytes):
+		h.update(f'bytes:{len(obj)};'.encode())
+		h.update(obj)
+	elif isinstance(obj, (list, tuple)):
+		h.update(f'{type(obj).__name__}:{len(obj)}['.encode())
+		for item in obj:
+			_update(h, item)
+		h.update(b']')
+	elif isinstance(obj, dict):
+		h.update(f'dict:{len(obj)}{{'.encode())
+		for key in sorted(obj, key=repr):
+			_update(h, key)
+			_update(h, obj[key])
+		h.update(b'}')
+	elif isinstance(obj, (set, frozenset)):
+		_update(h, sorted(obj, key=repr))
+	elif isinstance(obj, np.generic):
+		_update(h, np.asarray(obj))
+	elif isinstance(obj, np.ndarray):
+		if isinstance(obj, np.ma.MaskedArray):
+			h.update(b'masked;')
+			_update(h, np.ma.getmaskarray(obj))
+			obj = np.ma.getdata(obj)
+		h.update(f'ndarray:{obj.dtype.str}:{obj.shape};'.encode())
+		if obj.dtype.hasobject:
+			_update(h, obj.tolist())
+		elif obj.flags.c_contiguous:
+			h.update(obj.data) # Without copying the data.
+		else:
+			rows_per_chunk = max(CHUNK_SIZE//max(obj[:1].nbytes, 1), 1)
+			for first_row in range(0, len(obj), rows_per_chunk):
+				h.update(np.ascontiguousarray(obj[first_row:first_row+rows_per_chunk]).data)
+	else:
+		raise Unhashable(f'Cannot compute the digest of an object of type {type(obj)}.')
+
+def digest(*objects):
+	"""
+	Returns a hexadecimal string that only depends on the values of
+	<objects>, which can be numbers, strings, numpy arrays and lists,
+	tuples or dicts of them. Raises "Unhashable" (a TypeError) for any
+	other type.
+	"""
+	h = hashlib.blake2b(digest_size=16)
+	for obj in objects:
+		_update(h, obj)
+	return h.hexdigest()
+
+def load_index(directory):
+	"""Returns the dict {file name: digest} stored in <directory>, empty if there is none."""
+	try:
+		with open(os.path.join(directory, INDEX_FILE_NAME)) as f:
+			index = json.load(f)
+	except (FileNotFoundError, ValueError): # A broken index is the same as no index, the figures are saved again.
+		return {}
+	return index if isinstance(index, dict) else {}
+
+def save_index(directory, index):
+	"""Writes the dict {file name: digest} into <directory>, replacing the previous one at once."""
+	fname = os.path.join(directory, INDEX_FILE_NAME)
+	with open(f'{fname}.tmp', 'w') as f:
+		json.dump(index, f, indent='\t', sort_keys=True)
+	os.replace(f'{fname}.tmp', fname) # So a script that is killed never leaves a half written index.
@@ -0,0 +1,83 @@
+"""
+Compact on-disk form of the display list of a figure, used to free the
+memory of the figures that were not used recently (see
+"FigureManager.set_memory_budget"). The numpy arrays are written as raw
+data after a pickled header with everything else, and they are loaded
+back as memory maps, so loading a figure does not read its data until it
+is drawn.
+"""
+import numpy as np
+import pickle
+
+_ALIGNMENT = 64 # Of the data of each array in the file, in bytes.
+
+class _SpilledArray:
+	# Placeholder for an array in the header, <offset> is relative to the start of the data.
+	__slots__ = ('offset', 'dtype', 'shape')
+	
+	def __init__(self, offset, dtype, shape):
+		self.offset = offset
+		self.dtype = dtype
+		self.shape = shape
+	
+	def __getstate__(self):
+		return (self.offset, self.dtype, self.shape)
+	
+	def __setstate__(self, state):
+		self.offset, self.dtype, self.shape = state
+
+def _aligned(n_bytes):
+	return n_bytes + -n_bytes%_ALIGNMENT
+
+def _is_spillable(obj):
+	# Only plain arrays with data are written as raw data, anything else (masked arrays, arrays of objects, etc.) is pickled in the header.
+	return (type(obj) is np.ndarray or type(obj) is np.memmap) and obj.ndim > 0 and obj.size > 0 and not obj.dtype.hasobject
+
+def dump(obj, fname):
+	"""
+	Writes <obj> into the file <fname>. <obj> can be anything that can be
+	pickled, the numpy arrays in it (also inside lists, tuples and dicts)
+	are written without pickling them. See "load".
+	"""
+	arrays = []
+	n_bytes = 0
+	def replace_arrays(obj):
+		nonlocal n_bytes
+		if _is_spillable(obj):
+			arrays.append(obj)
+			placeholder = _SpilledArray(n_bytes, obj.dtype, obj.shape)
+			n_bytes = _aligned(n_bytes + obj.nbytes)
+			return placeholder
+		if isinstance(obj, dict):
+			return {key: replace_arrays(value) for key, value in obj.items()}
+		if isinstance(obj, (list, tuple)):
+			return type(obj)(replace_arrays(item) for item in obj)
+		return obj
+	header = pickle.dumps(replace_arrays(obj), protocol=pickle.HIGHEST_PROTOCOL)
+	with open(fname, 'wb') as f:
+		f.write(len(header).to_bytes(8, 'little'))
+		f.write(header)
+		f.write(bytes(_aligned(8 + len(header)) - 8 - len(header)))
+		for array in arrays:
+			f.write(np.ascontiguousarray(array).data)
+			f.write(bytes(-array.nbytes%_ALIGNMENT))
+
+def load(fname):
+	"""
+	Returns the object written by "dump" into <fname>. The arrays are
+	copy-on-write memory maps of the file, so they can be modified
+	without modifying the file.
+	"""
+	with open(fname, 'rb') as f:
+		header_size = int.from_bytes(f.read(8), 'little')
+		structure = pickle.loads(f.read(header_size))
+	data_start = _aligned(8 + header_size)
+	def restore_arrays(obj):
+		if isinstance(obj, _SpilledArray):
+			return np.memmap(fname, dtype=obj.dtype, mode='c', offset=data_start + obj.offset, shape=obj.shape)
+		if isinstance(obj, dict):
+			return {key: restore_arrays(value) for key, value in obj.items()}
+		if isinstance(obj, (list, tuple)):
+			return type(obj)(restore_arrays(item) for item in obj)
+		return obj
+	return restore_arrays(structure)
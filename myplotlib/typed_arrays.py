@@ -0,0 +1,105 @@
+"""
+Encoding of numeric arrays for the plotly HTML files. Plotly.js (since
+version 2.28) understands arrays written as base64 "typed arrays",
+i.e. {"dtype": "f8", "bdata": "...", "shape": "rows, columns"}, which are
+much smaller and faster to write and parse than one JSON number per
+element.
+"""
+import numpy as np
+import base64
+
+PLOTLY_JS_MIN_VERSION = (2, 28, 0) # First plotly.js version that decodes typed arrays.
+ENCODED_TRACE_KEYS = ['x', 'y', 'z', 'customdata'] # Attributes of the traces that are data arrays in plotly.js. Other numeric lists, e.g. "range" in the layout, must stay as lists.
+_PLOTLY_DTYPES = {
+	np.dtype('float64'): 'f8',
+	np.dtype('float32'): 'f4',
+	np.dtype('int32'): 'i4',
+	np.dtype('uint32'): 'u4',
+	np.dtype('int16'): 'i2',
+	np.dtype('uint16'): 'u2',
+	np.dtype('int8'): 'i1',
+	np.dtype('uint8'): 'u1',
+}
+_NUMPY_DTYPES = {plotly_dtype: numpy_dtype for numpy_dtype, plotly_dtype in _PLOTLY_DTYPES.items()}
+
+def round_significant(array, digits: int):
+	"""Rounds each element of <array> to <digits> significant digits. NaN, inf and 0 are left as they are."""
+	array = np.asarray(array, dtype=float)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		exponent = np.floor(np.log10(np.abs(array)))
+	exponent[~np.isfinite(exponent)] = 0
+	scale = 10.0**(digits - 1 - exponent)
+	return np.round(array*scale)/scale
+
+def reduce_precision(array, precision):
+	"""
+	Returns <array> with less precision, <precision> is either "float32"
+	or the number of significant digits. Integer arrays are not changed.
+	"""
+	if array.dtype.kind not in 'f':
+		return array
+	if precision == 'float32':
+		return array.astype(np.float32)
+	return round_significant(array, precision)
+
+def encode_typed_array(array):
+	"""Returns the typed array specification of a numeric numpy <array> for plotly.js."""
+	array = np.asarray(array)
+	if array.dtype not in _PLOTLY_DTYPES: # Plotly.js has no 64 bits integers nor booleans.
+		if array.dtype.kind in 'iub' and array.size > 0 and np.iinfo(np.int32).min <= array.min() and array.max() <= np.iinfo(np.int32).max:
+			array = array.astype(np.int32)
+		else:
+			array = array.astype(np.float64)
+	spec = {
+		'dtype': _PLOTLY_DTYPES[array.dtype],
+		'bdata': base64.b64encode(np.ascontiguousarray(array).astype(array.dtype.newbyteorder('<'), copy=False).tobytes()).decode('ascii'),
+	}
+	if array.ndim > 1:
+		spec['shape'] = ', '.join(str(n) for n in array.shape)
+	return spec
+
+def decode_typed_array(spec):
+	"""Inverse of "encode_typed_array"."""
+	array = np.frombuffer(base64.b64decode(spec['bdata']), dtype=_NUMPY_DTYPES[spec['dtype']].newbyteorder('<'))
+	if 'shape' in spec:
+		array = array.reshape([int(n) for n in spec['shape'].split(',')])
+	return array
+
+def _as_numeric_array(value):
+	# Returns <value> as a numeric numpy array, or None if it is not one.
+	if isinstance(value, np.ndarray):
+		array = value
+	elif isinstance(value, (list, tuple)) and len(value) > 0:
+		try:
+			array = np.asarray(value)
+		except ValueError: # E.g. ragged lists.
+			return None
+	else:
+		return None
+	if array.dtype.kind not in 'iufb' or array.ndim not in [1, 2]:
+		return None
+	return array
+
+def encode_figure_dict(fig_dict: dict, binary=True, precision=None):
+	"""
+	Returns a copy of <fig_dict> (a plotly figure as a dict, e.g. "plotly_fig.to_dict()")
+	in which the numeric data arrays of the traces have less precision
+	(see "reduce_precision") and, if <binary> is True, are encoded as
+	typed arrays. The layout is not changed. If the arrays are written
+	in JSON, "float32" precision means 7 significant digits.
+	"""
+	fig_dict = dict(fig_dict)
+	fig_dict['data'] = [dict(trace) for trace in fig_dict.get('data', [])]
+	for trace in fig_dict['data']:
+		for key in ENCODED_TRACE_KEYS:
+			array = _as_numeric_array(trace.get(key))
+			if array is None:
+				continue
+			if precision == 'float32' and binary == False:
+				array = reduce_precision(array, 7) # float32 values are written with all the digits of the float64 they become in JSON, so round them instead.
+			elif precision is not None:
+				array = reduce_precision(array, precision)
+				if binary == True and precision != 'float32' and precision <= 6 and array.dtype.kind == 'f':
+					array = array.astype(np.float32) # Still exact to the requested number of digits, and half the size.
+			trace[key] = encode_typed_array(array) if binary == True else array
+	return fig_dict
@@ -1,134 +1,233 @@
 from .figure import MPLFigure
+from .live import PlotHandle, HistHandle, ColormapHandle
 import numpy as np
 
 class MPLMatplotlibWrapper(MPLFigure):
-	def __init__(self):
+	_BACKEND_ATTRIBUTES = ('matplotlib_fig', 'matplotlib_ax')
+	RENDER_IN_MAIN_THREAD = True # pyplot creates the windows of the figures, which must happen in the main thread.
+	IMAGE_FOR_REGULAR_GRIDS = True # If True "colormap" draws evenly spaced grids as an image, which is much faster and lighter than a mesh. If False it always uses "pcolormesh".
+	
+	def __init__(self, lazy=False):
 		super().__init__()
 		import matplotlib.pyplot as plt # Import here so if the user does not plot with this package, it does not need to be installed.
 		import matplotlib.colors as colors # Import here so if the user does not plot with this package, it does not need to be installed.
 		self.matplotlib_plt = plt
 		self.matplotlib_colors = colors
-		fig, ax = plt.subplots()
+		if lazy == False:
+			self._render()
+	
+	def _create_figure(self):
+		fig, ax = self.matplotlib_plt.subplots()
 		ax.grid(b=True, which='minor', color='#000000', alpha=0.1, linestyle='-', linewidth=0.25)
 		self.matplotlib_fig = fig
 		self.matplotlib_ax = ax
 	
-	def set(self, **kwargs):
-		super().set(**kwargs) # This does a validation of the arguments and stores them in the properties of the super() figure.
-		del(kwargs) # Remove it to avoid double access to the properties. Now you must access like "self.title" and so.
-		self.matplotlib_ax.set_xlabel(super().xlabel)
-		self.matplotlib_ax.set_ylabel(super().ylabel)
-		if self.xscale in [None, 'lin']:
-			self.matplotlib_ax.set_xscale('linear')
-		elif self.xscale == 'log':
-			self.matplotlib_ax.set_xscale('log')
-		if self.yscale in [None, 'lin']:
-			self.matplotlib_ax.set_yscale('linear')
-		elif self.yscale == 'log':
-			self.matplotlib_ax.set_yscale('log')
-		if self.title != None:
-			self.matplotlib_fig.canvas.set_window_title(self.title)
-			if self.show_title == True:
-				self.matplotlib_fig.suptitle(self.title)
-		if self.aspect == 'equal':
-			self.matplotlib_ax.set_aspect('equal')
-		if self.subtitle != None:
-			self.matplotlib_ax.set_title(self.subtitle)
-	
-	def show(self):
-		self.matplotlib_plt.show()
+	def __getstate__(self):
+		# Modules cannot be pickled, they are imported again when unpickling.
+		state = self.__dict__.copy()
+		state.pop('matplotlib_plt')
+		state.pop('matplotlib_colors')
+		return state
+	
+	def __setstate__(self, state):
+		self.__dict__.update(state)
+		import matplotlib.pyplot as plt
+		import matplotlib.colors as colors
+		self.matplotlib_plt = plt
+		self.matplotlib_colors = colors
+	
+	def _draw_properties(self, changed=None):
+		if changed is None or 'xlabel' in changed:
+			self.matplotlib_ax.set_xlabel(self.xlabel)
+		if changed is None or 'ylabel' in changed:
+			self.matplotlib_ax.set_ylabel(self.ylabel)
+		if changed is None or 'xscale' in changed:
+			if self.xscale in [None, 'lin']:
+				self.matplotlib_ax.set_xscale('linear')
+			elif self.xscale == 'log':
+				self.matplotlib_ax.set_xscale('log')
+		if changed is None or 'yscale' in changed:
+			if self.yscale in [None, 'lin']:
+				self.matplotlib_ax.set_yscale('linear')
+			elif self.yscale == 'log':
+				self.matplotlib_ax.set_yscale('log')
+		if changed is None or {'title', 'show_title'} & changed:
+			if self.title != None:
+				self.matplotlib_fig.canvas.set_window_title(self.title)
+				if self.show_title == True:
+					self.matplotlib_fig.suptitle(self.title)
+				elif changed is not None: # The title may have been drawn before.
+					self.matplotlib_fig.suptitle('')
+		if changed is None or 'aspect' in changed:
+			if self.aspect == 'equal':
+				self.matplotlib_ax.set_aspect('equal')
+		if changed is None or 'subtitle' in changed:
+			if self.subtitle != None:
+				self.matplotlib_ax.set_title(self.subtitle)
+	
+	def show(self, block=True):
+		self._render()
+		self.matplotlib_plt.show(block=block)
+	
+	def _has_window(self):
+		if self._rendered == False or not self.matplotlib_plt.fignum_exists(self.matplotlib_fig.number):
+			return False
+		from matplotlib.backend_bases import FigureCanvasBase
+		return type(self.matplotlib_fig.canvas).flush_events is not FigureCanvasBase.flush_events # Non interactive backends have no window.
+	
+	def _flush_events(self):
+		if not self._has_window():
+			return False
+		self.matplotlib_fig.canvas.flush_events()
+		return True
 	
 	def save(self, fname=None, *args, **kwargs):
+		self._render()
 		if fname is None:
 			fname = self.title
 		if fname is None:
 			raise ValueError(f'Please provide a name for saving the figure to a file by the <fname> argument.')
-		if fname[-4] != '.': fname = f'{fname}.png'
+		fname = self._output_file_name(fname)
 		self.matplotlib_fig.savefig(facecolor=(1,1,1,0), fname=fname, *args, **kwargs)
 	
+	def _output_file_name(self, fname):
+		if fname[-4] != '.': fname = f'{fname}.png'
+		return fname
+	
+	def _save_video(self, frames, fname, fps, set_frame):
+		self._render()
+		from matplotlib import animation # Import here so it is only imported when needed.
+		writer_class = animation.PillowWriter if fname.lower().endswith('.gif') else animation.FFMpegWriter
+		if not writer_class.isAvailable():
+			raise RuntimeError(f'Cannot write {fname} because ffmpeg is not installed, see https://ffmpeg.org. Saving one PNG file for each frame is always possible.')
+		writer = writer_class(fps=fps)
+		with writer.saving(self.matplotlib_fig, fname, dpi=self.matplotlib_fig.dpi):
+			for z in frames:
+				set_frame(z)
+				writer.grab_frame(facecolor=(1,1,1)) # Videos have no transparency.
+	
 	def close(self):
-		self.matplotlib_plt.close(self.matplotlib_fig)
+		if self._rendered == True:
+			self.matplotlib_plt.close(self.matplotlib_fig)
 	
 	def plot(self, x, y=None, **kwargs):
 		validated_args = super().plot(x, y, **kwargs) # Validate arguments according to the standards of myplotlib.
 		del(kwargs) # Remove it to avoid double access to the properties.
+		return PlotHandle(self, self._add_to_display_list('plot', validated_args))
+	
+	def _draw_plot(self, validated_args):
 		x = validated_args.get('x')
 		y = validated_args.get('y')
 		validated_args.pop('x')
 		validated_args.pop('y')
-		self.matplotlib_ax.plot(x, y, **validated_args)
+		line, = self.matplotlib_ax.plot(x, y, **validated_args)
 		if validated_args.get('label') != None: # If you gave me a label it is obvious for me that you want to display it, no?
 			self.matplotlib_ax.legend()
+		return line
+	
+	def _update_plot(self, line, validated_args, appended=None):
+		# Updates the data of the line in place. If <appended> is (x, y) of the new points, the limits of the axes are extended with them, otherwise they are computed again from everything that is drawn.
+		line.set_data(validated_args['x'], validated_args['y'])
+		if appended is None:
+			self.matplotlib_ax.relim()
+		else:
+			self.matplotlib_ax.update_datalim(np.column_stack(appended))
+		self.matplotlib_ax.autoscale_view()
+		if self._has_window():
+			self.matplotlib_fig.canvas.draw_idle()
+		return line
 	
 	def hist(self, samples, **kwargs):
 		validated_args = super().hist(samples, **kwargs) # Validate arguments according to the standards of myplotlib.
 		del(kwargs) # Remove it to avoid double access to the properties.
-		validated_args['bins'] = np.array(validated_args['bins'][:-2]) + np.diff(validated_args['bins'])[:-1]/2 # This is to normalize the binning criteria with plotly.
-		samples = validated_args['samples']
-		validated_args.pop('samples')
-		validated_args.pop('counts') # Have no idea why I have to remove "counts", otherwise the next line raises a strange error.
-		self.matplotlib_ax.hist(x = samples, histtype='step', **validated_args)
+		return HistHandle(self, self._add_to_display_list('hist', validated_args))
+	
+	def _draw_hist(self, validated_args):
+		bin_edges = validated_args.pop('bin_edges')
+		counts = validated_args.pop('counts')[1:-1] # Remove the empty bins at each side.
+		validated_args.pop('bins')
+		validated_args.pop('density', None) # The counts are already normalized.
+		# The histogram was already computed, so draw each bin as a single sample with the count as weight instead of binning the samples again.
+		*_, patches = self.matplotlib_ax.hist(x = bin_edges[:-1], bins = bin_edges, weights = counts, histtype='step', **validated_args)
 		if validated_args.get('label') != None: # If you provided a legend I assume you want to show it.
 			self.matplotlib_ax.legend()
+		return patches
+	
+	def _update_hist(self, patches, validated_args, appended=None):
+		# The histogram is drawn again, which only depends on the number of bins.
+		for patch in patches:
+			patch.remove()
+		patches = self._draw_hist(validated_args)
+		self.matplotlib_ax.relim()
+		self.matplotlib_ax.autoscale_view()
+		if self._has_window():
+			self.matplotlib_fig.canvas.draw_idle()
+		return patches
 	
-	def hist2d(self, _______, **kwargs):
-		# ~ validated_args = super().hist(samples, **kwargs) # Validate arguments according to the standards of myplotlib.
-		# ~ del(kwargs) # Remove it to avoid double access to the properties.
-		raise NotImplementedError(f'<hist2d> not yet implemented for {self.__class__.__name__}')
+	def hist2d(self, x, y=None, **kwargs):
+		validated_args = super().hist2d(x, y, **kwargs) # Validate arguments according to the standards of myplotlib.
+		del(kwargs) # Remove it to avoid double access to the properties.
+		return ColormapHandle(self, self._add_to_display_list('colormap', validated_args)) # Drawn as any other colormap.
 	
 	def colormap(self, z, x=None, y=None, **kwargs):
 		validated_args = super().colormap(z, x, y, **kwargs) # Validate arguments according to the standards of myplotlib.
 		del(kwargs) # Remove it to avoid double access to the properties.
-		z = np.array(validated_args.get('z'))
-		validated_args.pop('z')
+		return ColormapHandle(self, self._add_to_display_list('colormap', validated_args))
+	
+	def _draw_colormap(self, validated_args):
 		x = validated_args.get('x')
 		validated_args.pop('x')
 		y = validated_args.get('y')
 		validated_args.pop('y')
+		z, vmin, vmax = self._color_scale(validated_args.pop('z'), validated_args.get('norm')) # The values that cannot be shown are masked, so matplotlib does not draw them.
 		if validated_args.get('norm') in [None, 'lin']: # linear normalization
-			validated_args['norm'] = self.matplotlib_colors.Normalize(vmin=np.nanmin(z), vmax=np.nanmax(z))
+			validated_args['norm'] = self.matplotlib_colors.Normalize(vmin=vmin, vmax=vmax)
 		elif validated_args.get('norm') == 'log':
-			temp = np.squeeze(np.asarray(z))
-			while temp.min() <= 0:
-				temp = temp[temp!=temp.min()]
-			if (z<=0).any():
-				z[z<=0] = float('Nan')
-				warnings.warn('Warning: log color scale was selected and there are <z> values <= 0. They will be replaced by float("inf") values for plotting (i.e. they will not appear in the plot).')
-			validated_args['norm'] = self.matplotlib_colors.LogNorm(vmin=np.nanmin(z), vmax=np.nanmax(z))
-			z[z!=z] = float('inf')
+			validated_args['norm'] = self.matplotlib_colors.LogNorm(vmin=vmin, vmax=vmax)
 		if 'colorscalelabel' in validated_args:
 			colorscalelabel = validated_args.get('colorscalelabel')
 			validated_args.pop('colorscalelabel')
-		if x is None and y is None:
+		if (x is None) != (y is None):
+			raise ValueError('You must provide either "both x and y" or "neither x nor y"')
+		extent = _regular_grid_extent(x, y, z.shape) if self.IMAGE_FOR_REGULAR_GRIDS == True and z.ndim == 2 and self.xscale != 'log' and self.yscale != 'log' else None
+		if extent is not None:
+			cs = self.matplotlib_ax.imshow(z, origin='lower', extent=extent, interpolation='nearest', aspect='equal' if self.aspect == 'equal' else 'auto', cmap='Blues_r', **validated_args)
+		elif x is None and y is None:
 			cs = self.matplotlib_ax.pcolormesh(z, rasterized=True, shading='auto', cmap='Blues_r', **validated_args)
-		elif x is not None and y is not None:
+		else:
 			cs = self.matplotlib_ax.pcolormesh(x, y, z, rasterized=True, shading='auto', cmap='Blues_r', **validated_args)
-		else: 
-			raise ValueError('You must provide either "both x and y" or "neither x nor y"')
 		cbar = self.matplotlib_fig.colorbar(cs)
 		if 'colorscalelabel' in locals():
 			cbar.set_label(colorscalelabel, rotation = 90)
+		return cs
+	
+	def _update_colormap(self, cs, validated_args, appended=None):
+		# Only the data and the limits of the color scale change, the colorbar follows them.
+		z, vmin, vmax = self._color_scale(validated_args['z'], validated_args.get('norm'))
+		if hasattr(cs, 'set_data'): # An image.
+			cs.set_data(z)
+		else:
+			cs.set_array(z)
+		cs.set_clim(vmin, vmax)
+		if self._has_window():
+			self.matplotlib_fig.canvas.draw_idle()
+		return cs
 	
 	def contour(self, z, x=None, y=None, **kwargs):
 		validated_args = super().contour(z, x, y, **kwargs) # Validate arguments according to the standards of myplotlib.
 		del(kwargs) # Remove it to avoid double access to the properties.
-		z = np.array(validated_args.get('z'))
-		validated_args.pop('z')
+		self._add_to_display_list('contour', validated_args)
+	
+	def _draw_contour(self, validated_args):
 		x = validated_args.get('x')
 		validated_args.pop('x')
 		y = validated_args.get('y')
 		validated_args.pop('y')
+		z, vmin, vmax = self._color_scale(validated_args.pop('z'), validated_args.get('norm')) # The values that cannot be shown are masked, so matplotlib does not draw them.
 		if validated_args.get('norm') in [None, 'lin']: # linear normalization
-			validated_args['norm'] = self.matplotlib_colors.Normalize(vmin=np.nanmin(z), vmax=np.nanmax(z))
+			validated_args['norm'] = self.matplotlib_colors.Normalize(vmin=vmin, vmax=vmax)
 		elif validated_args.get('norm') == 'log':
-			temp = np.squeeze(np.asarray(z))
-			while temp.min() <= 0:
-				temp = temp[temp!=temp.min()]
-			if (z<=0).any():
-				z[z<=0] = float('Nan')
-				warnings.warn('Warning: log color scale was selected and there are <z> values <= 0. They will be replaced by float("inf") values for plotting (i.e. they will not appear in the plot).')
-			validated_args['norm'] = self.matplotlib_colors.LogNorm(vmin=np.nanmin(z), vmax=np.nanmax(z))
-			z[z!=z] = float('inf')
+			validated_args['norm'] = self.matplotlib_colors.LogNorm(vmin=vmin, vmax=vmax)
 		if x is None and y is None:
 			cs = self.matplotlib_ax.contour(z, rasterized=True, shading='auto', cmap='Blues_r', **validated_args)
 		elif x is not None and y is not None:
@@ -139,10 +238,14 @@ class MPLMatplotlibWrapper(MPLFigure):
 		if 'colorscalelabel' in locals():
 			cbar.set_label(colorscalelabel, rotation = 90)
 		self.matplotlib_ax.clabel(cs, inline=True, fontsize=10)
+		return cs
 	
 	def fill_between(self, x, y1, y2=None, **kwargs):
 		validated_args = super().fill_between(x, y1, y2, **kwargs) # Validate arguments according to the standards of myplotlib.
 		del(kwargs) # Remove it to avoid double access to the properties.
+		self._add_to_display_list('fill_between', validated_args)
+	
+	def _draw_fill_between(self, validated_args):
 		x = validated_args['x']
 		validated_args.pop('x')
 		y1 = validated_args['y1']
@@ -152,3 +255,43 @@ class MPLMatplotlibWrapper(MPLFigure):
 		self.matplotlib_ax.fill_between(x, y1, y2, **validated_args)
 		if validated_args.get('label') != None: # If you gave me a label it is obvious for me that you want to display it, no?
 			self.matplotlib_ax.legend()
+
+def _evenly_spaced(values):
+	# Returns the spacing of the 1D array <values> if they are evenly spaced (as numpy.linspace or numpy.arange do), otherwise None.
+	values = np.asarray(values, dtype=float)
+	if values.ndim != 1 or len(values) < 2:
+		return None
+	step = (values[-1] - values[0])/(len(values) - 1)
+	if step == 0 or not np.isfinite(step):
+		return None
+	if (np.abs(np.diff(values) - step) > abs(step)*1e-6).any():
+		return None
+	return step
+
+def _regular_grid_extent(x, y, z_shape):
+	"""
+	If the coordinates <x> and <y> of the elements of a 2D array with
+	<z_shape> are a regular grid, i.e. either both None, 1D evenly spaced
+	arrays with one value per column and row, or the 2D arrays returned
+	by numpy.meshgrid for such arrays, returns the extent of the image
+	(left, right, bottom, top) for "imshow" so that each element is drawn
+	at the same place as "pcolormesh" with shading='auto' would. 
+	Otherwise returns None.
+	"""
+	rows, columns = z_shape
+	if x is None and y is None:
+		return (-.5, columns-.5, -.5, rows-.5)
+	x, y = np.asarray(x), np.asarray(y)
+	if x.shape == y.shape == tuple(z_shape):
+		# Check the corners first, this discards most irregular grids without reading the whole arrays.
+		if x[0,0] != x[-1,0] or y[0,0] != y[0,-1]:
+			return None
+		if not ((x == x[0]).all() and (y == y[:,[0]]).all()):
+			return None
+		x, y = x[0], y[:,0]
+	elif not (x.shape == (columns,) and y.shape == (rows,)):
+		return None
+	x_step, y_step = _evenly_spaced(x), _evenly_spaced(y)
+	if x_step is None or y_step is None or x_step < 0 or y_step < 0: # With decreasing coordinates "imshow" would also invert the axes.
+		return None
+	return (x[0]-x_step/2, x[-1]+x_step/2, y[0]-y_step/2, y[-1]+y_step/2)
@@ -1,4 +1,6 @@
 from .figure import MPLFigure
+from .typed_arrays import encode_figure_dict, PLOTLY_JS_MIN_VERSION
+from .live import PlotHandle, HistHandle, ColormapHandle
 import numpy as np
 
 class MPLPlotlyWrapper(MPLFigure):
@@ -9,62 +11,239 @@ class MPLPlotlyWrapper(MPLFigure):
 		'dotted':  'dot',
 	}
 	
-	def __init__(self):
+	_DIGEST_ATTRIBUTES = ('webgl',)
+	WEBGL_THRESHOLD = 100000 # Traces with more points than this are drawn with WebGL, unless the <webgl> property says otherwise.
+	
+	def __init__(self, lazy=False):
 		super().__init__()
 		import plotly.graph_objects as go # Import here so if the user does not plot with this package, it does not need to be installed.
 		import plotly # Import here so if the user does not plot with this package, it does not need to be installed.
 		self.plotly_go = go
 		self.plotly = plotly
-		self.plotly_fig = go.Figure()
-	
-	def set(self, **kwargs):
-		super().set(**kwargs) # This does a validation of the arguments and stores them in the properties of the super() figure.
-		del(kwargs) # Remove it to avoid double access to the properties. Now you must access like "self.title" and so.
-		if self.show_title == True and self.title != None:
-			self.plotly_fig.update_layout(title = self.title)
-		self.plotly_fig.update_layout(
-			xaxis_title = self.xlabel,
-			yaxis_title = self.ylabel,
-		)
+		if lazy == False:
+			self._render()
+	
+	def _create_figure(self):
+		# The traces and the layout are kept as plain dicts, which is much faster than creating and modifying plotly objects since these validate and copy everything each time. The plotly figure is only created if "plotly_fig" is used.
+		self._plotly_traces = []
+		self._plotly_layout = {}
+		self._plotly_fig = None
+		self._plotly_trace_objects = {} # {id of a trace dict: its trace in the plotly figure}, see "_update_trace".
+		self._pending_trace_changes = {} # {id of a trace dict: changes not yet written into its trace in the plotly figure}, see "_update_trace".
+	
+	@property
+	def plotly_fig(self):
+		self._render()
+		if self._plotly_fig is None:
+			self._plotly_fig = self.plotly_go.Figure(data=self._plotly_traces, layout=self._plotly_layout)
+		elif len(self._plotly_traces) > 0:
+			self._plotly_fig.add_traces(self._plotly_traces)
+		if len(self._plotly_traces) > 0:
+			for trace, trace_object in zip(self._plotly_traces, self._plotly_fig.data[-len(self._plotly_traces):]):
+				self._plotly_trace_objects[id(trace)] = trace_object
+		self._plotly_traces = [] # From now on these are in the plotly figure.
+		if len(self._pending_trace_changes) > 0:
+			with self._plotly_fig.batch_update():
+				for trace_id, changes in self._pending_trace_changes.items():
+					self._plotly_trace_objects[trace_id].update(changes)
+			self._pending_trace_changes = {}
+		return self._plotly_fig
+	
+	def _plotly_fig_dict(self):
+		# Returns the figure as a dict {'data': [...], 'layout': {...}}, without creating the plotly figure if it does not exist.
+		if self._plotly_fig is None:
+			return {'data': self._plotly_traces, 'layout': self._plotly_layout}
+		return self.plotly_fig.to_dict()
+	
+	def _add_trace(self, trace: dict):
+		# Adds a trace to the figure and returns it, so it can still be modified. The traces are converted into plotly objects all at once when "plotly_fig" is used.
+		trace = _without_none_values(trace)
+		self._plotly_traces.append(trace)
+		return trace
+	
+	def _update_trace(self, trace: dict, changes: dict):
+		# Modifies <trace>, returned by "_add_trace". If it is already in the plotly figure, the changes are written into it the next time "plotly_fig" is used, because plotly validates the whole arrays each time, so the cost of each update does not depend on the data that was already plotted.
+		trace.update(changes)
+		if id(trace) in self._plotly_trace_objects:
+			self._pending_trace_changes.setdefault(id(trace), {}).update(changes)
+		return trace
+	
+	def _update_layout(self, layout: dict):
+		layout = _without_none_values(layout)
+		if self._plotly_fig is None:
+			_merge_dicts(self._plotly_layout, layout)
+		else:
+			self._plotly_fig.update_layout(layout)
+	
+	def _set_annotation(self, annotation: dict):
+		# Adds <annotation> to the figure, or replaces the annotation with the same name if there is one already.
+		if self._plotly_fig is None:
+			annotations = self._plotly_layout.setdefault('annotations', [])
+			for n, existing in enumerate(annotations):
+				if existing.get('name') == annotation['name']:
+					annotations[n] = annotation
+					return
+			annotations.append(annotation)
+		elif len(list(self._plotly_fig.select_annotations(selector={'name': annotation['name']}))) > 0:
+			self._plotly_fig.update_annotations(annotation, selector={'name': annotation['name']})
+		else:
+			self._plotly_fig.add_annotation(annotation)
+	
+	def __getstate__(self):
+		# Modules cannot be pickled, they are imported again when unpickling.
+		state = self.__dict__.copy()
+		state.pop('plotly_go')
+		state.pop('plotly')
+		return state
+	
+	def __setstate__(self, state):
+		self.__dict__.update(state)
+		import plotly.graph_objects as go
+		import plotly
+		self.plotly_go = go
+		self.plotly = plotly
+	
+	@property
+	def webgl(self):
+		return self._webgl
+	@property
+	def _webgl(self):
+		if hasattr(self, '_webgl_'):
+			return self._webgl_
+		else:
+			return self.WEBGL_THRESHOLD
+	@_webgl.setter
+	def _webgl(self, value):
+		# True/False to always/never use WebGL, or the number of points above which a trace is drawn with WebGL.
+		if value not in [True, False] and not (isinstance(value, int) and value >= 0):
+			raise ValueError(f'<_webgl> must be True, False or a non negative integer number, received <{value}> of type {type(value)}.')
+		self._webgl_ = value
+	
+	def _use_webgl(self, n_points):
+		if self.webgl is True or self.webgl is False:
+			return self.webgl
+		return n_points > self.webgl
+	
+	def _draw_properties(self, changed=None):
+		if changed is None or {'title', 'show_title'} & changed:
+			if self.show_title == True and self.title != None:
+				self._update_layout({'title': {'text': self.title}})
+			elif changed is not None: # The title may have been drawn before.
+				self._update_layout({'title': {'text': ''}})
+		if changed is None or 'xlabel' in changed:
+			self._update_layout({'xaxis': {'title': {'text': self.xlabel}}})
+		if changed is None or 'ylabel' in changed:
+			self._update_layout({'yaxis': {'title': {'text': self.ylabel}}})
 		# Axes scale:
-		if self.xscale in [None, 'lin']:
-			pass
-		elif self.xscale == 'log':
-			self.plotly_fig.update_layout(xaxis_type = 'log')
-		if self.yscale in [None, 'lin']:
-			pass
-		elif self.yscale == 'log':
-			self.plotly_fig.update_layout(yaxis_type = 'log')
+		if changed is None or 'xscale' in changed:
+			if self.xscale == 'lin':
+				self._update_layout({'xaxis': {'type': 'linear'}})
+			elif self.xscale == 'log':
+				self._update_layout({'xaxis': {'type': 'log'}})
+		if changed is None or 'yscale' in changed:
+			if self.yscale == 'lin':
+				self._update_layout({'yaxis': {'type': 'linear'}})
+			elif self.yscale == 'log':
+				self._update_layout({'yaxis': {'type': 'log'}})
 		
-		if self.aspect == 'equal':
-			self.plotly_fig.update_yaxes(
-				scaleanchor = "x",
-				scaleratio = 1,
-			)
+		if changed is None or 'aspect' in changed:
+			if self.aspect == 'equal':
+				self._update_layout({
+					'yaxis': {
+						'scaleanchor': 'x',
+						'scaleratio': 1,
+					}
+				})
 		
-		if self.subtitle != None:
-			self.plotly_fig.add_annotation(
-				text = self.subtitle.replace('\n','<br>'),
-				xref = "paper", 
-				yref = "paper",
-				x = .5, 
-				y = 1,
-				align = 'left',
-				arrowcolor="#ffffff",
-				font=dict(
-					family="Courier New, monospace",
-					color="#999999"
-				),
-			)
+		if changed is None or 'subtitle' in changed:
+			if self.subtitle != None:
+				self._set_annotation(
+					dict(
+						name = 'subtitle',
+						text = self.subtitle.replace('\n','<br>'),
+						xref = "paper", 
+						yref = "paper",
+						x = .5, 
+						y = 1,
+						align = 'left',
+						arrowcolor="#ffffff",
+						font=dict(
+							family="Courier New, monospace",
+							color="#999999"
+						),
+					)
+				)
 	
-	def show(self):
-		self.plotly_fig.show()
+	def show(self, block=True):
+		# The figure is opened in the browser, this never waits for it to be closed so <block> is ignored.
+		self._render()
+		if self._plotly_fig is None:
+			self.plotly.io.show(self._plotly_fig_dict(), validate=False)
+		else:
+			self.plotly_fig.show()
 	
-	def save(self, fname, include_plotlyjs='cdn', *args, **kwargs):
+	def save(self, fname, include_plotlyjs='cdn', *args, binary_arrays=False, precision=None, **kwargs):
+		"""
+		Saves the figure in an HTML file.
+		
+		Arguments
+		---------
+		fname : str
+			Name of the file, the extension is replaced by ".html".
+		include_plotlyjs : str or bool, optional
+			Default: 'cdn'
+			See plotly.offline.plot.
+		binary_arrays : bool, optional
+			Default: False
+			If True the numeric arrays of the traces are written as base64
+			typed arrays instead of JSON numbers. This produces much smaller
+			files that are faster to write and to open. Requires plotly.js
+			2.28 or newer.
+		precision : 'float32' or int, optional
+			Default: None
+			If "float32" the float arrays of the traces are stored in single
+			precision, if an integer number they are rounded to this number
+			of significant digits. None keeps full precision.
+		
+		Any other arguments are passed to plotly.offline.plot, or to
+		plotly.io.write_html if <binary_arrays> or <precision> are used,
+		in which case they must be keyword arguments.
+		"""
+		self._render()
 		if fname is None:
 			fname = self.title
 		if fname is None:
 			raise ValueError(f'Please provide a name for saving the figure to a file by the <fname> argument.')
+		fname = self._output_file_name(fname)
+		if binary_arrays == False and precision is None:
+			self.plotly.offline.plot(
+				self._plotly_fig_dict() if self._plotly_fig is None else self.plotly_fig,
+				filename = fname,
+				auto_open = False, 
+				include_plotlyjs = include_plotlyjs,
+				validate = self._plotly_fig is not None, # The traces created by myplotlib are already valid.
+				*args, 
+				**kwargs
+			)
+			return
+		if len(args) > 0: # They are the positional arguments of "plotly.offline.plot", which "plotly.io.write_html" does not have.
+			raise TypeError(f'Extra positional arguments cannot be used with <binary_arrays> or <precision>, received {args}. Please give them as keyword arguments of "plotly.io.write_html".')
+		if binary_arrays not in [True, False]:
+			raise ValueError(f'<binary_arrays> must be either True or False, received <{binary_arrays}> of type {type(binary_arrays)}.')
+		if precision not in [None, 'float32'] and not (isinstance(precision, int) and precision > 0):
+			raise ValueError(f'<precision> must be None, "float32" or a positive integer number, received <{precision}> of type {type(precision)}.')
+		if binary_arrays == True and tuple(int(n) for n in self.plotly.offline.get_plotlyjs_version().split('.')[:3]) < PLOTLY_JS_MIN_VERSION:
+			raise RuntimeError(f'<binary_arrays> requires plotly.js {".".join(str(n) for n in PLOTLY_JS_MIN_VERSION)} or newer, but your plotly package comes with plotly.js {self.plotly.offline.get_plotlyjs_version()}. Please update plotly.')
+		self.plotly.io.write_html(
+			encode_figure_dict(self._plotly_fig_dict(), binary=binary_arrays, precision=precision),
+			file = fname,
+			auto_open = False,
+			include_plotlyjs = include_plotlyjs,
+			validate = False, # The figure was already validated, and plotly does not know the typed arrays.
+			**kwargs
+		)
+	
+	def _output_file_name(self, fname):
 		if fname[-5:] != '.html':
 			if len(fname.split('.')) > 1:
 				splitted = fname.split('.')
@@ -72,61 +251,79 @@ class MPLPlotlyWrapper(MPLFigure):
 				fname = '.'.join(splitted)
 			else:
 				fname = f'{fname}.html'
-		self.plotly.offline.plot(
-			self.plotly_fig, 
-			filename = fname,
-			auto_open = False, 
-			include_plotlyjs = include_plotlyjs,
-			*args, 
-			**kwargs
-		)
+		return fname
 	
 	def close(self):
-		del(self.plotly_fig)
+		if self._rendered == True:
+			self._plotly_traces = []
+			self._plotly_layout = {}
+			self._plotly_fig = None
+			self._plotly_trace_objects = {}
+			self._pending_trace_changes = {}
 	
 	def plot(self, x, y=None, **kwargs):
 		validated_args = super().plot(x, y, **kwargs) # Validate arguments according to the standards of myplotlib.
 		del(kwargs) # Remove it to avoid double access to the properties.
-		self.plotly_fig.add_trace(
-			self.plotly_go.Scatter(
+		return PlotHandle(self, self._add_to_display_list('plot', validated_args))
+	
+	def _update_plot(self, trace, validated_args, appended=None):
+		return self._update_trace(trace, dict(x=validated_args['x'], y=validated_args['y']))
+	
+	def _draw_plot(self, validated_args, webgl=None):
+		if webgl is None:
+			webgl = self._use_webgl(len(validated_args['x']))
+		return self._add_trace(
+			dict(
+				type = 'scattergl' if webgl else 'scatter',
 				x = validated_args['x'],
 				y = validated_args['y'],
 				name = validated_args.get('label'),
 				opacity = validated_args.get('alpha'),
 				mode = self.translate_marker_and_linestyle_to_mode(validated_args.get('marker'), validated_args.get('linestyle')),
-				marker_symbol = self._map_marker_to_plotly(validated_args.get('marker')),
+				marker = dict(
+					symbol = self._map_marker_to_plotly(validated_args.get('marker')),
+					color = self._rgb2hexastr_color(validated_args.get('color')) if validated_args.get('color') != None else None,
+				),
 				showlegend = True if validated_args.get('label') != None else False,
 				line = dict(
 					dash = self.LINESTYLE_TRANSLATION[validated_args.get('linestyle')] if 'linestyle' in validated_args else None,
+					width = validated_args.get('linewidth'),
 				)
 			)
 		)
-		if validated_args.get('color') != None:
-			self.plotly_fig['data'][-1]['marker']['color'] = self._rgb2hexastr_color(validated_args.get('color'))
-		if validated_args.get('linewidth') != None:
-			self.plotly_fig['data'][-1]['line']['width'] = validated_args.get('linewidth')
 	
 	def fill_between(self, x, y1, y2=None, **kwargs):
 		validated_args = super().fill_between(x, y1, y2, **kwargs) # Validate arguments according to the standards of myplotlib.
 		del(kwargs) # Remove it to avoid double access to the properties.
+		self._add_to_display_list('fill_between', validated_args)
+	
+	def _draw_fill_between(self, validated_args, webgl=None):
 		x = validated_args['x']
 		validated_args.pop('x')
 		y1 = validated_args['y1']
 		validated_args.pop('y1')
 		y2 = validated_args['y2']
 		validated_args.pop('y2')
-		self.plot(
-			x = list(x) + list(x)[::-1],
-			y = list(y1) + list(y2)[::-1],
-			**validated_args,
+		trace = self._draw_plot(
+			dict(
+				x = np.concatenate((x, x[::-1])),
+				y = np.concatenate((y1, y2[::-1])),
+				**validated_args,
+			),
+			webgl = webgl if webgl is not None else self._use_webgl(2*len(x)),
 		)
-		self.plotly_fig['data'][-1]['fill'] = 'toself'
-		self.plotly_fig['data'][-1]['hoveron'] = 'points'
-		self.plotly_fig['data'][-1]['line']['width'] = 0
+		trace['fill'] = 'toself'
+		if trace['type'] == 'scatter': # Scattergl has no "hoveron".
+			trace['hoveron'] = 'points'
+		trace['line']['width'] = 0
+		return trace
 	
 	def error_band(self, x, y, ytop, ylow, **kwargs):
 		validated_args = super().error_band(x, y, ytop, ylow, **kwargs) # Validate arguments according to the standards of myplotlib.
 		del(kwargs) # Remove it to avoid double access to the properties.
+		self._add_to_display_list('error_band', validated_args)
+	
+	def _draw_error_band(self, validated_args):
 		x = validated_args['x']
 		validated_args.pop('x')
 		y = validated_args['y']
@@ -136,77 +333,106 @@ class MPLPlotlyWrapper(MPLFigure):
 		ylow = validated_args['ylow']
 		validated_args.pop('ylow')
 		legendgroup = str(np.random.rand()) + str(np.random.rand())
-		self.plot(x, y, **validated_args)
-		self.plotly_fig['data'][-1]['legendgroup'] = legendgroup
-		self.fill_between(
-			x, 
-			ylow, 
-			ytop,
-			color = validated_args['color'],
+		webgl = self._use_webgl(2*len(x)) # The same for both traces, WebGL traces are always drawn on top of the others.
+		trace = self._draw_plot(dict(x=x, y=y, **validated_args), webgl=webgl)
+		trace['legendgroup'] = legendgroup
+		trace = self._draw_fill_between(
+			dict(
+				x = x, 
+				y1 = ylow, 
+				y2 = ytop,
+				color = validated_args['color'],
+				alpha = .5,
+			),
+			webgl = webgl,
 		)
-		self.plotly_fig['data'][-1]['showlegend'] = False
-		self.plotly_fig['data'][-1]['legendgroup'] = legendgroup
+		trace['showlegend'] = False
+		trace['legendgroup'] = legendgroup
+	
+	def _plotly_color_scale(self, z, norm):
+		# Returns the values to plot and the limits of the color scale. Plotly has no log color scale, so in this case the logarithm is plotted.
+		masked_z, zmin, zmax = self._color_scale(z, norm)
+		if norm == 'log':
+			with np.errstate(divide='ignore', invalid='ignore'):
+				z2plot = np.log(masked_z.data, where=~np.ma.getmaskarray(masked_z), out=np.full(masked_z.shape, float('NaN'))) # Only the new array is written, <z> is not modified.
+			zmin, zmax = (np.log(zmin), np.log(zmax)) if zmin is not None else (None, None)
+		else:
+			z2plot = masked_z.data
+		return z2plot, zmin, zmax
 	
 	def hist(self, samples, **kwargs):
 		validated_args = super().hist(samples, **kwargs) # Validate arguments according to the standards of myplotlib.
 		del(kwargs) # Remove it to avoid double access to the properties.
-		self.plotly_fig.add_traces(
-			self.plotly_go.Scatter(
+		return HistHandle(self, self._add_to_display_list('hist', validated_args))
+	
+	def _update_hist(self, trace, validated_args, appended=None):
+		return self._update_trace(trace, dict(y=validated_args['counts']))
+	
+	def _draw_hist(self, validated_args):
+		return self._add_trace(
+			dict(
+				type = 'scattergl' if self._use_webgl(len(validated_args['bins'])) else 'scatter',
 				x = validated_args['bins'], 
 				y = validated_args['counts'],
 				mode = self.translate_marker_and_linestyle_to_mode(validated_args.get('marker'), validated_args.get('linestyle')),
 				opacity = validated_args.get('alpha'),
 				name = validated_args.get('label'),
 				showlegend = True if validated_args.get('label') != None else False,
+				marker = dict(
+					color = self._rgb2hexastr_color(validated_args.get('color')) if validated_args.get('color') != None else None,
+				),
 				line = dict(
 					shape='hvh',
 					dash = self.LINESTYLE_TRANSLATION[validated_args.get('linestyle')] if 'linestyle' in validated_args else None,
+					width = validated_args.get('linewidth'),
 				)
 			)
 		)
 		# ~ self.fig.update_layout(barmode='overlay')
-		if validated_args.get('color') != None:
-			self.plotly_fig['data'][-1]['marker']['color'] = self._rgb2hexastr_color(validated_args.get('color'))
-		if validated_args.get('linewidth') != None:
-			self.plotly_fig['data'][-1]['line']['width'] = validated_args.get('linewidth')
 	
-	def hist2d(self, _______, **kwargs):
-		# ~ validated_args = super().hist(samples, **kwargs) # Validate arguments according to the standards of myplotlib.
-		# ~ del(kwargs) # Remove it to avoid double access to the properties.
-		raise NotImplementedError(f'<hist2d> not yet implemented for {self.__class__.__name__}')
+	def hist2d(self, x, y=None, **kwargs):
+		validated_args = super().hist2d(x, y, **kwargs) # Validate arguments according to the standards of myplotlib.
+		del(kwargs) # Remove it to avoid double access to the properties.
+		return ColormapHandle(self, self._add_to_display_list('colormap', validated_args)) # Drawn as any other colormap.
 	
 	def colormap(self, z, x=None, y=None, **kwargs):
 		validated_args = super().colormap(z, x, y, **kwargs) # Validate arguments according to the standards of myplotlib.
 		del(kwargs) # Remove it to avoid double access to the properties.
-		z = np.array(validated_args.get('z'))
-		validated_args.pop('z')
+		return ColormapHandle(self, self._add_to_display_list('colormap', validated_args))
+	
+	def _draw_colormap(self, validated_args):
 		x = validated_args.get('x')
 		validated_args.pop('x')
 		y = validated_args.get('y')
 		validated_args.pop('y')
+		z2plot, zmin, zmax = self._plotly_color_scale(validated_args.pop('z'), validated_args.get('norm'))
 		if x is not None and y is not None:
-			if x.size == y.size == z.size:
+			if x.size == y.size == z2plot.size:
 				x = x[0]
 				y = y.transpose()[0]
-		z2plot = z
-		if 'norm' in validated_args and validated_args['norm'] == 'log':
-			if (z<=0).any():
-				warnings.warn('Warning: log color scale was selected and there are <z> values <= 0. They will be replaced by float("NaN") values for plotting (i.e. they will not appear in the plot).')
-				z2plot[z2plot<=0] = float('NaN')
-			z2plot = np.log(z2plot)
-		self.plotly_fig.add_trace(
-			self.plotly_go.Heatmap(
+		trace = self._add_trace(
+			dict(
+				type = 'heatmap',
 				z = z2plot,
+				zmin = zmin,
+				zmax = zmax,
 				x = x,
 				y = y,
 				colorbar = dict(
-					title = (('log ' if validated_args.get('norm') == 'log' else '') + validated_args.get('colorscalelabel')) if validated_args.get('colorscalelabel') is not None else None,
-					titleside = 'right',
+					title = dict(
+						text = (('log ' if validated_args.get('norm') == 'log' else '') + validated_args.get('colorscalelabel')) if validated_args.get('colorscalelabel') is not None else None,
+						side = 'right',
+					),
 				),
 				hovertemplate = f'{(self.xlabel if self.xlabel is not None else "x")}: %{{x}}<br>{(self.ylabel if self.ylabel is not None else "y")}: %{{y}}<br>{(validated_args.get("colorscalelabel") if "colorscalelabel" in validated_args is not None else "color scale")}: %{{z}}<extra></extra>', # https://community.plotly.com/t/heatmap-changing-x-y-and-z-label-on-tooltip/23588/6
 			)
 		)
-		self.plotly_fig.update_layout(legend_orientation="h")
+		self._update_layout({'legend': {'orientation': 'h'}})
+		return trace
+	
+	def _update_colormap(self, trace, validated_args, appended=None):
+		z2plot, zmin, zmax = self._plotly_color_scale(validated_args['z'], validated_args.get('norm'))
+		return self._update_trace(trace, dict(z=z2plot, zmin=zmin, zmax=zmax))
 	
 	def contour(self, z, x=None, y=None, **kwargs):
 		validated_args = super().colormap(z, x, y, **kwargs) # Validate arguments according to the standards of myplotlib.
@@ -214,30 +440,31 @@ class MPLPlotlyWrapper(MPLFigure):
 		if 'levels' in validated_args:
 			# See in Matplotlib's documentation to see what this is supposed to do.
 			raise NotImplementedError(f'<levels> not yet implemented for <contour> for Plotly.')
-		z = np.array(validated_args.get('z'))
-		validated_args.pop('z')
+		self._add_to_display_list('contour', validated_args)
+	
+	def _draw_contour(self, validated_args):
 		x = validated_args.get('x')
 		validated_args.pop('x')
 		y = validated_args.get('y')
 		validated_args.pop('y')
+		z2plot, zmin, zmax = self._plotly_color_scale(validated_args.pop('z'), validated_args.get('norm'))
 		if x is not None and y is not None:
-			if x.size == y.size == z.size:
+			if x.size == y.size == z2plot.size:
 				x = x[0]
 				y = y.transpose()[0]
-		z2plot = z
-		if 'norm' in validated_args and validated_args['norm'] == 'log':
-			if (z<=0).any():
-				warnings.warn('Warning: log color scale was selected and there are <z> values <= 0. They will be replaced by float("NaN") values for plotting (i.e. they will not appear in the plot).')
-				z2plot[z2plot<=0] = float('NaN')
-			z2plot = np.log(z2plot)
-		self.plotly_fig.add_trace(
-			self.plotly_go.Contour(
+		self._add_trace(
+			dict(
+				type = 'contour',
 				z = z2plot,
+				zmin = zmin,
+				zmax = zmax,
 				x = x,
 				y = y,
 				colorbar = dict(
-					title = (('log ' if validated_args.get('norm') == 'log' else '') + validated_args.get('colorscalelabel')) if validated_args.get('colorscalelabel') is not None else None,
-					titleside = 'right',
+					title = dict(
+						text = (('log ' if validated_args.get('norm') == 'log' else '') + validated_args.get('colorscalelabel')) if validated_args.get('colorscalelabel') is not None else None,
+						side = 'right',
+					),
 				),
 				hovertemplate = f'{(self.xlabel if self.xlabel is not None else "x")}: %{{x}}<br>{(self.ylabel if self.ylabel is not None else "y")}: %{{y}}<br>{(validated_args.get("colorscalelabel") if "colorscalelabel" in validated_args is not None else "color scale")}: %{{z}}<extra></extra>', # https://community.plotly.com/t/heatmap-changing-x-y-and-z-label-on-tooltip/23588/6
 				contours=dict(
@@ -249,7 +476,7 @@ class MPLPlotlyWrapper(MPLFigure):
 				)
 			)
 		)
-		self.plotly_fig.update_layout(legend_orientation="h")
+		self._update_layout({'legend': {'orientation': 'h'}})
 	
 	def _rgb2hexastr_color(self, rgb_color: tuple):
 		# Assuming that <rgb_color> is a (r,g,b) tuple.
@@ -282,3 +509,15 @@ class MPLPlotlyWrapper(MPLFigure):
 		else:
 			mode = 'lines'
 		return mode
+
+def _without_none_values(d: dict):
+	# Returns a copy of <d> without the None values, also in nested dicts. Plotly ignores None values when it validates, so this makes the plain dicts equivalent to the validated plotly objects.
+	return {key: _without_none_values(value) if isinstance(value, dict) else value for key, value in d.items() if value is not None}
+
+def _merge_dicts(d: dict, update: dict):
+	# Updates <d> with <update>, recursively for nested dicts.
+	for key, value in update.items():
+		if isinstance(value, dict) and isinstance(d.get(key), dict):
+			_merge_dicts(d[key], value)
+		else:
+			d[key] = value
@@ -1,4 +1,14 @@
-from .figure import MPLFigure
+from .figure import MPLFigure, _FigureProperties
+import numpy as np
+
+class _DS9FigureProperties(_FigureProperties):
+	"""Same as "_FigureProperties" with the properties of the FITS file of ds9 figures."""
+	__slots__ = ('fits_mode', 'quantize', 'compress')
+	_FLAGS = {**_FigureProperties._FLAGS, **{name: 1 << (len(_FigureProperties._FLAGS) + n) for n, name in enumerate(__slots__)}}
+	
+	def __init__(self):
+		super().__init__()
+		self.fits_mode = 'replace'
 
 class MPLSaoImageDS9Wrapper(MPLFigure):
 	"""
@@ -6,14 +16,22 @@ class MPLSaoImageDS9Wrapper(MPLFigure):
 	images.
 	"""
 	DIRECTORY_FOR_TEMPORARY_FILES = '.myplotlib_ds9_temp'
+	_properties_class = _DS9FigureProperties
+	SAVE_IN_WORKER = False # Saving is just moving a file, and the temporary file is removed when the figure is garbage collected.
+	SPILLABLE = False # The images are already in the FITS file, and closing the figure removes it.
 	_norm = 'lin'
 	
-	def __init__(self):
+	def __init__(self, lazy=False):
 		super().__init__()
 		import os
 		self.os = os
-		from astropy.io import fits
-		self.astropy_io_fits = fits
+		from . import fits_frames # Import here so if the user does not plot with this package, astropy does not need to be installed.
+		self.fits_frames = fits_frames
+		self._fits_file = None
+		if lazy == False:
+			self._render()
+	
+	def _create_figure(self):
 		if not self.os.path.isdir(self.DIRECTORY_FOR_TEMPORARY_FILES):
 			self.os.makedirs(self.DIRECTORY_FOR_TEMPORARY_FILES)
 	
@@ -21,30 +39,115 @@ class MPLSaoImageDS9Wrapper(MPLFigure):
 	def title(self):
 		return self._title.replace(' ', '_')
 	
+	@property
+	def fits_mode(self):
+		return self._fits_mode
+	@property
+	def _fits_mode(self):
+		return self._properties.fits_mode
+	@_fits_mode.setter
+	def _fits_mode(self, value):
+		# What each call to "colormap" does with the FITS file: "replace" the image, append a plane to a "cube" or append one image "extensions".
+		if value not in self.fits_frames.FITS_MODES:
+			raise ValueError(f'<_fits_mode> must be one of {self.fits_frames.FITS_MODES}, received <{value}> of type {type(value)}.')
+		self._properties.update('fits_mode', value)
+	
+	@property
+	def quantize(self):
+		return self._quantize
+	@property
+	def _quantize(self):
+		return self._properties.quantize
+	@_quantize.setter
+	def _quantize(self, value):
+		# Number of bits of the integers in which the images are stored using BSCALE and BZERO, or None to store them as they are.
+		if value not in [None] + self.fits_frames.QUANTIZE_BITS:
+			raise ValueError(f'<_quantize> must be None or one of {self.fits_frames.QUANTIZE_BITS}, received <{value}> of type {type(value)}.')
+		self._properties.update('quantize', value)
+	
+	@property
+	def compress(self):
+		return self._compress
+	@property
+	def _compress(self):
+		return self._properties.compress
+	@_compress.setter
+	def _compress(self, value):
+		# Tile compression algorithm of the images, or None.
+		if value not in [None] + self.fits_frames.COMPRESSION_TYPES:
+			raise ValueError(f'<_compress> must be None or one of {self.fits_frames.COMPRESSION_TYPES}, received <{value}> of type {type(value)}.')
+		self._properties.update('compress', value)
+	
+	def _validate_fits_options(self):
+		if self.fits_mode == 'cube' and (self.quantize is not None or self.compress is not None):
+			raise ValueError(f'<quantize> and <compress> cannot be used with fits_mode="cube", because BSCALE and BZERO are the same for all the frames and a compressed cube cannot be appended. Use fits_mode="extensions" instead.')
+	
 	def colormap(self, z, x=None, y=None, **kwargs):
+		self._validate_fits_options()
 		validated_args = super().colormap(z, x, y, **kwargs) # Validate arguments according to the standards of myplotlib.
 		del(kwargs) # Remove it to avoid double access to the properties.
-		z = np.array(validated_args.get('z'))
-		hdul_new = self.astropy_io_fits.PrimaryHDU(z)
-		if f'{self.title}.fits' in self.os.listdir(self.DIRECTORY_FOR_TEMPORARY_FILES):
-			self.os.remove(f'{self.DIRECTORY_FOR_TEMPORARY_FILES}/{self.title}.fits')
-		hdul_new.writeto(f'{self.DIRECTORY_FOR_TEMPORARY_FILES}/{self.title}.fits')
+		self._add_to_display_list('colormap', validated_args)
+	
+	def hist2d(self, x, y=None, **kwargs):
+		validated_args = super().hist2d(x, y, **kwargs) # Validate arguments according to the standards of myplotlib.
+		del(kwargs) # Remove it to avoid double access to the properties.
+		self._validate_fits_options()
+		self._add_to_display_list('colormap', validated_args) # Drawn as any other colormap.
+	
+	def _draw_colormap(self, validated_args):
+		z = np.asarray(validated_args.get('z')) # Already a numpy array, see "MPLFigure._as_array".
+		if self._fits_file is None:
+			self._fits_file = f'{self.DIRECTORY_FOR_TEMPORARY_FILES}/{self.title}.fits'
+			if self.fits_mode != 'replace' and self.os.path.isfile(self._fits_file): # Left by a previous figure with the same title, do not append to it.
+				self.os.remove(self._fits_file)
+		elif not self._fits_file_is_temporary(): # It was moved by "save", the saved file must not change so the frames are written into a new temporary file.
+			temporary_file = f'{self.DIRECTORY_FOR_TEMPORARY_FILES}/{self.title}.fits'
+			if self.fits_mode != 'replace':
+				import shutil
+				shutil.copyfile(self._fits_file, temporary_file)
+			self._fits_file = temporary_file
+		if self.fits_mode == 'replace':
+			self.fits_frames.write_image(self._fits_file, z, quantize_bits=self.quantize, compression_type=self.compress)
+		elif self.fits_mode == 'extensions':
+			self.fits_frames.append_extension(self._fits_file, z, quantize_bits=self.quantize, compression_type=self.compress)
+		elif self.fits_mode == 'cube':
+			self.fits_frames.append_cube_frame(self._fits_file, z)
 		if 'norm' in validated_args and validated_args['norm'] == 'log':
 			self._norm = 'log'
 	
-	def show(self):
-		self.os.system(f'ds9 {self.DIRECTORY_FOR_TEMPORARY_FILES}/{self.title}.fits' + (' -log' if self._norm == 'log' else ''))
+	def show(self, block=True):
+		# All the figures are shown in the same ds9 window, each in its own frame, never waiting for the window to be closed so <block> is ignored.
+		self._render()
+		from .ds9 import get_session
+		get_session().show_fits(self._fits_file, scale='log' if self._norm == 'log' else 'linear', multi_extension=self.fits_mode == 'extensions')
 	
 	def close(self):
-		if len(self.os.listdir(self.DIRECTORY_FOR_TEMPORARY_FILES)) == 0:
-			self.os.rmdir(self.DIRECTORY_FOR_TEMPORARY_FILES)
 		self.__del__()
+		if self.os.path.isdir(self.DIRECTORY_FOR_TEMPORARY_FILES) and len(self.os.listdir(self.DIRECTORY_FOR_TEMPORARY_FILES)) == 0:
+			self.os.rmdir(self.DIRECTORY_FOR_TEMPORARY_FILES)
 	
 	def __del__(self):
-		if self.os.path.exists(f'{self.DIRECTORY_FOR_TEMPORARY_FILES}/{self.title}.fits'):
-			self.os.remove(f'{self.DIRECTORY_FOR_TEMPORARY_FILES}/{self.title}.fits')
+		fits_file = self.__dict__.get('_fits_file')
+		if fits_file is not None and self.os.path.dirname(fits_file) == self.DIRECTORY_FOR_TEMPORARY_FILES and self.os.path.exists(fits_file): # Once saved the file is not temporary anymore.
+			self.os.remove(fits_file)
+	
+	def _fits_file_is_temporary(self):
+		return self.os.path.dirname(self._fits_file) == self.DIRECTORY_FOR_TEMPORARY_FILES
 	
 	def save(self, fname):
-		if fname[:-5] != '.fits':
-			fname = '.'.join(fname.split('.')[:-1] + ['fits'])
-		copyfile(f'{self.DIRECTORY_FOR_TEMPORARY_FILES}/{self.title}.fits', fname)
+		# The FITS file already exists, so the temporary file is moved (renamed, if in the same file system) instead of copied, and the figure keeps reading the saved file until it is modified, see "_draw_colormap". If it was already saved, the saved file is copied instead, so all the saved files are kept.
+		self._render()
+		fname = self._output_file_name(fname)
+		if self._fits_file is None:
+			raise RuntimeError(f'There is nothing to save in figure {repr(self.title)}, use "colormap" first.')
+		import shutil
+		if self._fits_file_is_temporary():
+			shutil.move(self._fits_file, fname)
+			self._fits_file = fname
+		elif self.os.path.abspath(fname) != self.os.path.abspath(self._fits_file):
+			shutil.copyfile(self._fits_file, fname)
+	
+	def _output_file_name(self, fname):
+		if not fname.endswith('.fits'):
+			fname = '.'.join(fname.split('.')[:-1] + ['fits']) if '.' in self.os.path.basename(fname) else f'{fname}.fits'
+		return fname
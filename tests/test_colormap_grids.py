@@ -0,0 +1,37 @@
+import myplotlib as mpl
+import numpy as np
+
+y = np.linspace(-1,1,55)
+grids = {
+	'regular grid': np.linspace(-2,2,99),
+	'irregular grid': np.geomspace(1,5,99) - 3,
+}
+
+for package in ['matplotlib', 'plotly']:
+	for grid_name, x in grids.items():
+		xx, yy = np.meshgrid(x,y)
+		fig = mpl.manager.new(
+			title = f'colormap with {package} {grid_name}',
+			subtitle = f'Both should look the same except for the spacing in x',
+			xlabel = 'x axis',
+			ylabel = 'y axis',
+			package = package,
+			aspect = 'equal',
+		)
+		fig.colormap(
+			x = xx,
+			y = yy,
+			z = np.sin(3*xx)*np.cos(3*yy),
+			colorscalelabel = 'Colormap value',
+		)
+	fig = mpl.manager.new(
+		title = f'colormap with {package} without x and y',
+		xlabel = 'Column',
+		ylabel = 'Row',
+		package = package,
+	)
+	fig.colormap(
+		z = np.sin(3*xx)*np.cos(3*yy),
+	)
+
+mpl.manager.save_all()
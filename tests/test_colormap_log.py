@@ -0,0 +1,35 @@
+import myplotlib as mpl
+import numpy as np
+
+x = np.linspace(-1,1,333)
+y = np.linspace(-1,1,222)
+xx, yy = np.meshgrid(x,y)
+zz = np.exp(-xx**2-yy**2) - .5 # Negative values at the corners.
+zz[111,111] = float('NaN')
+original_zz = zz.copy()
+
+for package in ['matplotlib', 'plotly']:
+	fig = mpl.manager.new(
+		title = f'colormap with {package} log scale and values <= 0',
+		subtitle = f'The corners should be empty',
+		xlabel = 'x axis',
+		ylabel = 'y axis',
+		package = package,
+		aspect = 'equal',
+	)
+	fig.colormap(
+		x = xx,
+		y = yy,
+		z = zz,
+		norm = 'log',
+		colorscalelabel = 'Colormap value',
+	)
+
+mpl.manager.save_all()
+
+assert np.array_equal(zz, original_zz, equal_nan=True), 'The <z> array of the user was modified.'
+
+# Both packages must use the same color scale.
+masked_zz, vmin, vmax = fig._color_scale(zz, 'log')
+assert vmin == zz[zz>0].min() and vmax == np.nanmax(zz)
+assert np.ma.getmaskarray(masked_zz).sum() == (~(zz>0)).sum()
@@ -0,0 +1,47 @@
+import myplotlib as mpl
+import numpy as np
+
+x = np.linspace(-1,1,2222)
+y = np.linspace(-1,1,1111)
+xx, yy = np.meshgrid(x,y)
+zz = np.exp(-(xx**2+yy**2)*9) + np.random.rand(*xx.shape)*.1
+zz[:99,:99] = float('NaN')
+
+for package in ['matplotlib', 'plotly']:
+	for reducer in ['mean', 'max', 'min']:
+		fig = mpl.manager.new(
+			title = f'colormap with {package} max_pixels {reducer}',
+			subtitle = f'This is a test',
+			xlabel = 'x axis',
+			ylabel = 'y axis',
+			package = package,
+			aspect = 'equal',
+		)
+		fig.colormap(
+			x = xx,
+			y = yy,
+			z = zz,
+			colorscalelabel = f'{reducer} of the pixels',
+			max_pixels = 333*333,
+			reducer = reducer,
+		)
+	fig = mpl.manager.new(
+		title = f'colormap with {package} max_pixels and 1D coordinates',
+		subtitle = f'This is a test',
+		xlabel = 'x axis',
+		ylabel = 'y axis',
+		package = package,
+		aspect = 'equal',
+	)
+	fig.colormap(
+		x = x,
+		y = y,
+		z = zz,
+		max_pixels = 333*333,
+	)
+	block_size = 8 # 2222/8 × 1111/8 < 333*333 but 2222/4 × 1111/4 > 333*333.
+	z_drawn = fig.display_list[-1][1]['z']
+	assert z_drawn.shape == (int(np.ceil(len(y)/block_size)), int(np.ceil(len(x)/block_size)))
+	assert np.isclose(z_drawn[20,30], zz[20*block_size:21*block_size, 30*block_size:31*block_size].mean(), rtol=1e-12, atol=0)
+
+mpl.manager.save_all()
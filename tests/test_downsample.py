@@ -0,0 +1,40 @@
+import myplotlib as mpl
+import numpy as np
+
+x = np.linspace(0,1,999999)
+y = np.sin(2*np.pi*9*x) + np.random.randn(len(x))*.1
+
+for package in ['matplotlib', 'plotly']:
+	for downsample in ['minmax', 'lttb']:
+		fig = mpl.manager.new(
+			title = f'downsample {downsample} with {package}',
+			subtitle = f'This is a test',
+			xlabel = 'x axis',
+			ylabel = 'y axis',
+			package = package,
+		)
+		fig.fill_between(
+			x,
+			y + 1,
+			y - 1,
+			label = 'Fill between',
+			downsample = downsample,
+		)
+		fig.plot(
+			x,
+			y,
+			label = f'Plot',
+			downsample = downsample,
+			downsample_points = 999,
+		)
+		if package == 'plotly':
+			fig.error_band(
+				x,
+				y + 3,
+				y + 3.5,
+				y + 2.5,
+				label = 'Error band',
+				downsample = downsample,
+			)
+
+mpl.manager.save_all()
@@ -0,0 +1,72 @@
+# Writes several frames into the FITS files of ds9 figures, which does not need ds9 to be installed.
+import myplotlib as mpl
+from astropy.io import fits
+import numpy as np
+import tempfile
+import os
+
+directory = tempfile.mkdtemp()
+x = np.linspace(-1,1,99)
+xx, yy = np.meshgrid(x,x)
+frames = [np.sin(xx*n)*yy**2 for n in range(5)]
+frames[2][3,4] = float('NaN')
+
+for fits_mode in ['replace', 'cube', 'extensions']:
+	fig = mpl.manager.new(
+		title = f'frames {fits_mode}',
+		package = 'ds9',
+		fits_mode = fits_mode,
+		quantize = 16 if fits_mode == 'extensions' else None,
+		compress = 'RICE_1' if fits_mode == 'extensions' else None,
+	)
+	for z in frames:
+		fig.colormap(z)
+	fig.save(f'{directory}/{fits_mode}.png') # The extension is changed to ".fits".
+	assert not os.path.exists(f'{fig.DIRECTORY_FOR_TEMPORARY_FILES}/{fig.title}.fits'), 'The temporary file should have been moved.'
+	fig.save(f'{directory}/{fits_mode} again.fits')
+	assert os.path.exists(f'{directory}/{fits_mode}.fits') and os.path.exists(f'{directory}/{fits_mode} again.fits'), 'Saving again should not move the previous file.'
+	fig.colormap(frames[0]) # Written into a new temporary file, the saved files do not change.
+	fig.save(f'{directory}/{fits_mode} one more frame.fits')
+	assert fig.fits_mode == fits_mode and fig.digest() is not None
+
+with fits.open(f'{directory}/replace.fits') as hdul, fits.open(f'{directory}/replace again.fits') as hdul_again:
+	assert np.array_equal(hdul_again[0].data, hdul[0].data)
+	assert len(hdul) == 1
+	assert np.array_equal(hdul[0].data, frames[-1])
+
+with fits.open(f'{directory}/cube.fits') as hdul:
+	assert len(hdul) == 1
+	assert np.array_equal(hdul[0].data, np.array(frames), equal_nan=True)
+with fits.open(f'{directory}/cube one more frame.fits') as hdul:
+	assert np.array_equal(hdul[0].data, np.array(frames + frames[:1]), equal_nan=True)
+assert os.path.getsize(f'{directory}/cube.fits') % 2880 == 0
+
+with fits.open(f'{directory}/extensions one more frame.fits') as hdul:
+	assert len(hdul) == 2 + len(frames)
+with fits.open(f'{directory}/extensions.fits') as hdul:
+	assert len(hdul) == 1 + len(frames)
+	for hdu, z in zip(hdul[1:], frames):
+		assert np.isnan(hdu.data[np.isnan(z)]).all()
+		assert np.nanmax(abs(hdu.data - z)) < 1e-4
+
+fig = mpl.manager.new(title='cube with quantize', package='ds9', fits_mode='cube', quantize=8)
+try:
+	fig.colormap(frames[0])
+	raise AssertionError('Quantized cubes should not be allowed.')
+except ValueError:
+	pass
+mpl.manager.delete(fig)
+
+fig = mpl.manager.new(title='hist2d', package='ds9')
+fig.hist2d(np.random.randn(999), np.random.randn(999), bins=9)
+assert [method for method, validated_args in fig.display_list] == ['colormap'], 'The histogram should be drawn as a colormap.'
+fig.save(f'{directory}/hist2d.fits')
+with fits.open(f'{directory}/hist2d.fits') as hdul:
+	assert hdul[0].data.shape == (9, 9)
+mpl.manager.delete(fig)
+
+for kwarg in [dict(fits_mode='cube'), dict(quantize=16), dict(compress='GZIP_1')]:
+	fig = mpl.manager.new(title=f'Only for ds9 {list(kwarg)[0]}', package='plotly', **kwarg) # Ignored by the other packages.
+	fig.plot([1,2,3])
+
+mpl.manager.save_all()
@@ -0,0 +1,76 @@
+# Tests the ds9 session with stand-in scripts for "ds9" and "xpaset" that record what they receive, so ds9 does not need to be installed.
+import myplotlib as mpl
+from myplotlib import ds9
+import numpy as np
+import tempfile
+import time
+import sys
+import os
+from pathlib import Path
+
+directory = Path(tempfile.mkdtemp())
+log_file = directory/'commands.log'
+
+fake_ds9 = directory/'fake_ds9'
+fake_ds9.write_text(f'''#!{sys.executable}
+# Waits a bit before "accepting commands", as the real ds9 does, and then runs until it is killed.
+import time, sys, os
+with open({repr(str(log_file))}, 'a') as f:
+	print('ds9', *sys.argv[1:], file=f)
+time.sleep(.5)
+with open({repr(str(directory/'pid'))}, 'w') as f:
+	print(os.getpid(), file=f)
+while True:
+	time.sleep(1)
+''')
+fake_xpaset = directory/'fake_xpaset'
+fake_xpaset.write_text(f'''#!{sys.executable}
+# Fails while "ds9" is not ready, otherwise records the command.
+import sys, os, signal
+if not os.path.exists({repr(str(directory/'pid'))}):
+	print('XPA$ERROR no access points match template', file=sys.stderr)
+	sys.exit(1)
+with open({repr(str(log_file))}, 'a') as f:
+	print('xpaset', *sys.argv[1:], file=f)
+if sys.argv[3:] == ['exit']:
+	with open({repr(str(directory/'pid'))}) as f:
+		os.kill(int(f.read()), signal.SIGTERM)
+''')
+for script in [fake_ds9, fake_xpaset]:
+	script.chmod(0o755)
+
+session = ds9.DS9Session(name='test', ds9_command=str(fake_ds9), xpaset_command=str(fake_xpaset))
+ds9._session = session # The session used by the figures.
+
+x = np.linspace(-1,1)
+xx, yy = np.meshgrid(x,x)
+for norm in ['lin', 'log']:
+	fig = mpl.manager.new(
+		title = f'colormap with ds9 {norm} scale',
+		package = 'ds9',
+	)
+	fig.colormap(
+		z = xx**4 + yy**2 + .1,
+		norm = norm,
+	)
+
+start = time.monotonic()
+mpl.manager.show()
+assert time.monotonic() - start < 5, 'Showing the figures should not wait for ds9 to be closed.'
+assert session.is_running()
+session.close()
+assert not session.is_running()
+
+commands = log_file.read_text().splitlines()
+assert commands[0] == 'ds9 -title test', 'ds9 must be started only once.'
+fits_path = lambda title: os.path.abspath(f'{mpl.MPLSaoImageDS9Wrapper.DIRECTORY_FOR_TEMPORARY_FILES}/{title}.fits')
+assert commands[1:] == [
+	f'xpaset -p test file {fits_path("colormap_with_ds9_lin_scale")}',
+	'xpaset -p test scale linear',
+	'xpaset -p test frame new',
+	f'xpaset -p test file {fits_path("colormap_with_ds9_log_scale")}',
+	'xpaset -p test scale log',
+	'xpaset -p test exit',
+], commands
+
+mpl.manager.delete_all()
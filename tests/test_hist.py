@@ -32,4 +32,19 @@ for package in ['matplotlib', 'plotly']:
 			label = f'Plain histogram {idx}',
 		)
 	
+	fig = mpl.manager.new(
+		title = f'reusing bins with {package}',
+		subtitle = f'This is a test',
+		xlabel = 'x axis',
+		ylabel = 'y axis',
+		package = package,
+	)
+	for idx,s in enumerate(samples):
+		fig.hist(
+			s,
+			bins = 22 if idx==0 else 'same', # Use the same bins for all histograms.
+			density = True,
+			label = f'Plain histogram {idx}',
+		)
+	
 mpl.manager.save_all()
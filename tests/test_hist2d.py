@@ -0,0 +1,54 @@
+# 2D histograms of correlated samples, in memory, out of core and accumulated in chunks, drawn with every norm.
+import myplotlib as mpl
+import numpy as np
+import tempfile
+from myplotlib.histogram import histogram2d
+
+rng = np.random.default_rng(0)
+x = rng.normal(size=99999)
+y = x + rng.normal(size=len(x))/2
+x[::1000] = np.nan # Ignored, as in "hist".
+
+finite = ~(np.isnan(x) | np.isnan(y))
+for bins in [10, [33, 22], [np.linspace(-3, 3, 41), np.sort(rng.uniform(-4, 4, 17))], [np.linspace(-3, 3, 41, dtype=np.float32), 7]]:
+	for density in [False, True]:
+		expected = np.histogram2d(x[finite], y[finite], bins=bins, density=density)
+		result = histogram2d(x, y, bins=bins, density=density)
+		assert all(np.allclose(a, b) for a, b in zip(expected, result)), f'Different from numpy.histogram2d with bins={bins} and density={density}.'
+expected = np.histogram2d(x[finite].astype(np.float32), y[finite].astype(np.float32), bins=100)
+result = histogram2d(x.astype(np.float32), y.astype(np.float32), bins=100)
+assert all(np.array_equal(a, b) for a, b in zip(expected, result)), 'Different from numpy.histogram2d with float32 samples.'
+
+# Out of core and in chunks.
+with tempfile.TemporaryDirectory() as directory:
+	np.save(f'{directory}/x.npy', x)
+	np.save(f'{directory}/y.npy', y)
+	result = histogram2d(f'{directory}/x.npy', f'{directory}/y.npy', bins=20, range=[(-3, 3), (-4, 4)])
+accumulator = mpl.Histogram2DAccumulator(bins=20, range=[(-3, 3), (-4, 4)])
+for start in range(0, len(x), 7777):
+	accumulator.add(x[start:start+7777], y[start:start+7777])
+expected = np.histogram2d(x[finite], y[finite], bins=20, range=[(-3, 3), (-4, 4)])
+different_chunks = mpl.Histogram2DAccumulator(bins=20, range=[(-3, 3), (-4, 4)]).add(x, iter(np.array_split(y, 7))) # Same samples, split in a different way.
+for counts in [result[0], accumulator.histogram()[0], different_chunks.histogram()[0]]:
+	assert np.array_equal(counts, expected[0])
+
+for package in ['matplotlib', 'plotly']:
+	for norm in ['lin', 'log']:
+		fig = mpl.manager.new(
+			title = f'hist2d {package} {norm}',
+			subtitle = 'Correlated samples',
+			xlabel = 'x',
+			ylabel = 'y',
+			package = package,
+		)
+		fig.hist2d(x, y, bins=[55, 44], norm=norm, colorscalelabel='Count')
+	fig = mpl.manager.new(title=f'hist2d {package} accumulator and variable bins', package=package)
+	fig.hist2d(mpl.Histogram2DAccumulator(bins=[np.linspace(-3, 3, 41), np.sort(rng.uniform(-4, 4, 17))]).add(x, y), norm='log')
+method, validated_args = fig.display_list[-1]
+assert method == 'colormap' and validated_args['z'].shape == (16, 40), 'The histogram should be drawn as a colormap with one row for each bin of y.'
+try:
+	fig.hist2d(x, y[:9])
+	raise RuntimeError('<x> and <y> with different lengths should raise ValueError.')
+except ValueError:
+	pass
+mpl.manager.save_all()
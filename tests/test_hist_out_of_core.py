@@ -0,0 +1,60 @@
+import myplotlib as mpl
+import numpy as np
+from pathlib import Path
+import tempfile
+import myplotlib.histogram
+from myplotlib.histogram import histogram, is_out_of_core
+
+samples = np.random.randn(999999)
+npy_file = Path(tempfile.mkdtemp())/'samples.npy'
+np.save(npy_file, samples)
+
+def chunks_of_samples():
+	for chunk in np.array_split(samples, 9):
+		yield chunk + 1
+
+accumulator = mpl.HistogramAccumulator(bins=99, range=(-5,5))
+for chunk in np.array_split(samples, 9):
+	accumulator.add(chunk*2)
+
+for package in ['matplotlib', 'plotly']:
+	fig = mpl.manager.new(
+		title = f'out of core histograms with {package}',
+		subtitle = f'This is a test',
+		xlabel = 'x axis',
+		ylabel = 'y axis',
+		package = package,
+	)
+	fig.hist(
+		npy_file,
+		bins = 99,
+		label = 'From a .npy file',
+	)
+	fig.hist(
+		np.load(npy_file, mmap_mode='r'),
+		bins = 'same',
+		label = 'From a memory map (same as .npy file)',
+		linestyle = 'dashed',
+	)
+	fig.hist(
+		chunks_of_samples(),
+		bins = np.linspace(-5,5,99),
+		label = 'From a generator',
+	)
+	fig.hist(
+		accumulator,
+		label = 'From an accumulator',
+	)
+
+mpl.manager.save_all()
+
+# A memory map is read in chunks and gives the same histograms as the samples in memory, also with the string estimators that need the quartiles or the moments of the samples.
+memmap = np.load(npy_file, mmap_mode='r')
+assert is_out_of_core(memmap)
+myplotlib.histogram.QUANTILE_MAX_SAMPLES = 999 # So the quartiles are found after several passes.
+for bins in ['auto', 'fd', 'scott', 'doane', 'sturges', 'rice', 'sqrt']:
+	for data in [samples, np.round(samples*3)]: # Also with many repeated values.
+		np.save(npy_file.with_name('data.npy'), data)
+		streamed_counts, streamed_edges = histogram(np.load(npy_file.with_name('data.npy'), mmap_mode='r'), bins=bins)
+		counts, edges = histogram(data, bins=bins)
+		assert np.array_equal(streamed_edges, edges) and np.array_equal(streamed_counts, counts), f'The histogram read in chunks should be the same as in memory with bins={repr(bins)}.'
@@ -0,0 +1,45 @@
+# Measures the phases of plotting and saving figures with the instrumentation, and checks that nothing is measured when it is off.
+import myplotlib as mpl
+import numpy as np
+
+x = np.linspace(-1,1,9999)
+events = []
+mpl.manager.add_event_hook(events.append)
+
+fig = mpl.manager.new(title='not measured', package='plotly')
+fig.plot(x, x)
+assert len(events) == 0 and mpl.manager.stats() == [], 'Nothing should be measured when the instrumentation is off.'
+mpl.manager.delete_all()
+
+mpl.manager.set_instrumentation(True)
+for package in ['matplotlib', 'plotly']:
+	for lazy in [True, False]:
+		fig = mpl.manager.new(
+			title = f'instrumented {package} lazy {lazy}',
+			package = package,
+			lazy = lazy,
+		)
+		fig.plot(x, x**2)
+		fig.fill_between(x, x**3)
+		fig.colormap(np.random.rand(33,44))
+		fig.set(xlabel = 'x')
+mpl.manager.save_all()
+mpl.manager.set_instrumentation(False)
+mpl.manager.remove_event_hook(events.append)
+
+stats = mpl.manager.stats(reset=True)
+assert mpl.manager.stats() == []
+phases = {(row['figure'], row['phase'], row['method']): row for row in stats}
+for package in ['matplotlib', 'plotly']:
+	for lazy in [True, False]:
+		title = f'instrumented {package} lazy {lazy}'
+		for phase, method in [('validate', 'plot'), ('validate', 'fill_between'), ('validate', 'colormap'), ('create', 'create'), ('properties', 'properties'), ('draw', 'plot'), ('draw', 'fill_between'), ('draw', 'colormap'), ('save', 'save')]:
+			assert (title, phase, method) in phases, f'{phase} {method} of {title} was not measured.'
+		assert phases[(title, 'validate', 'plot')]['points'] == len(x)
+		assert phases[(title, 'draw', 'plot')]['calls'] == 1, 'Nested draws (plotly draws fill_between with plot) should not be counted.'
+		assert phases[(title, 'draw', 'colormap')]['points'] == 33*44
+		assert phases[(title, 'save', 'save')]['bytes'] > 0
+assert all(row['seconds'] >= 0 and row['calls'] > 0 for row in stats)
+assert [row['seconds'] for row in stats] == sorted([row['seconds'] for row in stats], reverse=True)
+assert len(events) == sum(row['calls'] for row in stats)
+assert set(events[0].keys()) == {'figure', 'package', 'phase', 'method', 'seconds', 'points', 'bytes'}
@@ -0,0 +1,54 @@
+import myplotlib as mpl
+import numpy as np
+import pickle
+
+x = np.linspace(-1,1)
+
+mpl.manager.set_lazy(True) # Figures are only drawn when saved or shown.
+
+for package in ['matplotlib', 'plotly']:
+	fig = mpl.manager.new(
+		title = f'Lazy figure with {package}',
+		subtitle = f'This is a test',
+		xlabel = 'x axis',
+		ylabel = 'y axis',
+		package = package,
+	)
+	fig.plot(
+		x,
+		x**3,
+		label = 'Plot',
+	)
+	fig.fill_between(
+		x,
+		x**2,
+		label = 'Fill between',
+	)
+	fig.hist(
+		np.random.randn(999),
+		label = 'Histogram',
+	)
+	fig.set(xlabel = 'x axis (changed after plotting)')
+
+# What is drawn is the data at the moment of plotting, as for figures that are not lazy, even if the caller reuses its arrays.
+y = np.empty_like(x)
+for package in ['matplotlib', 'plotly']:
+	fig_with_buffer = mpl.manager.new(title=f'Lazy figure with reused buffer {package}', package=package)
+	for k in range(3):
+		y[:] = k
+		fig_with_buffer.plot(x, y, label=f'{k}')
+	if package == 'plotly':
+		assert [trace.y[0] for trace in fig_with_buffer.plotly_fig.data] == [0, 1, 2], 'Each line should keep the values of <y> when it was plotted.'
+	else:
+		assert [line.get_ydata()[0] for line in fig_with_buffer.matplotlib_ax.lines] == [0, 1, 2], 'Each line should keep the values of <y> when it was plotted.'
+
+# The display list can be pickled and replayed with another package:
+display_list = pickle.loads(pickle.dumps(fig.display_list))
+fig = mpl.manager.new(
+	title = f'Replay of plotly figure with matplotlib',
+	package = 'matplotlib',
+	lazy = False,
+)
+fig.replay(display_list)
+
+mpl.manager.save_all()
@@ -0,0 +1,84 @@
+# Updates plots and histograms through the handles returned by "plot" and "hist", and checks that they show the same as plotting all the data at once.
+import myplotlib as mpl
+import numpy as np
+
+rng = np.random.default_rng(0)
+x = np.linspace(0, 10, 999)
+y = np.sin(x)
+samples = rng.normal(size=9999)
+bin_edges = np.linspace(-3, 3, 31)
+
+def check_same(fig, reference):
+	for (method, args), (reference_method, reference_args) in zip(fig.display_list, reference.display_list):
+		assert method == reference_method
+		for key in ['x', 'y', 'counts', 'bins']:
+			if key in reference_args:
+				assert np.array_equal(args[key], reference_args[key]), f'<{key}> of <{method}> is not the same.'
+
+for package in ['matplotlib', 'plotly']:
+	for lazy in [True, False]:
+		fig = mpl.manager.new(title=f'live {package} lazy {lazy}', package=package, lazy=lazy)
+		line = fig.plot(x[:10], y[:10])
+		rolling = fig.plot(x[:10], y[:10])
+		histogram = fig.hist(samples[:100], bins=bin_edges)
+		rolling_histogram = fig.hist(samples[:100], bins=bin_edges)
+		for start in range(10, len(x), 97):
+			line.extend(x[start:start+97], y[start:start+97])
+			rolling.extend(x[start:start+97], y[start:start+97], window=200)
+		for start in range(100, len(samples), 1111):
+			histogram.extend(samples[start:start+1111])
+			rolling_histogram.extend(samples[start:start+1111], window=3000)
+		
+		reference = mpl.manager.new(title=f'reference {package} lazy {lazy}', package=package, lazy=True)
+		reference.plot(x, y)
+		reference.plot(x[-200:], y[-200:])
+		reference.hist(samples, bins=bin_edges)
+		reference.hist(samples[-3000:], bins=bin_edges)
+		check_same(fig, reference)
+		assert np.array_equal(line.x, x) and np.array_equal(rolling.y, y[-200:])
+		
+		if package == 'matplotlib': # What is drawn is updated in place.
+			lines = fig.matplotlib_ax.lines
+			assert len(lines) == 2, 'The lines should be updated, not plotted again.'
+			assert np.array_equal(lines[1].get_xdata(), x[-200:])
+		else:
+			assert len(fig.plotly_fig.data) == 4, 'The traces should be updated, not added again.'
+			for k in range(9): # The plotly figure is updated once, when it is used, not in each update.
+				line.extend([11+k], [k])
+			assert np.array_equal(fig._plotly_fig.data[0].y[-1:], y[-1:]), 'The plotly figure should not be updated until it is used.'
+			assert np.array_equal(fig.plotly_fig.data[0].y[-9:], range(9)), 'The trace should be updated after the plotly figure was created.'
+			line.set_data(x, y)
+		
+		line.set_data(y) # Same as "plot", x is 0, 1, 2, ...
+		assert np.array_equal(line.x, np.arange(len(y)))
+		line.extend([1, 2])
+		assert np.array_equal(line.x[-3:], [len(y)-1, len(y), len(y)+1])
+		histogram.set_data(samples[:500])
+		assert np.array_equal(histogram.counts, np.histogram(samples[:500], bins=bin_edges)[0])
+
+# Updating a spilled figure loads it back.
+mpl.manager.set_memory_budget(max_figures=1)
+first = mpl.manager.new(title='spilled', package='matplotlib', lazy=True)
+line = first.plot(x[:10], y[:10])
+mpl.manager.new(title='other', package='plotly').plot(x, y)
+assert first._spilled
+line.extend(x[10:], y[10:])
+assert not first._spilled and np.array_equal(line.y, y)
+mpl.manager.set_memory_budget(None)
+
+for wrong_window in [0, -1, 1.5]:
+	try:
+		line.extend([1], [1], window=wrong_window)
+		raise RuntimeError(f'<window={wrong_window}> should raise ValueError.')
+	except ValueError:
+		pass
+density = first.hist(samples, density=True)
+try:
+	density.extend(samples)
+	raise RuntimeError('Extending a histogram with <density=True> should raise ValueError.')
+except ValueError:
+	pass
+density.set_data(samples[:500]) # All the samples are known, so it is normalized with them.
+assert np.allclose(density.counts, np.histogram(samples[:500], bins=density.bin_edges, density=True)[0])
+
+mpl.manager.delete_all()
@@ -0,0 +1,58 @@
+# Figures that exceed the memory budget are spilled to disk and loaded back when used, producing the same files.
+import myplotlib as mpl
+import numpy as np
+import tempfile
+import os
+
+x = np.linspace(-1,1,99999)
+
+def create_figures(n):
+	figs = []
+	for k in range(n):
+		fig = mpl.manager.new(
+			title = f'figure {k}',
+			xlabel = 'x',
+			package = ['matplotlib', 'plotly'][k%2],
+			lazy = k%3 == 0,
+		)
+		fig.plot(x, x**k, marker='.')
+		fig.plot(x[::-7], np.sin(x[::-7]*k)) # Not contiguous.
+		fig.hist(np.random.default_rng(k).normal(size=999))
+		figs.append(fig)
+	return figs
+
+directories = {}
+for budget in [dict(), dict(max_figures=3), dict(max_bytes=5*x.nbytes)]:
+	mpl.manager.set_memory_budget(**budget)
+	figs = create_figures(9)
+	in_memory = [fig for fig in figs if not fig._spilled]
+	if 'max_figures' in budget:
+		assert len(in_memory) == 3, len(in_memory)
+	if 'max_bytes' in budget:
+		assert sum(fig._nbytes() for fig in in_memory[:-1]) <= 5*x.nbytes # The budget is checked when each figure is created, so the last one was empty.
+	if len(budget) > 0:
+		assert figs[0]._spilled and not figs[-1]._spilled, 'The least recently used figures should be spilled.'
+		figs[0].plot(x, x) # Plotting into a spilled figure loads it back.
+		assert not figs[0]._spilled
+		figs[0].display_list.pop() # To save the same as without budget.
+	else:
+		assert len(in_memory) == len(figs)
+	directories[str(budget)] = tempfile.mkdtemp()
+	mpl.manager.save_all(mkdir=directories[str(budget)])
+mpl.manager.set_memory_budget(None)
+
+reference, *others = directories.values()
+for directory in others:
+	assert sorted(os.listdir(directory)) == sorted(os.listdir(reference))
+	for fname in os.listdir(reference):
+		if fname.endswith('.png'): # The HTML files have random ids.
+			with open(f'{reference}/{fname}', 'rb') as f1, open(f'{directory}/{fname}', 'rb') as f2:
+				assert f1.read() == f2.read(), f'{fname} is different when the figures are spilled.'
+
+# The spilled figures can be saved in worker processes.
+mpl.manager.set_memory_budget(max_figures=2)
+figs = create_figures(6)
+assert sum(fig._spilled for fig in figs) == 4
+mpl.manager.save_all(jobs=2)
+mpl.manager.shutdown_workers()
+mpl.manager.set_memory_budget(None)
@@ -0,0 +1,61 @@
+import myplotlib as mpl
+from myplotlib.typed_arrays import decode_typed_array
+import numpy as np
+import json
+import os
+
+def read_traces_from_html(fname):
+	# Returns the list of traces written by plotly in the HTML file.
+	with open(fname) as ifile:
+		html = ifile.read()
+	decoder = json.JSONDecoder()
+	position = html.index('Plotly.newPlot(') + len('Plotly.newPlot(')
+	_, position = decoder.raw_decode(html, html.index('"', position)) # The id of the div.
+	return decoder.raw_decode(html, html.index('[', position))[0]
+
+x = np.linspace(0,1,99999)
+y = np.sin(2*np.pi*9*x) + np.random.randn(len(x))*.1
+xx, yy = np.meshgrid(np.linspace(-1,1,333), np.linspace(-1,1,222))
+zz = xx**4 + yy**2 + np.random.rand(*xx.shape)*.1
+
+fig = mpl.manager.new(
+	title = f'binary arrays with plotly',
+	package = 'plotly',
+)
+fig.plot(x, y, label = 'Plot')
+fig.hist(y, label = 'Histogram')
+colormap_fig = mpl.manager.new(
+	title = f'binary arrays colormap with plotly',
+	package = 'plotly',
+)
+colormap_fig.colormap(x=xx, y=yy, z=zz)
+
+os.makedirs('test_plotly_binary_arrays_saved_plots', exist_ok=True)
+for f, original_traces in [(fig, fig.plotly_fig.to_dict()['data']), (colormap_fig, colormap_fig.plotly_fig.to_dict()['data'])]:
+	sizes = {}
+	for binary_arrays, precision in [(False, None), (True, None), (True, 'float32'), (False, 4), (True, 4)]:
+		fname = f'test_plotly_binary_arrays_saved_plots/{f.title} {binary_arrays} {precision}.html'
+		f.save(fname, binary_arrays=binary_arrays, precision=precision)
+		sizes[(binary_arrays, precision)] = os.path.getsize(fname)
+		for original, saved in zip(original_traces, read_traces_from_html(fname)):
+			for key in ['x', 'y', 'z']:
+				if key not in original or original[key] is None:
+					continue
+				decoded = decode_typed_array(saved[key]) if binary_arrays else np.array(saved[key], dtype=float)
+				rtol = {None: 0, 'float32': 1e-7, 4: 5e-4}[precision]
+				assert np.allclose(decoded, np.array(original[key], dtype=float), rtol=rtol, atol=0, equal_nan=True), f'{key} of {fname} is not the same after saving it.'
+	assert sizes[(True, None)] < sizes[(False, None)]
+	assert sizes[(True, 'float32')] < sizes[(True, None)]
+
+# Other arguments are given to plotly.io.write_html, only by keyword since its positional arguments are not those of plotly.offline.plot.
+fname = f'test_plotly_binary_arrays_saved_plots/{fig.title} not full html.html'
+fig.save(fname, binary_arrays=True, full_html=False)
+with open(fname) as ifile:
+	assert '<html>' not in ifile.read(), '<full_html> should be given to plotly.io.write_html.'
+try:
+	fig.save(fname, 'cdn', False, binary_arrays=True)
+	raise AssertionError('Positional arguments should not be accepted with <binary_arrays>.')
+except TypeError:
+	pass
+
+mpl.manager.delete_all()
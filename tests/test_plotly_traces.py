@@ -0,0 +1,48 @@
+import myplotlib as mpl
+import numpy as np
+
+x = np.linspace(0,1,99)
+
+fig = mpl.manager.new(
+	title = f'Many traces with plotly',
+	subtitle = f'This is a test',
+	xlabel = 'x axis',
+	ylabel = 'y axis',
+	package = 'plotly',
+)
+for k in range(2222):
+	fig.plot(
+		x,
+		np.sin(2*np.pi*x + k/99) + k/999,
+		linewidth = 1,
+		alpha = .5,
+	)
+fig.hist(np.random.randn(9999), label='Histogram')
+
+# The plotly figure is created only when it is used, and can still be modified afterwards.
+fig_with_plotly_fig = mpl.manager.new(
+	title = f'Traces added after using plotly_fig',
+	package = 'plotly',
+)
+fig_with_plotly_fig.plot(x, x**2, label='Before')
+assert len(fig_with_plotly_fig.plotly_fig.data) == 1
+fig_with_plotly_fig.plotly_fig.update_layout(plot_bgcolor='#eeeeee')
+fig_with_plotly_fig.plot(x, x**3, label='After')
+fig_with_plotly_fig.fill_between(x, x**3, x**2, label='Fill between')
+assert len(fig_with_plotly_fig.plotly_fig.data) == 3
+
+mpl.manager.save_all()
+
+# Reusing the same buffer for several traces does not change the traces already plotted.
+x = np.linspace(0, 1, 99)
+y = np.empty_like(x)
+for package in ['matplotlib', 'plotly']:
+	fig_with_buffer = mpl.manager.new(title=f'Reused buffer {package}', package=package)
+	for k in range(3):
+		y[:] = k
+		fig_with_buffer.plot(x, y, label=f'{k}')
+	if package == 'plotly':
+		assert [trace['y'][0] for trace in fig_with_buffer._plotly_fig_dict()['data']] == [0, 1, 2], 'Each trace should keep the values of <y> when it was plotted.'
+		assert [trace.y[0] for trace in fig_with_buffer.plotly_fig.data] == [0, 1, 2]
+	else:
+		assert [line.get_ydata()[0] for line in fig_with_buffer.matplotlib_ax.lines] == [0, 1, 2]
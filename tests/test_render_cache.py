@@ -0,0 +1,101 @@
+# Saving again figures that did not change is skipped when using the cache.
+import myplotlib as mpl
+import numpy as np
+import tempfile
+import os
+
+directory = tempfile.mkdtemp()
+x = np.linspace(-1,1,999)
+
+def create_figures(exponent=2, ylabel='y', title_suffix=''):
+	for package in ['matplotlib', 'plotly']:
+		fig = mpl.manager.new(
+			title = f'cached {package}{title_suffix}',
+			ylabel = ylabel,
+			package = package,
+			lazy = True,
+		)
+		fig.plot(x, x**exponent)
+		fig.plot(x[::-3], x[::-3]) # Not contiguous.
+
+def save_and_count(**kwargs):
+	before = mpl.manager.cache_info()
+	mpl.manager.save_all(mkdir=directory, **kwargs)
+	after = mpl.manager.cache_info()
+	return after['hits'] - before['hits'], after['misses'] - before['misses']
+
+create_figures()
+assert save_and_count(cache=True) == (0, 2)
+modification_times = {fname: os.path.getmtime(f'{directory}/{fname}') for fname in os.listdir(directory)}
+
+create_figures()
+assert save_and_count(cache=True) == (2, 0)
+assert all(os.path.getmtime(f'{directory}/{fname}') == t for fname, t in modification_times.items()), 'Files should not have been written again.'
+
+create_figures()
+assert save_and_count(cache=True, force=True) == (0, 2)
+
+create_figures(exponent=3) # Different data.
+assert save_and_count(cache=True) == (0, 2)
+create_figures(exponent=3, ylabel='another label') # Different property.
+assert save_and_count(cache=True) == (0, 2)
+create_figures(exponent=3, ylabel='another label')
+assert save_and_count(cache=True, format='pdf') == (1, 1), 'Only the matplotlib figure changes its file with the format.'
+
+os.remove(f'{directory}/cached matplotlib.pdf')
+create_figures(exponent=3, ylabel='another label')
+assert save_and_count(cache=True, format='pdf') == (1, 1), 'A file that does not exist must be saved.'
+
+create_figures()
+assert save_and_count() == (0, 0), 'The cache is not used unless asked.'
+create_figures()
+assert save_and_count(cache=True) == (0, 2), 'The files were written without the cache, so they are not up to date.'
+
+# The digest does not depend on how the figure was created.
+figs = []
+for lazy in [True, False]:
+	figs.append(mpl.manager.new(title='digest', package='plotly', lazy=lazy))
+	figs[-1].plot(x, np.ascontiguousarray(x**2))
+assert figs[0].digest() == figs[1].digest()
+figs[1].set(xlabel='x')
+assert figs[0].digest() != figs[1].digest()
+mpl.manager.delete_all()
+
+mpl.manager.set_cache(True)
+create_figures(title_suffix=' parallel')
+assert save_and_count(jobs=2) == (0, 2)
+create_figures(title_suffix=' parallel')
+assert save_and_count(jobs=2) == (2, 0)
+mpl.manager.set_cache(False)
+mpl.manager.shutdown_workers()
+
+# Also with asyncio, the futures of the figures that are up to date are already done.
+import asyncio
+async def save_async():
+	create_figures(title_suffix=' async')
+	futures = mpl.manager.save_all_futures(mkdir=directory, cache=True)
+	await asyncio.wait(futures.values())
+	mpl.manager.delete_all()
+	create_figures(title_suffix=' async')
+	futures = mpl.manager.save_all_futures(mkdir=directory, cache=True)
+	assert all(future.done() for future in futures.values())
+	mpl.manager.delete_all()
+asyncio.run(save_async())
+mpl.manager.shutdown_workers()
+
+# The digest is the one of the data when it was plotted, modifying the arrays afterwards does not change it.
+z = np.outer(x[::9], x[::9])
+fig = mpl.manager.new(title='digest after modifying z', package='matplotlib', lazy=False)
+fig.colormap(z)
+line = fig.plot(x, x)
+digest = fig.digest()
+z[:] = 0
+assert fig.digest() == digest, 'Modifying <z> after plotting should not change the digest.'
+line.extend([2], [2])
+digest = fig.digest()
+try:
+	line.y[:] = 0
+except ValueError: # The arrays in the display list are read-only.
+	pass
+assert fig.digest() == digest
+mpl.manager.delete_all()
@@ -0,0 +1,87 @@
+# Saves and shows the figures from within an asyncio event loop, which must keep running meanwhile.
+import myplotlib as mpl
+import numpy as np
+import asyncio
+import os
+
+x = np.linspace(-1,1,99999)
+
+def create_figures(name, n):
+	for package in ['matplotlib', 'plotly']:
+		for k in range(n):
+			fig = mpl.manager.new(
+				title = f'{name} {k} with {package}',
+				package = package,
+				lazy = k%2 == 0,
+			)
+			fig.plot(x, x**k, marker='.')
+
+async def count_ticks(ticks):
+	while True:
+		await asyncio.sleep(.001)
+		ticks[0] += 1
+
+async def main():
+	ticks = [0]
+	ticker = asyncio.create_task(count_ticks(ticks))
+	
+	create_figures('async save', 3)
+	fnames = await mpl.manager.save_all_async()
+	assert all(os.path.isfile(fname.replace('.png', '.html') if 'plotly' in fname else fname) for fname in fnames)
+	assert len(mpl.manager.figures) == 0
+	assert ticks[0] > 0, 'The event loop should keep running while the figures are saved.'
+	
+	create_figures('async save in processes', 2)
+	await mpl.manager.save_all_async(jobs=2)
+	assert len(mpl.manager.figures) == 0
+	
+	# Per figure futures.
+	create_figures('future', 2)
+	futures = mpl.manager.save_all_futures()
+	assert list(futures) == mpl.manager.figures
+	for _fig, future in futures.items():
+		assert await future is None
+	mpl.manager.delete_all()
+	
+	# Figures with the same title have a future each.
+	for package in ['matplotlib', 'plotly']:
+		mpl.manager.new(title='same title', package=package).plot(x, x)
+	futures = mpl.manager.save_all_futures()
+	assert len(futures) == 2
+	await asyncio.wait(futures.values())
+	assert len(await mpl.manager.save_all_async()) == 2
+	
+	# Cancelling skips the figures that were not started and keeps them in the manager.
+	create_figures('cancelled', 4)
+	n_figures = len(mpl.manager.figures)
+	task = asyncio.create_task(mpl.manager.save_all_async())
+	await asyncio.sleep(.01)
+	task.cancel()
+	try:
+		await task
+		raise AssertionError('The task should have been cancelled.')
+	except asyncio.CancelledError:
+		pass
+	assert len(mpl.manager.figures) == n_figures, 'Nothing should be deleted when cancelled.'
+	await mpl.manager.save_all_async() # Everything is saved the second time.
+	assert len(mpl.manager.figures) == 0
+	
+	# A failure is reported after saving the others.
+	create_figures('with failure', 1)
+	mpl.manager.figures[0].set(title='nonexistent directory/with failure') # The directory does not exist so it cannot be saved.
+	try:
+		await mpl.manager.save_all_async()
+		raise AssertionError('Saving should have failed.')
+	except RuntimeError as e:
+		assert 'Could not save 1 out of 2 figures' in str(e), str(e)
+	mpl.manager.delete_all()
+	
+	# With a non interactive backend there are no windows to wait for.
+	create_figures('show', 1)
+	await asyncio.wait_for(mpl.manager.show_async(), timeout=10)
+	mpl.manager.delete_all()
+	
+	ticker.cancel()
+
+asyncio.run(main())
+mpl.manager.shutdown_workers()
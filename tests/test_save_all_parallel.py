@@ -0,0 +1,37 @@
+import myplotlib as mpl
+import numpy as np
+
+x = np.linspace(-1,1)
+
+for k in range(2): # The second time the same worker processes are used.
+	for package in ['matplotlib', 'plotly']:
+		for n in range(4):
+			fig = mpl.manager.new(
+				title = f'parallel save {n} with {package} round {k}',
+				subtitle = f'This is a test',
+				xlabel = 'x axis',
+				ylabel = 'y axis',
+				package = package,
+			)
+			fig.plot(
+				x,
+				x**n,
+				label = f'x^{n}',
+			)
+			fig.hist(
+				np.random.randn(999),
+				label = 'Histogram',
+			)
+	mpl.manager.save_all(jobs=4)
+
+# Figures with the same title are saved to the same file, each failure is still reported.
+for package in ['matplotlib', 'plotly']:
+	mpl.manager.new(title='nonexistent directory/same title', package=package).plot(x, x) # The directory does not exist so it cannot be saved.
+try:
+	mpl.manager.save_all(jobs=2)
+	raise AssertionError('Saving should have failed.')
+except RuntimeError as e:
+	assert 'Could not save 2 out of 2 figures' in str(e), str(e)
+mpl.manager.delete_all()
+
+mpl.manager.shutdown_workers()
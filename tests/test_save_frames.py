@@ -0,0 +1,47 @@
+# Saves sequences of colormaps with "save_frames" and checks that each frame is the same as a figure made for it alone.
+import myplotlib as mpl
+import numpy as np
+import tempfile
+import os
+
+frames = np.random.default_rng(0).random((5, 32, 48))*np.logspace(0, 4, 5)[:,None,None]
+directory = tempfile.mkdtemp()
+
+for norm in ['lin', 'log']:
+	fig = mpl.manager.new(title='frames', package='matplotlib', lazy=True)
+	colormap = fig.colormap(frames[0]*0, norm=norm, colorscalelabel='z')
+	saved = fig.save_frames(frames, f'{directory}/{norm}_{{:03d}}.png')
+	assert saved == [f'{directory}/{norm}_{number:03d}.png' for number in range(len(frames))]
+	assert np.array_equal(colormap.z, frames[0]*0), 'The colormap should be left as it was.'
+	for number, z in enumerate(frames):
+		reference = mpl.manager.new(title='frames', package='matplotlib', lazy=True)
+		reference.colormap(z, norm=norm, colorscalelabel='z')
+		reference.save(f'{directory}/reference_{norm}_{number}.png')
+		with open(saved[number], 'rb') as f1, open(f'{directory}/reference_{norm}_{number}.png', 'rb') as f2:
+			assert f1.read() == f2.read(), f'Frame {number} with norm {norm} is not the same as a figure made for it alone.'
+
+fig = mpl.manager.new(title='frames in workers', package='matplotlib')
+fig.colormap(frames[0])
+saved = fig.save_frames(frames, f'{directory}/workers', jobs=2)
+assert saved == [f'{directory}/workers_{number}.png' for number in range(len(frames))], saved
+assert all(os.path.isfile(fname) for fname in saved)
+fig.save_frames((z for z in frames), f'{directory}/video.gif', fps=5)
+assert os.path.getsize(f'{directory}/video.gif') > 0
+try:
+	fig.save_frames(frames, f'{directory}/video.gif', jobs=2)
+	raise RuntimeError('A video cannot be saved with <jobs>, ValueError should be raised.')
+except ValueError:
+	pass
+try:
+	fig.save_frames(frames[:,:3], f'{directory}/wrong_shape')
+	raise RuntimeError('Frames with a different shape than the colormap should raise ValueError.')
+except ValueError:
+	pass
+
+fig = mpl.manager.new(title='plotly frames', package='plotly')
+fig.colormap(frames[0])
+saved = fig.save_frames(frames, f'{directory}/plotly')
+assert saved == [f'{directory}/plotly_{number}.html' for number in range(len(frames))], saved
+
+mpl.manager.delete_all()
+mpl.manager.shutdown_workers()
@@ -0,0 +1,30 @@
+import myplotlib as mpl
+import numpy as np
+
+x = np.linspace(1,10,99)
+
+for package in ['matplotlib', 'plotly']:
+	fig = mpl.manager.new(
+		title = f'set many times with {package}',
+		subtitle = f'First subtitle',
+		package = package,
+	)
+	fig.plot(x, x**2, label='x²')
+	for k in range(999):
+		fig.set(
+			subtitle = f'The subtitle should be this one and only once',
+			xlabel = 'x axis',
+			ylabel = 'y axis',
+		)
+	fig.set(yscale='log')
+	fig.set(yscale='lin')
+	fig.set(yscale='log')
+	if package == 'plotly':
+		annotations = fig.plotly_fig.layout.annotations
+		assert len(annotations) == 1 and annotations[0].text == 'The subtitle should be this one and only once'
+		assert fig.plotly_fig.layout.yaxis.type == 'log'
+	elif package == 'matplotlib':
+		assert fig.matplotlib_ax.get_title() == 'The subtitle should be this one and only once'
+		assert fig.matplotlib_ax.get_yscale() == 'log'
+
+mpl.manager.save_all()
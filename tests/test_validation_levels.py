@@ -0,0 +1,44 @@
+import myplotlib as mpl
+import numpy as np
+
+x = np.linspace(0,1,99)
+y = np.sin(2*np.pi*x)
+
+mpl.manager.set_validation('fast') # Default for the new figures.
+
+for package in ['matplotlib', 'plotly']:
+	for validation in ['full', 'fast', 'off']:
+		fig = mpl.manager.new(
+			title = f'validation {validation} with {package}',
+			xlabel = 'x axis',
+			ylabel = 'y axis',
+			package = package,
+			validation = validation,
+		)
+		for k in range(99):
+			fig.plot(x, y + k/9, color=(k/99,0,1-k/99))
+		fig.fill_between(x, y, label='fill_between')
+		fig.hist(y, label='hist')
+
+def raises(exception, function, *args, **kwargs):
+	try:
+		function(*args, **kwargs)
+	except exception:
+		return True
+	return False
+
+fig = mpl.manager.new(package='plotly', lazy=True)
+assert fig.validation == 'fast'
+for validation in ['full', 'fast', 'off']:
+	fig.set(validation = validation)
+	# Checks of the names of the arguments and the shapes of the arrays are done in "full" and "fast".
+	assert raises(NotImplementedError, fig.plot, x, y, nonexistent_argument=1) == (validation != 'off')
+	assert raises(ValueError, fig.plot, x, y[:-1]) == (validation != 'off')
+	assert raises(ValueError, fig.error_band, x, y, y-1, y+1) == (validation != 'off') # Vectorized check.
+	# Checks of the values of the arguments are only done in "full".
+	assert raises(ValueError, fig.plot, x, y, color=(2,0,0)) == (validation == 'full')
+	assert raises(ValueError, fig.plot, x, y, alpha=9) == (validation == 'full')
+mpl.manager.delete(fig)
+mpl.manager.set_validation('full')
+
+mpl.manager.save_all()
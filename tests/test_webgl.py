@@ -0,0 +1,44 @@
+import myplotlib as mpl
+import numpy as np
+
+x = np.linspace(0,1,333333)
+y = np.sin(2*np.pi*9*x) + np.random.randn(len(x))*.1
+
+mpl.manager.set_webgl(200000) # Plotly traces with more than this number of points use WebGL.
+
+for package in ['matplotlib', 'plotly']:
+	for webgl in [False, True, 99]:
+		fig = mpl.manager.new(
+			title = f'webgl {webgl} with {package}',
+			subtitle = f'This is a test',
+			xlabel = 'x axis',
+			ylabel = 'y axis',
+			package = package,
+			webgl = webgl, # Ignored by matplotlib.
+		)
+		fig.plot(
+			x,
+			y,
+			label = 'Plot',
+			marker = '.',
+		)
+		fig.fill_between(
+			x[::999],
+			y[::999] + 2,
+			y[::999] + 1,
+			label = 'Fill between',
+		)
+		fig.hist(
+			y,
+			label = 'Histogram',
+		)
+		if package == 'plotly':
+			fig.error_band(
+				x[::99],
+				y[::99] + 3,
+				y[::99] + 3.5,
+				y[::99] + 2.5,
+				label = 'Error band',
+			)
+
+mpl.manager.save_all()
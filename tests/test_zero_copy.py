@@ -0,0 +1,47 @@
+# Read-only arrays, e.g. memory maps opened with mmap_mode='r', are plotted without copying them. Any other array is copied once into the display list.
+import myplotlib as mpl
+import numpy as np
+import tempfile
+from pathlib import Path
+
+x = np.linspace(0,1,99999)
+y = np.sin(2*np.pi*9*x)
+
+inputs = {
+	'numpy': (x, y),
+	'numpy strided': (x[::3], y[::3]),
+}
+memmap_path = Path(tempfile.mkdtemp())/'y.npy'
+np.save(memmap_path, y)
+inputs['memmap'] = (x, np.load(memmap_path, mmap_mode='r'))
+try:
+	import pandas
+	inputs['pandas'] = (pandas.Series(x), pandas.Series(y))
+except ImportError:
+	pass
+try:
+	import pyarrow
+	inputs['arrow'] = (pyarrow.array(x), pyarrow.array(y))
+except ImportError:
+	pass
+
+for package in ['matplotlib', 'plotly']:
+	for input_name, (x_input, y_input) in inputs.items():
+		fig = mpl.manager.new(
+			title = f'{input_name} input with {package}',
+			xlabel = 'x axis',
+			ylabel = 'y axis',
+			package = package,
+		)
+		fig.plot(x_input, y_input, label='plot')
+		fig.fill_between(x_input, y_input, label='fill_between')
+		read_only = not np.asarray(x_input).flags.writeable # Arrays that can be modified by the caller are copied, so what was plotted does not change.
+		for method, validated_args in fig.display_list:
+			assert np.shares_memory(validated_args['x'], np.asarray(x_input)) == read_only, f'<x> of <{method}> should {"not " if read_only else ""}be copied for {input_name} input.'
+			assert not validated_args['x'].flags.writeable
+		fig.plot(y_input, label='plot without x')
+		read_only = not np.asarray(y_input).flags.writeable
+		assert np.shares_memory(fig.display_list[-1][1]['y'], np.asarray(y_input)) == read_only, f'<y> should {"not " if read_only else ""}be copied for {input_name} input.'
+		fig.plot(list(y_input[:999]), label='plot a list') # Lists are also accepted, of course.
+
+mpl.manager.save_all()